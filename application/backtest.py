@@ -0,0 +1,120 @@
+# Walk-Forward Backtester (Application Layer)
+# Single Responsibility: Evaluate trade decisions of a pipeline over history
+
+from concurrent.futures import ProcessPoolExecutor
+from application.predictor_factory import create_predictor, pipeline_for
+from domain.signals import SignalGenerator
+from infrastructure.utils import sliding_windows, first_valid_window, limit_native_threads
+import numpy as np
+
+def walk_forward_folds(start: int, num_windows: int, n_folds: int) -> list:
+    """Split windows [start, num_windows) into an initial training block and n_folds test blocks.
+
+    Fold k trains on every window before its test block (expanding window) and
+    returns (train_start, train_end, test_start, test_end).
+    """
+    block = (num_windows - start) // (n_folds + 1)
+    if block == 0:
+        raise ValueError(f"Not enough windows ({num_windows - start}) for {n_folds} folds.")
+    folds = []
+    for k in range(1, n_folds + 1):
+        test_start = start + k * block
+        test_end = num_windows if k == n_folds else test_start + block
+        folds.append((start, test_start, test_start, test_end))
+    return folds
+
+def bar_pnl(positions: np.ndarray, entry_prices: np.ndarray, exit_prices: np.ndarray,
+            cost_per_unit: float) -> np.ndarray:
+    """Per-bar PnL in price units, charging cost_per_unit on every unit of position change."""
+    turnover = np.abs(np.diff(positions.astype(np.float64), prepend=0.0))
+    return positions * (exit_prices - entry_prices) - turnover * cost_per_unit
+
+def _fold_predictions(symbol: str, timeframe: str, start_date: str, end_date: str, data: np.ndarray,
+                      seq_length: int, fold: tuple) -> np.ndarray:
+    """Train a fresh predictor on the fold's training windows and score its test block."""
+    train_start, train_end, test_start, test_end = fold
+    predictor = create_predictor(symbol, timeframe, start_date, end_date)
+    X, y = sliding_windows(data, seq_length, np.float32)
+    predictor.fit(X[train_start:train_end], y[train_start:train_end])
+    return predictor.score(X[test_start:test_end])
+
+class WalkForwardBacktester:
+    def __init__(self, symbol: str, start_date: str, end_date: str, timeframe: str, n_folds: int = 5,
+                 retrain: bool = True, spread: float = 0.0, commission: float = 0.0,
+                 workers: int = None, threads_per_worker: int = 1, thresholds: dict = None):
+        """Initialize backtester.
+
+        spread and commission are in price units; a position change of one unit
+        pays half the spread plus the commission. thresholds overrides the
+        configured (sell below, buy above) signal thresholds per pipeline.
+        """
+        self.symbol = symbol
+        self.start_date = start_date
+        self.end_date = end_date
+        self.timeframe = timeframe
+        self.pipeline = pipeline_for(timeframe)
+        self.n_folds = n_folds
+        self.retrain = retrain
+        self.cost_per_unit = spread / 2 + commission
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self.signals = SignalGenerator(thresholds)
+
+    def run(self) -> dict:
+        """Run every fold and return per-fold metrics plus the bar-level results."""
+        predictor = create_predictor(self.symbol, self.timeframe, self.start_date, self.end_date)
+        X, _, _ = predictor.preprocess_data()
+        data = predictor.engineer.sequence_data()
+        closes = predictor.engineer.df['Close'].to_numpy()
+        seq_length = X.shape[1]
+        folds = walk_forward_folds(first_valid_window(data), len(X), self.n_folds)
+
+        if self.retrain:
+            with ProcessPoolExecutor(max_workers=self.workers or self.n_folds, initializer=limit_native_threads,
+                                     initargs=(self.threads_per_worker,)) as pool:
+                # Each fold only needs the rows up to the end of its test block
+                futures = [pool.submit(_fold_predictions, self.symbol, self.timeframe, self.start_date,
+                                       self.end_date, data[:fold[3] + seq_length], seq_length, fold)
+                           for fold in folds]
+                fold_preds = [future.result() for future in futures]
+        else:
+            X, y = sliding_windows(data, seq_length, np.float32)
+            train_start, train_end = folds[0][:2]
+            predictor.fit(X[train_start:train_end], y[train_start:train_end])
+            test_start, test_end = folds[0][2], folds[-1][3]
+            preds = predictor.score(X[test_start:test_end])
+            fold_preds = [preds[fold[2] - test_start:fold[3] - test_start] for fold in folds]
+
+        windows = np.concatenate([np.arange(fold[2], fold[3]) for fold in folds])
+        preds = np.concatenate([np.ravel(p) for p in fold_preds])
+        # Window i is decided at the close of its last bar and held until the next close
+        entry_prices = closes[windows + seq_length - 1]
+        exit_prices = closes[windows + seq_length]
+        positions, _ = self.signals.generate(self.pipeline, preds, entry_prices)
+        pnl = bar_pnl(positions, entry_prices, exit_prices, self.cost_per_unit)
+
+        fold_ids = np.repeat(np.arange(len(folds)), [fold[3] - fold[2] for fold in folds])
+        return {
+            'folds': [dict(zip(('train_start', 'train_end', 'test_start', 'test_end'), fold),
+                           **self._metrics(positions[fold_ids == k], pnl[fold_ids == k]))
+                      for k, fold in enumerate(folds)],
+            'total': self._metrics(positions, pnl),
+            'windows': windows,
+            'predictions': preds,
+            'positions': positions,
+            'pnl': pnl
+        }
+
+    @staticmethod
+    def _metrics(positions: np.ndarray, pnl: np.ndarray) -> dict:
+        """Summarize a block of bar-level results."""
+        active = positions != 0
+        std = pnl.std()
+        return {
+            'bars': int(len(pnl)),
+            'trades': int(np.count_nonzero(np.diff(positions, prepend=0) != 0)),
+            'exposure': float(active.mean()) if len(pnl) else 0.0,
+            'pnl': float(pnl.sum()),
+            'hit_rate': float((pnl[active] > 0).mean()) if active.any() else 0.0,
+            'sharpe': float(pnl.mean() / std * np.sqrt(len(pnl))) if std > 0 else 0.0
+        }
@@ -0,0 +1,195 @@
+# Live Pipeline (Application Layer)
+# Single Responsibility: Turn a live tick stream into bar-close predictions with bounded latency
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from config import DEFAULT_START_DATE, DEFAULT_END_DATE, MODEL_PARAMS
+from application.predictor_factory import create_predictor, pipeline_for
+from infrastructure.data_loaders.resampler import BarAggregator
+from infrastructure.feature_engineers.streaming import StreamingFeatureEngine
+from infrastructure.instrumentation import LatencyStats
+import asyncio
+import time
+import numpy as np
+import pandas as pd
+
+class BoundedQueue:
+    # block: the producer waits (backpressure); drop_newest/drop_oldest: discard an item;
+    # coalesce: the newest item replaces the last queued one, so consumers only see the latest
+    POLICIES = ('block', 'drop_newest', 'drop_oldest', 'coalesce')
+
+    def __init__(self, maxsize: int, policy: str = 'block'):
+        """Initialize a single-producer, single-consumer queue with an overflow policy."""
+        if policy not in self.POLICIES:
+            raise ValueError(f"Invalid queue policy: {policy}. Use {', '.join(self.POLICIES)}.")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.items = deque()
+        self.not_empty = asyncio.Event()
+        self.not_full = asyncio.Event()
+        self.closed = False
+        self.dropped = 0
+        self.coalesced = 0
+
+    async def put(self, item) -> None:
+        """Enqueue an item, applying the overflow policy when the queue is full."""
+        while len(self.items) >= self.maxsize:
+            if self.policy == 'block':
+                self.not_full.clear()
+                await self.not_full.wait()
+                continue
+            if self.policy == 'drop_newest':
+                self.dropped += 1
+                return
+            if self.policy == 'drop_oldest':
+                self.items.popleft()
+                self.dropped += 1
+            else:
+                self.items.pop()
+                self.coalesced += 1
+            break
+        self.items.append(item)
+        self.not_empty.set()
+
+    async def get(self):
+        """Dequeue the oldest item; returns None once the queue is closed and drained."""
+        while not self.items:
+            if self.closed:
+                return None
+            self.not_empty.clear()
+            await self.not_empty.wait()
+        item = self.items.popleft()
+        self.not_full.set()
+        return item
+
+    def close(self) -> None:
+        """Signal that no more items will be put."""
+        self.closed = True
+        self.not_empty.set()
+
+    def stats(self) -> dict:
+        return {'depth': len(self.items), 'dropped': self.dropped, 'coalesced': self.coalesced}
+
+class LivePipeline:
+    def __init__(self, symbol: str, timeframe: str, source, start_date: str = DEFAULT_START_DATE,
+                 end_date: str = DEFAULT_END_DATE, tick_queue_size: int = 10000, tick_policy: str = 'block',
+                 bar_queue_size: int = 1, bar_policy: str = 'coalesce', warm_up_bars: int = 1000,
+                 volatility_window: int = 500, on_signal=None, numpy_inference: bool = False):
+        """Initialize a live pipeline for one pair/timeframe fed by a TickSource.
+
+        Ticks pass through a bounded queue into the bar aggregator, which updates the
+        streaming features on every bar close; closed-bar windows pass through a second
+        bounded queue to the registered model. With the default coalescing bar queue a
+        slow model always scores the latest bar instead of falling behind. History from
+        start_date to end_date warms up the features before the stream starts.
+        With numpy_inference the network runs from its NumPy export instead of TensorFlow.
+        """
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.source = source
+        self.start_date = start_date
+        self.end_date = end_date
+        self.pipeline = pipeline_for(timeframe)
+        self.tick_queue = BoundedQueue(tick_queue_size, tick_policy)
+        self.bar_queue = BoundedQueue(bar_queue_size, bar_policy)
+        self.warm_up_bars = warm_up_bars
+        self.closes = deque(maxlen=volatility_window)
+        self.on_signal = on_signal or (lambda signal: None)
+        self.numpy_inference = numpy_inference
+        self.aggregator = BarAggregator(timeframe)
+        self.engine = StreamingFeatureEngine(self.pipeline, MODEL_PARAMS[self.pipeline]['seq_length'])
+        # A single inference thread keeps model calls serialized while the event loop stays free
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.predictor = None
+        self.counts = {'events': 0, 'bars': 0, 'signals': 0}
+        self.tick_to_signal = LatencyStats()
+        self.model_latency = LatencyStats()
+
+    async def run(self) -> None:
+        """Load the model, warm up the features and process the stream until it ends."""
+        loop = asyncio.get_running_loop()
+        self.predictor = await loop.run_in_executor(self.executor, create_predictor, self.symbol,
+                                                    self.timeframe, self.start_date, self.end_date)
+        if not await loop.run_in_executor(self.executor, self.predictor.load_models, self.numpy_inference):
+            raise ValueError(f"No registered models for {self.symbol} {self.timeframe}; train them first.")
+        if self.warm_up_bars:
+            await loop.run_in_executor(self.executor, self._warm_up)
+        await asyncio.gather(self._ingest(), self._aggregate(), self._predict())
+
+    def _warm_up(self) -> None:
+        """Replay the most recent historical bars through the streaming features."""
+        df = self.predictor.data_loader.load_data()
+        if df.empty:
+            print(f"Warning: No history to warm up {self.symbol} {self.timeframe}; features warm up live.")
+            return
+        history = df.tail(self.warm_up_bars)
+        self.engine.warm_up(history)
+        self.closes.extend(history['Close'].to_numpy(dtype=float))
+
+    async def _ingest(self) -> None:
+        """Read the source into the tick queue, stamping each event with its arrival time."""
+        try:
+            async for event in self.source.stream():
+                await self.tick_queue.put((event, time.perf_counter()))
+        finally:
+            self.tick_queue.close()
+
+    async def _aggregate(self) -> None:
+        """Build bars from events and queue a feature window whenever a bar closes."""
+        while (item := await self.tick_queue.get()) is not None:
+            (time_ns, *values), received = item
+            self.counts['events'] += 1
+            if len(values) == 3:  # tick: bars are priced on the Bid, like the batch resampler
+                bid, _, volume = values
+                bar = self.aggregator.update(time_ns, bid, bid, bid, bid, volume)
+            else:
+                bar = self.aggregator.update(time_ns, *values)
+            if bar is not None:
+                await self._close_bar(bar, received)
+        bar = self.aggregator.flush()
+        if bar is not None:
+            await self._close_bar(bar, time.perf_counter())
+        self.bar_queue.close()
+
+    async def _close_bar(self, bar: dict, received: float) -> None:
+        self.counts['bars'] += 1
+        self.closes.append(bar['Close'])
+        if self.engine.update(bar) is None or not self.engine.ready:
+            return
+        closes = np.fromiter(self.closes, dtype=float)
+        volatility = float(np.std(np.diff(closes) / closes[:-1], ddof=1) * 100) if len(closes) > 2 else 0.0
+        await self.bar_queue.put((bar, self.engine.window(), volatility, received))
+
+    async def _predict(self) -> None:
+        """Score queued windows on the inference thread and emit signals."""
+        loop = asyncio.get_running_loop()
+        while (item := await self.bar_queue.get()) is not None:
+            bar, window, volatility, received = item
+            started = time.perf_counter()
+            # Signals carry no risk metrics, so the adaptive Monte Carlo stays off the per-bar path
+            output = await loop.run_in_executor(self.executor, self.predictor.predict_batch, window,
+                                                np.array([bar['Close']]), np.array([volatility]), False)
+            done = time.perf_counter()
+            self.model_latency.record(done - started)
+            self.tick_to_signal.record(done - received)
+            self.counts['signals'] += 1
+            self.on_signal({
+                'symbol': self.symbol,
+                'timeframe': self.timeframe,
+                'time': pd.Timestamp(bar['start']).isoformat(),
+                'close': bar['Close'],
+                'pred': float(output['pred'][0]),
+                'signal': int(output['signal'][0]),
+                'entry_price': float(output['entry_price'][0]) if output['signal'][0] else None,
+                'latency_ms': (done - received) * 1000
+            })
+
+    def stats(self) -> dict:
+        """Return event/bar/signal counts, queue overflow counters and latency percentiles."""
+        return {
+            **self.counts,
+            'tick_queue': self.tick_queue.stats(),
+            'bar_queue': self.bar_queue.stats(),
+            'tick_to_signal': self.tick_to_signal.summary(),
+            'model': self.model_latency.summary()
+        }
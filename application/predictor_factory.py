@@ -0,0 +1,26 @@
+# Predictor Factory (Application Layer)
+# Single Responsibility: Map a timeframe to the pipeline and predictor that serve it
+
+from config import TIMEFRAMES
+import importlib
+
+# Imported on demand so a run only loads the one pipeline it uses
+PREDICTORS = {
+    'short': ('application.short_predictor', 'ShortTrendPredictor'),
+    'medium': ('application.medium_predictor', 'MediumTrendPredictor'),
+    'long': ('application.long_predictor', 'LongTrendPredictor')
+}
+
+def pipeline_for(timeframe: str) -> str:
+    """Return 'short', 'medium' or 'long' for a timeframe."""
+    for pipeline, timeframes in TIMEFRAMES.items():
+        if timeframe in timeframes:
+            return pipeline
+    raise ValueError(f"Invalid timeframe: {timeframe}.")
+
+def create_predictor(symbol: str, timeframe: str, start_date: str, end_date: str, instrumentation=None,
+                     params: dict = None, refiner_params: dict = None):
+    """Return the predictor for the pipeline that serves the timeframe, optionally with overridden settings."""
+    module_name, class_name = PREDICTORS[pipeline_for(timeframe)]
+    predictor_class = getattr(importlib.import_module(module_name), class_name)
+    return predictor_class(symbol, start_date, end_date, timeframe, instrumentation, params, refiner_params)
@@ -0,0 +1,195 @@
+# Stage Graph (Application Layer)
+# Single Responsibility: Run a pipeline's stages as a dependency graph, concurrently and only when their inputs changed
+
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import hashlib
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+
+class Stage:
+    def __init__(self, name: str, run, deps: tuple = (), params: dict = None, key=None, persist: bool = False):
+        """Declare a stage computing run(*results of deps).
+
+        A stage without dependencies is a source: it always runs and its result is keyed
+        by content, by key(result) when given (default fingerprint). Any other stage is
+        keyed by its name, params and the keys of its dependencies, and is skipped while
+        that key is unchanged. With persist, the key and the JSON-serializable result are
+        also stored on disk, so a later process skips the stage and everything it needs.
+        """
+        self.name = name
+        self.run = run
+        self.deps = tuple(deps)
+        self.params = dict(params or {})
+        self.key = key or fingerprint
+        self.persist = persist
+
+def fingerprint(value) -> str:
+    """Content hash of a stage result: frames and arrays by their data, containers recursively."""
+    digest = hashlib.sha256()
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        digest.update(repr(list(value.columns) if isinstance(value, pd.DataFrame) else value.name).encode())
+    elif isinstance(value, np.ndarray):
+        digest.update(f"{value.dtype}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            digest.update(f"{key!r}:{fingerprint(value[key])};".encode())
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            digest.update(f"{fingerprint(item)};".encode())
+    else:
+        digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+class StageGraph:
+    def __init__(self, stages: list, max_workers: int = 4, store: str = None):
+        """Initialize an executor over stages given in any order; results are kept between runs.
+
+        Stages run on a thread pool as soon as their dependencies are done, so
+        independent ones (e.g. price and macro downloads) overlap. Persisted stages
+        are kept in store as one <stage>.json each.
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique.")
+        for stage in stages:
+            unknown = [dep for dep in stage.deps if dep not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages: {unknown}.")
+        self.order = self._topological_order()
+        self.max_workers = max_workers
+        self.store = os.path.abspath(store) if store else None
+        self.keys = {}
+        self.results = {}
+        self.report = {}
+
+    def _topological_order(self) -> list:
+        remaining = {name: set(stage.deps) for name, stage in self.stages.items()}
+        order = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Stage graph has a cycle through: {sorted(remaining)}.")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    def _needed(self, targets: tuple) -> set:
+        """The targets and every stage they depend on."""
+        needed, pending = set(), list(targets or self.stages)
+        while pending:
+            name = pending.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage: {name}.")
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.stages[name].deps)
+        return needed
+
+    def _key(self, stage: Stage, keys: dict) -> str:
+        parts = [stage.name, fingerprint(stage.params)] + [keys[dep] for dep in stage.deps]
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+    def _execute(self, stage: Stage, args: list) -> tuple:
+        started = time.perf_counter()
+        result = stage.run(*args)
+        content_key = None if stage.deps else stage.key(result)
+        return result, content_key, time.perf_counter() - started
+
+    def _restore(self, stage: Stage, key: str) -> bool:
+        """Load a persisted result stored under key; False if there is none."""
+        if not (stage.persist and self.store):
+            return False
+        path = os.path.join(self.store, f"{stage.name}.json")
+        try:
+            with open(path) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if stored.get('key') != key:
+            return False
+        self.keys[stage.name] = key
+        self.results[stage.name] = stored['result']
+        return True
+
+    def _persist(self, stage: Stage) -> None:
+        if not (stage.persist and self.store):
+            return
+        os.makedirs(self.store, exist_ok=True)
+        path = os.path.join(self.store, f"{stage.name}.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({'key': self.keys[stage.name], 'result': self.results[stage.name]}, f)
+        os.replace(tmp_path, path)
+
+    def run(self, *targets) -> dict:
+        """Run what the targets (all stages by default) need and return the targets' results by name.
+
+        Sources always run. Every other stage is reused from memory or the store when
+        its key is unchanged, in which case the stages it depends on are not run either.
+        report then maps each stage that was resolved to {'status', 'seconds'}, with
+        status 'ran', 'skipped' (kept in memory) or 'restored' (loaded from the store).
+        """
+        targets = targets or tuple(self.order)
+        needed = self._needed(targets)
+        self.report = {}
+        sources = [name for name in self.order if name in needed and not self.stages[name].deps]
+        self._run_stages(sources)
+        keys = {}
+        for name in self.order:
+            if name in needed:
+                stage = self.stages[name]
+                keys[name] = self.keys[name] if not stage.deps else self._key(stage, keys)
+        # Walk back from the targets: a reusable stage cuts off everything upstream of it
+        pending, to_run = list(targets), []
+        while pending:
+            name = pending.pop()
+            if name in self.report or name in to_run:
+                continue
+            stage = self.stages[name]
+            if not stage.deps:
+                continue
+            if self.keys.get(name) == keys[name] and name in self.results:
+                self.report[name] = {'status': 'skipped', 'seconds': 0.0}
+            elif self._restore(stage, keys[name]):
+                self.report[name] = {'status': 'restored', 'seconds': 0.0}
+            else:
+                to_run.append(name)
+                pending.extend(stage.deps)
+        self._run_stages([name for name in self.order if name in to_run], keys)
+        self.report = {name: self.report[name] for name in self.order if name in self.report}
+        return {name: self.results[name] for name in targets}
+
+    def _run_stages(self, names: list, keys: dict = None) -> None:
+        """Run the named stages on the thread pool, each once the ones it depends on among them are done."""
+        waiting = list(names)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while waiting or running:
+                for name in [name for name in waiting if not any(dep in waiting or dep in running.values()
+                                                                 for dep in self.stages[name].deps)]:
+                    stage = self.stages[name]
+                    waiting.remove(name)
+                    args = [self.results[dep] for dep in stage.deps]
+                    running[pool.submit(self._execute, stage, args)] = name
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        result, content_key, seconds = future.result()
+                    except Exception:
+                        # Keys are only stored with their results, so the next run retries this stage
+                        for other in running:
+                            other.cancel()
+                        raise
+                    self.keys[name] = content_key or keys[name]
+                    self.results[name] = result
+                    self.report[name] = {'status': 'ran', 'seconds': seconds}
+                    self._persist(self.stages[name])
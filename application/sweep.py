@@ -0,0 +1,178 @@
+# Parameter Sweep (Application Layer)
+# Single Responsibility: Tune a pipeline's settings over parallel trials sharing one feature pass
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import Manager
+from multiprocessing.shared_memory import SharedMemory
+from config import MODEL_PARAMS
+from application.predictor_factory import create_predictor, pipeline_for
+from infrastructure.utils import sliding_windows, first_valid_window, limit_native_threads
+import itertools
+import os
+import time
+import traceback
+import numpy as np
+import pandas as pd
+
+# Trial parameters with this prefix go to the XGBoost refiner, the rest to the network
+REFINER_PREFIX = 'refiner_'
+
+def expand_grid(grid: dict, max_trials: int = None, seed: int = 42) -> list:
+    """Expand {param: [values]} into trial dicts; above max_trials a seeded random subset is kept."""
+    names = list(grid)
+    trials = [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+    if max_trials and len(trials) > max_trials:
+        keep = np.random.default_rng(seed).choice(len(trials), max_trials, replace=False)
+        trials = [trials[i] for i in sorted(keep)]
+    return trials
+
+def split_params(trial: dict) -> tuple:
+    """Split a trial into (network params, refiner params)."""
+    params = {k: v for k, v in trial.items() if not k.startswith(REFINER_PREFIX)}
+    refiner_params = {k[len(REFINER_PREFIX):]: v for k, v in trial.items() if k.startswith(REFINER_PREFIX)}
+    return params, refiner_params
+
+class MedianPruner:
+    def __init__(self, manager, warmup_epochs: int = 2, min_trials: int = 3):
+        """Initialize a pruner shared by every worker through a multiprocessing Manager.
+
+        From warmup_epochs on, a trial whose validation loss is worse than the median
+        of at least min_trials other trials at the same epoch is stopped.
+        """
+        self.losses = manager.dict()
+        self.lock = manager.Lock()
+        self.warmup_epochs = warmup_epochs
+        self.min_trials = min_trials
+
+    def report(self, trial: int, epoch: int, loss: float) -> bool:
+        """Record a trial's loss after an epoch; returns True if the trial should stop."""
+        with self.lock:
+            others = [value for (t, e), value in self.losses.items() if e == epoch and t != trial]
+            self.losses[(trial, epoch)] = loss
+        return epoch >= self.warmup_epochs and len(others) >= self.min_trials and loss > np.median(others)
+
+# Shared blocks attached by this worker, kept open so window views stay valid across trials
+_ATTACHED = {}
+
+def _attach(name: str, shape: tuple, dtype: str) -> np.ndarray:
+    """Map the parent's shared feature matrix into this worker without copying it."""
+    if name not in _ATTACHED:
+        # Pool workers share the parent's resource tracker, so the parent alone unlinks the block
+        _ATTACHED[name] = SharedMemory(name=name)
+    data = np.ndarray(shape, dtype=dtype, buffer=_ATTACHED[name].buf)
+    data.flags.writeable = False
+    return data
+
+def _validation_loss(pred: np.ndarray, y: np.ndarray, is_classifier: bool, last_close: np.ndarray = None) -> tuple:
+    """Return (loss, accuracy): log loss and hit rate for classifiers, MSE and direction hit rate otherwise.
+
+    A regressor's direction is its move away from each window's last_close; without
+    last_close its accuracy is NaN.
+    """
+    pred = np.ravel(pred).astype(np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if is_classifier:
+        p = np.clip(pred, 1e-7, 1 - 1e-7)
+        return float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p))), float(np.mean((p > 0.5) == (y > 0.5)))
+    if last_close is None:
+        return float(np.mean((pred - y) ** 2)), np.nan
+    last_close = np.asarray(last_close, dtype=np.float64)
+    return float(np.mean((pred - y) ** 2)), float(np.mean(np.sign(pred - last_close) == np.sign(y - last_close)))
+
+def _run_trial(trial_id: int, symbol: str, timeframe: str, start_date: str, end_date: str, shared: tuple,
+               trial: dict, valid_fraction: float, pruner: MedianPruner, closes: np.ndarray = None) -> dict:
+    """Train one trial epoch by epoch on windows over the shared matrix and return its result record.
+
+    closes holds the raw Close of each matrix row, which regressors need for their direction hit rate.
+    """
+    record = {'trial': trial_id, **trial, 'status': 'ok', 'epochs_run': 0, 'nn_loss': np.nan,
+              'valid_loss': np.nan, 'accuracy': np.nan, 'error': None}
+    started = time.perf_counter()
+    try:
+        params, refiner_params = split_params(trial)
+        predictor = create_predictor(symbol, timeframe, start_date, end_date,
+                                     params=params, refiner_params=refiner_params)
+        is_classifier = pipeline_for(timeframe) != 'long'
+        data = _attach(*shared)
+        X, y = sliding_windows(data, predictor.params['seq_length'])
+        first = first_valid_window(data)
+        split = len(X) - max(int((len(X) - first) * valid_fraction), 1)
+        if split <= first:
+            raise ValueError(f"Not enough windows ({len(X) - first}) for a validation split.")
+        X_train, y_train, X_valid, y_valid = X[first:split], y[first:split], X[split:], y[split:]
+        seq_length = predictor.params['seq_length']
+        last_close = None if closes is None else closes[split + seq_length - 1:split + seq_length - 1 + len(X_valid)]
+
+        for epoch in range(predictor.params['epochs']):
+            predictor.model.fine_tune(X_train, y_train, epochs=1)
+            record['nn_loss'], _ = _validation_loss(predictor.model.predict(X_valid), y_valid, is_classifier)
+            record['epochs_run'] = epoch + 1
+            if pruner.report(trial_id, epoch, record['nn_loss']):
+                record['status'] = 'pruned'
+                break
+        if record['status'] == 'ok':
+            predictor.refiner.train_blocks([predictor.model.predict(X_train), X_train[:, -1, :]], y_train)
+            record['valid_loss'], record['accuracy'] = _validation_loss(predictor.score(X_valid), y_valid,
+                                                                        is_classifier, last_close)
+    except Exception as e:
+        record.update({'status': 'failed', 'error': f"{type(e).__name__}: {e}",
+                       'traceback': traceback.format_exc()})
+    record['seconds'] = time.perf_counter() - started
+    return record
+
+class ParameterSweep:
+    def __init__(self, symbol: str, timeframe: str, start_date: str, end_date: str, grid: dict,
+                 max_trials: int = None, workers: int = None, threads_per_worker: int = 1,
+                 valid_fraction: float = 0.2, warmup_epochs: int = 2, min_trials: int = 3):
+        """Initialize a sweep over {param: [values]} for one pair/timeframe.
+
+        Network keys are those of config.MODEL_PARAMS (seq_length, dropout, learning_rate,
+        batch_size, epochs); refiner_<name> keys override config.REFINER_PARAMS. Every
+        trial is scored on the most recent valid_fraction of windows.
+        """
+        self.pipeline = pipeline_for(timeframe)
+        unknown = [k for k in grid if not k.startswith(REFINER_PREFIX) and k not in MODEL_PARAMS[self.pipeline]]
+        if unknown:
+            raise ValueError(f"Invalid sweep parameters: {unknown}. Use {', '.join(MODEL_PARAMS[self.pipeline])} "
+                             f"or {REFINER_PREFIX}<xgboost param>.")
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.start_date = start_date
+        self.end_date = end_date
+        self.trials = expand_grid(grid, max_trials)
+        self.threads_per_worker = threads_per_worker
+        self.workers = workers or max(1, (os.cpu_count() or 1) // threads_per_worker)
+        self.valid_fraction = valid_fraction
+        self.warmup_epochs = warmup_epochs
+        self.min_trials = min_trials
+
+    def run(self) -> pd.DataFrame:
+        """Engineer features once, run every trial in the pool and return the results, best first."""
+        predictor = create_predictor(self.symbol, self.timeframe, self.start_date, self.end_date)
+        predictor.preprocess_data()
+        data = predictor.engineer.sequence_data()
+        # Regression targets are prices, so their direction is measured from the raw Close of each window
+        closes = None if self.pipeline != 'long' else predictor.engineer.df['Close'].to_numpy(dtype=np.float64)
+        shm = SharedMemory(create=True, size=max(data.nbytes, 1))
+        try:
+            np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)[:] = data
+            shared = (shm.name, data.shape, data.dtype.str)
+            del data, predictor  # workers read the shared copy; free the parent's
+            results = []
+            with Manager() as manager, ProcessPoolExecutor(max_workers=self.workers,
+                                                           initializer=limit_native_threads,
+                                                           initargs=(self.threads_per_worker,)) as pool:
+                pruner = MedianPruner(manager, self.warmup_epochs, self.min_trials)
+                futures = [pool.submit(_run_trial, i, self.symbol, self.timeframe, self.start_date, self.end_date,
+                                       shared, trial, self.valid_fraction, pruner, closes)
+                           for i, trial in enumerate(self.trials)]
+                for future in as_completed(futures):
+                    record = future.result()
+                    results.append(record)
+                    print(f"[{len(results)}/{len(self.trials)}] trial {record['trial']}: {record['status']} "
+                          f"after {record['epochs_run']} epochs in {record['seconds']:.1f}s")
+        finally:
+            shm.close()
+            shm.unlink()
+        table = pd.DataFrame(results)
+        return table.sort_values(['valid_loss', 'nn_loss'], na_position='last').reset_index(drop=True)
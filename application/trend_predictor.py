@@ -0,0 +1,252 @@
+# Trend Predictor (Application Layer)
+# Single Responsibility: Orchestrate a pipeline's prediction as a stage graph; subclasses configure the pipeline
+
+from config import MODEL_PARAMS, MONTE_CARLO_PARAMS
+from application.stage_graph import Stage, StageGraph
+from domain.models.xgboost_refiner import XGBoostRefiner
+from domain.monte_carlo import MonteCarloSimulator
+from domain.signals import SignalGenerator
+from infrastructure.data_loaders.duka_loader import DukaLoader
+from infrastructure.feature_cache import FeatureCache
+from infrastructure.instrumentation import Instrumentation
+from infrastructure.model_registry import ModelRegistry
+from infrastructure.feature_engineers.panel_features import PairFeatures, SEQUENCE_FEATURES
+from infrastructure.utils import sliding_windows, drop_incomplete_rows
+import numpy as np
+import pandas as pd
+import os
+
+class TrendPredictor:
+    pipeline = None        # 'short', 'medium' or 'long': selects MODEL_PARAMS, sequence features and signals
+    model_class = None     # network class taking (input_shape, dropout, learning_rate, batch_size)
+    engineer_class = None  # feature engineer class taking (bars, cache=, bars_key=)
+    is_classifier = True   # False when the pipeline predicts the next price
+
+    def __init__(self, symbol: str, start_date: str, end_date: str, timeframe: str,
+                 instrumentation: Instrumentation = None, params: dict = None, refiner_params: dict = None,
+                 stage_dir: str = "data/stages"):
+        """Initialize predictor; stage_dir keeps the pipeline's persisted stage results between runs."""
+        # params/refiner_params override config.MODEL_PARAMS[pipeline] and config.REFINER_PARAMS
+        self.params = {**MODEL_PARAMS[self.pipeline], **(params or {})}
+        self.refiner_params = refiner_params
+        self.symbol = symbol
+        self.instrumentation = instrumentation or Instrumentation()
+        self.registry_key = (self.pipeline, symbol, timeframe)
+        self.data_range = (start_date, end_date)
+        self.data_loader = DukaLoader(symbol, start_date, end_date, timeframe,
+                                      instrumentation=self.instrumentation)
+        self.stage_dir = os.path.join(os.path.abspath(stage_dir), *(str(part).lower() for part in self.registry_key))
+        self._model = None
+        self._refiner = None
+        self.feature_cache = FeatureCache()
+        self.registry = ModelRegistry()
+        self.monte_carlo = MonteCarloSimulator(**MONTE_CARLO_PARAMS)
+        self.signals = SignalGenerator()
+        self.engineer = None
+        self._graph = None
+
+    @property
+    def window_shape(self) -> tuple:
+        """(seq_length, features) of one input window."""
+        return self.params['seq_length'], len(SEQUENCE_FEATURES[self.pipeline])
+
+    @property
+    def model(self):
+        """Network, built on first use so data-only paths never import TensorFlow."""
+        if self._model is None:
+            self._model = self.model_class(self.window_shape, self.params['dropout'],
+                                           self.params['learning_rate'], self.params['batch_size'])
+        return self._model
+
+    @property
+    def refiner(self) -> XGBoostRefiner:
+        """XGBoost refiner, built on first use."""
+        if self._refiner is None:
+            self._refiner = XGBoostRefiner(is_classifier=self.is_classifier, params=self.refiner_params)
+        return self._refiner
+
+    @property
+    def graph(self) -> StageGraph:
+        """Stage graph of the pipeline, built on first use.
+
+        Results stay in memory between runs; the prediction and Monte Carlo results are
+        also persisted under stage_dir, so a new predictor over unchanged bars and
+        settings only reloads the bars.
+        """
+        if self._graph is None:
+            load_stages = self.load_stages()
+            self._graph = StageGraph(load_stages + [
+                Stage('features', self.engineer_features, (load_stages[-1].name,)),
+                Stage('windows', lambda features: self.build_windows(features[0]), ('features',),
+                      {'seq_length': self.params['seq_length']}),
+                Stage('nn_train', lambda windows: self.train_network(*windows), ('windows',), self.params),
+                Stage('refiner_train', lambda windows, network: self.train_refiner(*windows, *network),
+                      ('windows', 'nn_train'), self.refiner_params),
+                Stage('predict', lambda features, windows, _: self.predict_latest(features[1], windows[0]),
+                      ('features', 'windows', 'refiner_train'), persist=True),
+                Stage('monte_carlo', lambda prediction: self.simulate(prediction['pred'], prediction['volatility']),
+                      ('predict',), MONTE_CARLO_PARAMS, persist=True)
+            ], store=self.stage_dir)
+        return self._graph
+
+    def load_stages(self) -> list:
+        """Stages producing the bars features are engineered from; the last one feeds the features stage."""
+        # The content key is the feature cache's, so the bars are hashed once per run
+        return [Stage('load_price', self.load_price, key=self.feature_cache.fingerprint)]
+
+    def preprocess_data(self) -> tuple:
+        """Load and preprocess data, rerunning only the stages whose inputs changed."""
+        results = self.graph.run('features', 'windows')
+        X, y = results['windows']
+        self.engineer, df_processed = results['features']
+        return X, y, df_processed
+
+    def run(self) -> dict:
+        """Run every stage through Monte Carlo, skipping those whose inputs are unchanged since the last run."""
+        results = self.graph.run('predict', 'monte_carlo')
+        prediction = results['predict']
+        return {'pred': prediction['pred'], 'signal': prediction['signal'], 'monte_carlo': results['monte_carlo']}
+
+    def load_price(self) -> pd.DataFrame:
+        """Load the price bars."""
+        with self.instrumentation.span('load_price'):
+            df = self.data_loader.load_data()
+        if df.empty:
+            raise ValueError(f"No data loaded for {self.symbol} on {self.data_loader.timeframe}")
+        return df
+
+    def engineer_features(self, df: pd.DataFrame) -> tuple:
+        """Add the pipeline's features to the bars; returns (engineer, processed frame)."""
+        # Bars straight from the loader were already hashed as the graph's source key
+        bars_key = self.graph.keys.get('load_price') if self.graph.results.get('load_price') is df else None
+        with self.instrumentation.span('features', rows=len(df)):
+            engineer = self.engineer_class(df, cache=self.feature_cache, bars_key=bars_key)
+            df_processed = engineer.add_features()
+        self.engineer = engineer
+        return engineer, df_processed
+
+    def build_windows(self, engineer) -> tuple:
+        """Window an engineer's sequence matrix into (X, y)."""
+        with self.instrumentation.span('sequences') as span:
+            # Windows are views over the memory-mapped base matrix, so no 3-D tensor is built
+            data = self.feature_cache.column(engineer.bars_key, f'sequence_data:{self.pipeline}',
+                                             engineer.sequence_data, mmap=True)
+            X, y = sliding_windows(data, self.params['seq_length'])
+            span.record(n_windows=len(X), nbytes=X.nbytes)
+        return X, y
+
+    def preprocess_panel(self, view: PairFeatures) -> tuple:
+        """Take this pair's features from a panel engineered for every pair at once."""
+        self.engineer = view
+        with self.instrumentation.span('sequences') as span:
+            # The pair's matrix is a view into the panel's feature tensor, so no copy is made
+            X, y = sliding_windows(view.sequence_data(), self.params['seq_length'])
+            span.record(n_windows=len(X), nbytes=X.nbytes)
+        return X, y, drop_incomplete_rows(view.df)
+
+    def train(self, X: np.ndarray, y: np.ndarray):
+        """Train the models, reusing or fine-tuning registered artifacts when the data allows."""
+        self.train_refiner(X, y, *self.train_network(X, y))
+
+    def train_network(self, X: np.ndarray, y: np.ndarray) -> tuple:
+        """Load, fine-tune or train the network as the registry allows; returns (status, known rows, predictions)."""
+        with self.instrumentation.span('registry_load'):
+            status, known_rows = self.registry.match(self.registry_key, X, y)
+            if status != 'new':
+                self.registry.load(self.registry_key, self.model, self.refiner)
+        if status == 'current':
+            return status, known_rows, None
+        if status == 'extended':
+            X_new, y_new = X[known_rows:], y[known_rows:]
+            with self.instrumentation.span('nn_fine_tune', n_windows=len(X_new)):
+                self.model.fine_tune(X_new, y_new)
+                return status, known_rows, self.model.predict(X_new)
+        with self.instrumentation.span('nn_train', n_windows=len(X)):
+            self.model.train(X, y, self.params['epochs'])
+            return status, known_rows, self.model.predict(X)
+
+    def train_refiner(self, X: np.ndarray, y: np.ndarray, status: str, known_rows: int, preds: np.ndarray):
+        """Fine-tune or train the refiner on the network's predictions and register both models."""
+        if status == 'current':
+            return
+        if status == 'extended':
+            X_new, y_new = X[known_rows:], y[known_rows:]
+            with self.instrumentation.span('refiner_fine_tune', rows=len(X_new)):
+                self.refiner.fine_tune(np.hstack([preds, X_new[:, -1, :]]), y_new)
+        else:
+            with self.instrumentation.span('refiner_train', rows=len(X)):
+                self.refiner.train_blocks([preds, X[:, -1, :]], y)
+        with self.instrumentation.span('registry_save'):
+            self.registry.save(self.registry_key, self.model, self.refiner, X, y, self.data_range)
+
+    def fit(self, X: np.ndarray, y: np.ndarray):
+        """Train both models from scratch, bypassing the registry."""
+        with self.instrumentation.span('nn_train', n_windows=len(X)):
+            self.model.train(X, y, self.params['epochs'])
+            preds = self.model.predict(X)
+        with self.instrumentation.span('refiner_train', rows=len(X)):
+            self.refiner.train_blocks([preds, X[:, -1, :]], y)
+
+    def score(self, X: np.ndarray) -> np.ndarray:
+        """Return refined predictions for a batch of windows."""
+        with self.instrumentation.span('nn_predict', n_windows=len(X)):
+            preds = self.model.predict(X)
+        with self.instrumentation.span('refiner_predict', rows=len(X)):
+            return self.refiner.predict(np.hstack([preds, X[:, -1, :]]))
+
+    def predict(self, X_new: np.ndarray, price: float, volatility: float) -> dict:
+        """Generate prediction and trade signal."""
+        refined_pred, signal = self.predict_signal(X_new, price)
+        return {'pred': refined_pred, 'signal': signal, 'monte_carlo': self.simulate(refined_pred, volatility)}
+
+    def predict_signal(self, X_new: np.ndarray, price: float) -> tuple:
+        """Return the refined prediction and trade signal for the first window."""
+        with self.instrumentation.span('nn_predict', n_windows=len(X_new)):
+            pred = self.model.predict(X_new)[0]
+        with self.instrumentation.span('refiner_predict', rows=1):
+            X_refined = np.hstack([pred, X_new[0, -1, :]])
+            refined_pred = self.refiner.predict(X_refined.reshape(1, -1))[0]
+        return float(refined_pred), self.signals.format(*self.signals.generate(self.pipeline, refined_pred, price))[0]
+
+    def predict_latest(self, df_processed: pd.DataFrame, X: np.ndarray) -> dict:
+        """Predict from the latest window, with the last close and the close-to-close volatility in percent."""
+        price = df_processed['Close'].iloc[-1]
+        refined_pred, signal = self.predict_signal(X[-1:], price)
+        return {'pred': refined_pred, 'signal': signal,
+                'volatility': float(df_processed['Close'].pct_change().std() * 100)}
+
+    def simulate(self, pred: float, volatility: float) -> dict:
+        """Monte Carlo risk metrics around a refined prediction."""
+        with self.instrumentation.span('monte_carlo'):
+            return self.monte_carlo.simulate(pred, volatility, is_classifier=self.is_classifier)
+
+    def predict_batch(self, X_new: np.ndarray, prices: np.ndarray, volatilities: np.ndarray,
+                      simulate: bool = True) -> dict:
+        """Generate predictions, trade signals and risk metrics for a batch of windows in one pass.
+
+        The adaptive Monte Carlo runs until its tolerance is met; without simulate it is
+        skipped and 'monte_carlo' is None, keeping the cost per call bounded.
+        """
+        refined = self.score(X_new)
+        codes, entry_prices = self.signals.generate(self.pipeline, refined, prices)
+        mc_results = None
+        if simulate:
+            with self.instrumentation.span('monte_carlo', rows=len(refined)):
+                mc_results = self.monte_carlo.simulate_batch(refined, volatilities, is_classifier=self.is_classifier)
+        return {'pred': refined, 'signal': codes, 'entry_price': entry_prices, 'monte_carlo': mc_results}
+
+    def load_models(self, numpy_inference: bool = False) -> bool:
+        """Load registered artifacts without training data; returns False if none exist.
+
+        With numpy_inference the network runs from its NumPy export, so TensorFlow is never imported.
+        """
+        if not self.registry.has(self.registry_key):
+            return False
+        if numpy_inference:
+            network = self.registry.load_export(self.registry_key, self.refiner)
+            if network is not None:
+                self._model = network
+                return True
+            print(f"Warning: No NumPy export for {self.symbol}; loading the TensorFlow model.")
+        self.registry.load(self.registry_key, self.model, self.refiner)
+        return True
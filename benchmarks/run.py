@@ -0,0 +1,285 @@
+# Benchmark Suite
+# Single Responsibility: Time and memory-profile every hot path on synthetic M1-scale data
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from config import MODEL_PARAMS
+from benchmarks.synthetic import generate_bars, generate_ticks, write_raw_csv, write_bi5
+
+PIPELINES = {
+    'short': ('infrastructure.feature_engineers.short_features', 'ShortFeatureEngineer', MODEL_PARAMS['short']['seq_length'],
+              'domain.models.short_gru', 'ShortGRUModel', True),
+    'medium': ('infrastructure.feature_engineers.medium_features', 'MediumFeatureEngineer', MODEL_PARAMS['medium']['seq_length'],
+               'domain.models.medium_cnn_lstm', 'MediumCNNLSTMModel', True),
+    'long': ('infrastructure.feature_engineers.long_features', 'LongFeatureEngineer', MODEL_PARAMS['long']['seq_length'],
+             'domain.models.long_lstm', 'LongLSTMModel', False)
+}
+
+def _load(module_name: str, attr: str):
+    import importlib
+    return getattr(importlib.import_module(module_name), attr)
+
+def build_stages(ctx: dict) -> dict:
+    """Return stage name -> setup function; each setup returns the zero-argument callable to time."""
+    stages = {}
+
+    def csv_parse():
+        from infrastructure.data_loaders.duka_loader import read_raw_csv
+        return lambda: read_raw_csv(ctx['csv'])
+    stages['loader.csv_parse'] = csv_parse
+
+    def load_data():
+        from infrastructure.data_loaders.bar_store import BarStore
+        from infrastructure.data_loaders.duka_loader import DukaLoader, FixtureFetcher
+        start, end = ctx['ticks'].index[0].strftime("%Y-%m-%d"), ctx['ticks'].index[-1].strftime("%Y-%m-%d")
+
+        def run():
+            # A fresh store each time, so the run covers parsing, partitioning and resampling
+            store = BarStore(tempfile.mkdtemp(dir=ctx['workdir']))
+            DukaLoader('EURUSD', start, end, 'M1', store=store, fetcher=FixtureFetcher(ctx['fixtures'])).load_data()
+        return run
+    stages['loader.load_data'] = load_data
+
+    def bi5_fetch():
+        import threading
+        from functools import partial
+        from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+        from infrastructure.data_loaders.dukascopy_fetcher import DukascopyFetcher
+
+        class QuietHandler(SimpleHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, like the real datafeed
+
+            def log_message(self, *args):
+                pass
+        archives = os.path.join(ctx['workdir'], "bi5")
+        write_bi5(ctx['ticks'], archives)
+        server = ThreadingHTTPServer(('127.0.0.1', 0), partial(QuietHandler, directory=archives))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        start, end = ctx['ticks'].index[0].date(), ctx['ticks'].index[-1].date()
+        url = f"http://127.0.0.1:{server.server_port}"
+        # A fresh archive cache each time, so the run covers download and decode
+        return lambda: DukascopyFetcher(tempfile.mkdtemp(dir=ctx['workdir']), url)('EURUSD', 'TICK', start, end)
+    stages['loader.bi5_fetch'] = bi5_fetch
+
+    def resample_all():
+        from infrastructure.data_loaders.duka_loader import DAY_ALIGNED_TIMEFRAMES
+        from infrastructure.data_loaders.resampler import resample_all, ticks_to_ohlcv
+        return lambda: resample_all(ticks_to_ohlcv(ctx['ticks']), DAY_ALIGNED_TIMEFRAMES)
+    stages['loader.resample_all'] = resample_all
+
+    for name, (module, cls, seq_length, model_module, model_cls, _) in PIPELINES.items():
+        def add_features(module=module, cls=cls):
+            engineer_class = _load(module, cls)
+            return lambda: engineer_class(ctx['bars']).add_features()
+        stages[f'features.{name}.add_features'] = add_features
+
+        def prepare_sequences(module=module, cls=cls, seq_length=seq_length):
+            engineer = _load(module, cls)(ctx['bars'])
+            engineer.add_features()
+            return lambda: engineer.prepare_sequences(seq_length, np.float32)
+        stages[f'features.{name}.prepare_sequences'] = prepare_sequences
+
+        def panel_features(name=name):
+            from config import PAIRS
+            from infrastructure.data_loaders.panel_loader import align
+            from infrastructure.feature_engineers.panel_features import PanelFeatureEngineer
+            frames = {pair: generate_bars(len(ctx['bars']), seed=i) for i, pair in enumerate(PAIRS)}
+
+            def run():
+                engineer = PanelFeatureEngineer(align(frames), name)
+                engineer.add_features()
+                return engineer.sequence_data()
+            return run
+        stages[f'features.{name}.panel_all_pairs'] = panel_features
+
+        def model_train(name=name, model_module=model_module, model_cls=model_cls):
+            model, X, y = _model_inputs(ctx, name, model_module, model_cls)
+            return lambda: model.train(X, y, epochs=1)
+        stages[f'model.{name}.train'] = model_train
+
+        def model_predict(name=name, model_module=model_module, model_cls=model_cls):
+            model, X, _ = _model_inputs(ctx, name, model_module, model_cls)
+            return lambda: model.predict(X)
+        stages[f'model.{name}.predict'] = model_predict
+
+        def numpy_predict(name=name, model_module=model_module, model_cls=model_cls):
+            from domain.models.numpy_network import NumpyNetwork
+            model, X, _ = _model_inputs(ctx, name, model_module, model_cls)
+            network = NumpyNetwork.from_keras(model.model)
+            return lambda: network.predict(X)
+        stages[f'model.{name}.numpy_predict'] = numpy_predict
+
+        def numpy_predict_row(name=name, model_module=model_module, model_cls=model_cls):
+            from domain.models.numpy_network import NumpyNetwork
+            model, X, _ = _model_inputs(ctx, name, model_module, model_cls)
+            network = NumpyNetwork.from_keras(model.model)
+            rows = [X[i:i + 1] for i in range(100)]
+            return lambda: [network.predict(row) for row in rows]
+        stages[f'model.{name}.numpy_predict_row_x100'] = numpy_predict_row
+
+    def refiner_train():
+        refiner, X, y = _refiner_inputs(ctx)
+        return lambda: refiner.train(X, y)
+    stages['refiner.train'] = refiner_train
+
+    def refiner_predict():
+        refiner, X, y = _refiner_inputs(ctx)
+        refiner.train(X, y)
+        return lambda: refiner.predict(X)
+    stages['refiner.predict'] = refiner_predict
+
+    def refiner_train_blocks():
+        refiner, X, y = _refiner_inputs(ctx)
+        refiner.large_data_rows = 0  # force the chunked histogram path with early stopping
+        return lambda: refiner.train_blocks([X[:, :1], X[:, 1:]], y)
+    stages['refiner.train_blocks'] = refiner_train_blocks
+
+    def refiner_predict_row():
+        refiner, X, y = _refiner_inputs(ctx)
+        refiner.train(X, y)
+        rows = [X[i:i + 1] for i in range(1000)]
+        return lambda: [refiner.predict(row) for row in rows]
+    stages['refiner.predict_row_x1000'] = refiner_predict_row
+
+    def monte_carlo_simulate():
+        from domain.monte_carlo import MonteCarloSimulator
+        simulator = MonteCarloSimulator()
+        return lambda: [simulator.simulate(p, 0.05) for p in ctx['predictions'][:1000]]
+    stages['monte_carlo.simulate_x1000'] = monte_carlo_simulate
+
+    def monte_carlo_batch():
+        from domain.monte_carlo import MonteCarloSimulator
+        simulator = MonteCarloSimulator(seed=42)
+        return lambda: simulator.simulate_batch(ctx['predictions'], 0.05)
+    stages['monte_carlo.simulate_batch'] = monte_carlo_batch
+
+    def monte_carlo_adaptive():
+        from domain.monte_carlo import MonteCarloSimulator
+        simulator = MonteCarloSimulator(1024, seed=42, sampling='sobol', tolerance=0.01)
+        return lambda: simulator.simulate_batch(ctx['predictions'], 0.05)
+    stages['monte_carlo.simulate_batch_adaptive'] = monte_carlo_adaptive
+    return stages
+
+def _model_inputs(ctx: dict, name: str, model_module: str, model_cls: str) -> tuple:
+    """Build a network and a float32 training slice of train_rows windows."""
+    module, cls, seq_length = PIPELINES[name][:3]
+    engineer = _load(module, cls)(ctx['bars'].iloc[:ctx['train_rows'] + 250])
+    engineer.add_features()
+    X, y = engineer.prepare_sequences(seq_length, np.float32)
+    valid = ~np.isnan(X).any(axis=(1, 2))
+    X, y = np.ascontiguousarray(X[valid]), y[valid]
+    return _load(model_module, model_cls)(X.shape[1:]), X, y
+
+def _refiner_inputs(ctx: dict) -> tuple:
+    from domain.models.xgboost_refiner import XGBoostRefiner
+    rng = np.random.default_rng(42)
+    X = rng.random((ctx['train_rows'], 9), dtype=np.float32)
+    y = (X[:, 0] + rng.normal(0, 0.1, len(X)) > 0.5).astype(np.int8)
+    return XGBoostRefiner(), X, y
+
+def run_stage(setup, repeats: int) -> dict:
+    """Time the best of repeats runs, then measure the peak traced allocation of one more run."""
+    try:
+        fn = setup()
+    except ImportError as e:
+        return {'status': 'skipped', 'reason': str(e)}
+    timings = []
+    try:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    except Exception as e:
+        return {'status': 'failed', 'reason': f"{type(e).__name__}: {e}"}
+    finally:
+        tracemalloc.stop()
+    return {'status': 'ok', 'seconds': min(timings), 'peak_mb': peak / 2**20}
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return stages whose time or peak memory grew by more than tolerance over the baseline.
+
+    Small absolute slack (5 ms, 1 MB) keeps timer and allocator noise on tiny stages out.
+    """
+    regressions = []
+    for name, result in results['stages'].items():
+        base = baseline['stages'].get(name)
+        if result.get('status') != 'ok' or not base or base.get('status') != 'ok':
+            continue
+        for metric, slack in (('seconds', 0.005), ('peak_mb', 1.0)):
+            if result[metric] > base[metric] * (1 + tolerance) + slack:
+                regressions.append({'stage': name, 'metric': metric,
+                                    'baseline': base[metric], 'current': result[metric]})
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark every hot path on synthetic data")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="M1 bars for feature stages")
+    parser.add_argument("--ticks", type=int, default=1_000_000, help="Ticks for loader stages")
+    parser.add_argument("--train-rows", type=int, default=50_000, help="Windows for model/refiner stages")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per stage (best is kept)")
+    parser.add_argument("--stages", help="Comma-separated stage name prefixes to run")
+    parser.add_argument("--output", default="benchmarks/results/latest.json", help="JSON results file")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="forex-bench-")
+    try:
+        ctx = {'workdir': workdir, 'train_rows': args.train_rows, 'fixtures': os.path.join(workdir, "fixtures")}
+        os.makedirs(ctx['fixtures'])
+        ctx['bars'] = generate_bars(args.rows)
+        ctx['ticks'] = generate_ticks(args.ticks)
+        ctx['csv'] = os.path.join(ctx['fixtures'], "eurusd_tick_raw.csv")
+        write_raw_csv(ctx['ticks'], ctx['csv'])
+        ctx['predictions'] = np.random.default_rng(42).random(10_000)
+
+        prefixes = args.stages.split(",") if args.stages else None
+        results = {'meta': {'rows': args.rows, 'ticks': args.ticks, 'train_rows': args.train_rows,
+                            'python': platform.python_version(), 'numpy': np.__version__,
+                            'machine': platform.machine(), 'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S")},
+                   'stages': {}}
+        cwd = os.getcwd()
+        os.chdir(workdir)  # loaders create data/ directories relative to the working directory
+        try:
+            for name, setup in build_stages(ctx).items():
+                if prefixes and not any(name.startswith(prefix) for prefix in prefixes):
+                    continue
+                results['stages'][name] = run_stage(setup, args.repeats)
+                result = results['stages'][name]
+                detail = (f"{result['seconds']:.4f}s peak {result['peak_mb']:.1f} MB"
+                          if result['status'] == 'ok' else f"{result['status']} ({result['reason']})")
+                print(f"{name}: {detail}")
+        finally:
+            os.chdir(cwd)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression['stage']} {regression['metric']}: "
+                  f"{regression['baseline']:.4f} -> {regression['current']:.4f}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
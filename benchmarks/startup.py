@@ -0,0 +1,78 @@
+# Startup Benchmark
+# Single Responsibility: Track cold-start import cost of each entry path
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Modules that should only be imported by code that actually trains, loads or downloads
+HEAVY_MODULES = ['tensorflow', 'keras', 'xgboost', 'duka', 'pandas_datareader']
+
+# Entry path -> statement executed in a fresh interpreter
+ENTRY_POINTS = {
+    'main_help': "import runpy, sys; sys.argv = ['main.py', '--help']; runpy.run_path('main.py', run_name='__main__')",
+    'interactive_cli': "import presentation.cli",
+    'sync': "import presentation.batch, infrastructure.data_loaders.duka_loader",
+    'features': "import application.predictor_factory as f; f.create_predictor('EURUSD', 'H1', '2023-01-01', '2023-01-02')",
+    'montecarlo': "import domain.monte_carlo",
+    'numpy_inference': "import application.short_predictor, domain.models.numpy_network",
+    'predictor_module_short': "import application.short_predictor",
+    'predictor_module_long': "import application.long_predictor"
+}
+
+def measure(statement: str, repeats: int) -> dict:
+    """Run statement in fresh interpreters and report the best wall time and heavy imports."""
+    probe = (f"import time; _t = time.perf_counter()\n"
+             f"try:\n    exec({statement!r})\nexcept SystemExit:\n    pass\n"
+             f"import sys, json; print(json.dumps({{'seconds': time.perf_counter() - _t, "
+             f"'heavy': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))")
+    runs = []
+    for _ in range(repeats):
+        proc = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True)
+        if proc.returncode != 0:
+            return {'error': proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'failed'}
+        runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    return {'seconds': min(run['seconds'] for run in runs), 'heavy_modules': runs[0]['heavy']}
+
+def top_imports(statement: str, limit: int = 15) -> list:
+    """Return the most expensive modules by cumulative import time (-X importtime)."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=ROOT,
+                          capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({'module': name.strip(), 'cumulative_ms': int(cumulative_us) / 1000})
+    return sorted(rows, key=lambda row: row['cumulative_ms'], reverse=True)[:limit]
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold-start import cost per entry path")
+    parser.add_argument("--repeats", type=int, default=3, help="Fresh interpreters per entry path")
+    parser.add_argument("--output", default="benchmarks/results/startup.json", help="JSON results file")
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="Seconds allowed for paths that need no model; exceeding it fails the run")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, statement in ENTRY_POINTS.items():
+        results[name] = measure(statement, args.repeats)
+        results[name]['top_imports'] = top_imports(statement)
+        print(f"{name}: {results[name].get('seconds', results[name].get('error'))}")
+
+    over_budget = [name for name, result in results.items()
+                   if 'seconds' in result and result['seconds'] > args.budget]
+    leaking = [name for name, result in results.items() if result.get('heavy_modules')]
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({'budget_seconds': args.budget, 'results': results}, f, indent=2)
+    if over_budget or leaking:
+        print(f"Over budget: {over_budget}; heavy modules imported: {leaking}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
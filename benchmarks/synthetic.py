@@ -0,0 +1,57 @@
+# Synthetic Market Data
+# Single Responsibility: Generate deterministic ticks and OHLCV bars for offline benchmarks
+
+import pandas as pd
+import numpy as np
+import lzma
+import os
+
+def generate_ticks(rows: int, start: str = "2023-01-02", mean_gap_ms: float = 250.0,
+                   price: float = 1.08, seed: int = 42) -> pd.DataFrame:
+    """Random-walk Bid/Ask/Volume ticks indexed by Time, same layout as the raw Dukascopy frame."""
+    rng = np.random.default_rng(seed)
+    gaps = np.maximum(rng.exponential(mean_gap_ms, rows), 1).astype(np.int64)
+    times = np.datetime64(start, 'ms') + np.cumsum(gaps).astype('timedelta64[ms]')
+    bid = price * np.exp(np.cumsum(rng.normal(0, 2e-5, rows)))
+    spread = rng.uniform(0.5e-5, 2e-5, rows)
+    return pd.DataFrame({'Bid': bid, 'Ask': bid + spread, 'Volume': rng.integers(1, 10, rows).astype(float)},
+                        index=pd.DatetimeIndex(times.astype('datetime64[ns]'), name='Time'))
+
+def generate_bars(rows: int, freq: str = "1min", start: str = "2023-01-02",
+                  price: float = 1.08, seed: int = 42) -> pd.DataFrame:
+    """Random-walk OHLCV bars with consistent High/Low, indexed by Time."""
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0, 1e-4, rows)))
+    open_ = np.r_[price, close[:-1]]
+    wick = np.abs(rng.normal(0, 5e-5, (2, rows)))
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) + wick[0],
+        'Low': np.minimum(open_, close) - wick[1],
+        'Close': close,
+        'Volume': rng.integers(1, 500, rows).astype(float)
+    }, index=pd.date_range(start, periods=rows, freq=freq, name='Time'))
+
+def write_raw_csv(ticks: pd.DataFrame, path: str) -> None:
+    """Write ticks as a headerless raw CSV (epoch ms, Bid, Ask, Volume) like the duka output."""
+    out = pd.DataFrame({'Time': ticks.index.values.astype('datetime64[ms]').astype(np.int64),
+                        'Bid': ticks['Bid'].to_numpy(), 'Ask': ticks['Ask'].to_numpy(),
+                        'Volume': ticks['Volume'].to_numpy()})
+    out.to_csv(path, header=False, index=False, float_format="%.6f")
+
+def write_bi5(ticks: pd.DataFrame, directory: str, symbol: str = "EURUSD", point: float = 1e5) -> None:
+    """Write ticks as hourly .bi5 archives laid out like the Dukascopy datafeed under directory."""
+    from infrastructure.data_loaders.dukascopy_fetcher import TICK_RECORD, archive_path
+    ms = ticks.index.values.astype('datetime64[ms]').astype(np.int64)
+    hours = ms // 3_600_000
+    for hour in np.unique(hours):
+        rows = hours == hour
+        records = np.zeros(int(rows.sum()), dtype=TICK_RECORD)
+        records['ms'] = ms[rows] - hour * 3_600_000
+        records['ask'] = np.round(ticks['Ask'].to_numpy()[rows] * point)
+        records['bid'] = np.round(ticks['Bid'].to_numpy()[rows] * point)
+        records['ask_volume'] = ticks['Volume'].to_numpy()[rows]
+        path = os.path.join(directory, archive_path(symbol, pd.Timestamp(hour * 3_600_000, unit='ms').to_pydatetime()))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(lzma.compress(records.tobytes(), format=lzma.FORMAT_ALONE))
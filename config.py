@@ -7,5 +7,34 @@ TIMEFRAMES = {
     'medium': ['H1'],
     'long': ['D1', 'W1']
 }
+# Root of the hourly tick archives (<SYMBOL>/<YYYY>/<MM, zero-based>/<DD>/<HH>h_ticks.bi5)
+DUKASCOPY_URL = "https://datafeed.dukascopy.com/datafeed"
 DEFAULT_START_DATE = "2023-01-01"
-DEFAULT_END_DATE = "2023-12-31"
\ No newline at end of file
+DEFAULT_END_DATE = "2023-12-31"
+# (sell below, buy above) on the refined prediction per pipeline; the long pipeline
+# predicts a price, so its thresholds are relative moves away from the current price
+SIGNAL_THRESHOLDS = {'short': (0.2, 0.8), 'medium': (0.3, 0.7), 'long': (-0.02, 0.02)}
+
+# FRED series joined to the long pipeline: id -> (column name, release lag in days).
+# The lag is how long after its observation date a value is published, so bars
+# only ever see values that were public at the time.
+MACRO_SERIES = {
+    'FEDFUNDS': ('Interest_Rate', 32),
+    'DGS10': ('Treasury_10Y', 1),
+    'CPIAUCSL': ('CPI', 45)
+}
+
+# Network and training settings per pipeline, the single source for the models,
+# predictors, streaming windows and sweep defaults; seq_length is the window length
+MODEL_PARAMS = {
+    'short': {'seq_length': 10, 'dropout': 0.3, 'learning_rate': 0.01, 'batch_size': 64, 'epochs': 20},
+    'medium': {'seq_length': 20, 'dropout': 0.2, 'learning_rate': 0.001, 'batch_size': 32, 'epochs': 50},
+    'long': {'seq_length': 50, 'dropout': 0.1, 'learning_rate': 0.0005, 'batch_size': 16, 'epochs': 30}
+}
+# Monte Carlo risk settings of the predictors: randomized Sobol draws, doubled from
+# num_simulations until up_prob and expected_move (as a fraction of the volatility)
+# are known to within tolerance at 95% confidence
+MONTE_CARLO_PARAMS = {'num_simulations': 1024, 'sampling': 'sobol', 'tolerance': 0.01}
+# XGBoost refiner settings shared by every pipeline
+REFINER_PARAMS = {'n_estimators': 100, 'learning_rate': 0.1, 'max_depth': 5, 'subsample': 0.8,
+                  'colsample_bytree': 0.8, 'seed': 42}
@@ -0,0 +1,47 @@
+# Keras Network Base (Domain Layer)
+# Single Responsibility: Train, predict, persist and export a Keras network for one pipeline
+
+from abc import ABC, abstractmethod
+from domain.models.numpy_network import NumpyNetwork
+from domain.models.window_stream import VALIDATION_FRACTION, fit_windows, predict_windows
+from typing import TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    from tensorflow.keras.models import Sequential
+
+class KerasNetwork(ABC):
+    params = {}  # the pipeline's config.MODEL_PARAMS entry, set by each network
+
+    def __init__(self, input_shape: tuple, dropout_rate: float, learning_rate: float, batch_size: int):
+        """Initialize the network built by _build_model."""
+        self.batch_size = batch_size
+        self.model = self._build_model(input_shape, dropout_rate, learning_rate)
+
+    @abstractmethod
+    def _build_model(self, input_shape: tuple, dropout_rate: float, learning_rate: float) -> 'Sequential':
+        """Build and compile the network."""
+
+    def train(self, X: np.ndarray, y: np.ndarray, epochs: int = None) -> None:
+        """Train on streamed windows, validating on the most recent ones."""
+        fit_windows(self.model, X, y, self.batch_size, epochs or self.params['epochs'], VALIDATION_FRACTION)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Generate predictions."""
+        return predict_windows(self.model, X)
+
+    def fine_tune(self, X: np.ndarray, y: np.ndarray, epochs: int = 3) -> None:
+        """Continue training the current weights on newly arrived windows."""
+        fit_windows(self.model, X, y, self.batch_size, epochs)
+
+    def save(self, path: str) -> None:
+        """Save model weights."""
+        self.model.save_weights(path)
+
+    def load(self, path: str) -> None:
+        """Load model weights saved by save()."""
+        self.model.load_weights(path)
+
+    def export(self, path: str) -> None:
+        """Write the trained weights as a NumPy-only network (.npz) for TensorFlow-free inference."""
+        NumpyNetwork.from_keras(self.model).save(path)
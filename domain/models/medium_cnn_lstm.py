@@ -1,19 +1,29 @@
 # CNN-LSTM Model for Medium Timeframes (Domain Layer)
 # Single Responsibility: Predict hourly trends
 
-import tensorflow as tf
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Conv1D, LSTM, Dense, Dropout, MaxPooling1D
-from tensorflow.keras.optimizers import Adam
-import numpy as np
+from config import MODEL_PARAMS
+from domain.models.keras_network import KerasNetwork
+from typing import TYPE_CHECKING
 
-class MediumCNNLSTMModel:
-    def __init__(self, input_shape: tuple = (20, 6), dropout_rate: float = 0.2):
+if TYPE_CHECKING:
+    from tensorflow.keras.models import Sequential
+
+PARAMS = MODEL_PARAMS['medium']
+
+class MediumCNNLSTMModel(KerasNetwork):
+    params = PARAMS
+
+    def __init__(self, input_shape: tuple = (PARAMS['seq_length'], 6), dropout_rate: float = PARAMS['dropout'],
+                 learning_rate: float = PARAMS['learning_rate'], batch_size: int = PARAMS['batch_size']):
         """Initialize CNN-LSTM model for medium-term prediction."""
-        self.model = self._build_model(input_shape, dropout_rate)
+        super().__init__(input_shape, dropout_rate, learning_rate, batch_size)
 
-    def _build_model(self, input_shape: tuple, dropout_rate: float) -> Sequential:
+    def _build_model(self, input_shape: tuple, dropout_rate: float, learning_rate: float) -> 'Sequential':
         """Build and compile the CNN-LSTM model."""
+        # Imported here so only code paths that build a network pay for TensorFlow
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import Conv1D, LSTM, Dense, Dropout, MaxPooling1D
+        from tensorflow.keras.optimizers import Adam
         model = Sequential([
             Conv1D(64, kernel_size=2, activation='relu', input_shape=input_shape),
             MaxPooling1D(pool_size=2),
@@ -22,15 +32,7 @@ class MediumCNNLSTMModel:
             Dropout(dropout_rate),
             Dense(1, activation='sigmoid')
         ])
-        model.compile(optimizer=Adam(learning_rate=0.001), 
+        model.compile(optimizer=Adam(learning_rate=learning_rate), 
                      loss='binary_crossentropy', 
                      metrics=['accuracy'])
         return model
-
-    def train(self, X: np.ndarray, y: np.ndarray, epochs: int = 50) -> None:
-        """Train the CNN-LSTM model."""
-        self.model.fit(X, y, batch_size=32, epochs=epochs, validation_split=0.2, verbose=0)
-
-    def predict(self, X: np.ndarray) -> np.ndarray:
-        """Generate predictions."""
-        return self.model.predict(X, verbose=0)
\ No newline at end of file
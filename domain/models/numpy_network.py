@@ -0,0 +1,154 @@
+# NumPy Network (Domain Layer)
+# Single Responsibility: Run the trained networks' forward pass without TensorFlow
+
+import json
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'tanh': np.tanh,
+    'sigmoid': lambda x: 0.5 * np.tanh(0.5 * x) + 0.5  # same values as 1 / (1 + exp(-x)) without overflow
+}
+# Layers that only act during training and are dropped on export
+SKIPPED_LAYERS = ('InputLayer', 'Dropout')
+
+class NumpyNetwork:
+    # Keras layer config keys each exported layer kind keeps
+    CONFIG_KEYS = {
+        'GRU': ('units', 'activation', 'recurrent_activation', 'reset_after', 'return_sequences'),
+        'LSTM': ('units', 'activation', 'recurrent_activation', 'return_sequences'),
+        'Conv1D': ('activation', 'strides', 'dilation_rate', 'padding'),
+        'MaxPooling1D': ('pool_size', 'strides', 'padding'),
+        'Dense': ('activation',)
+    }
+
+    def __init__(self, layers: list):
+        """Initialize from [(kind, config, weights)] in forward order, weights as Keras get_weights() returns them."""
+        self.layers = [(kind, config, [np.asarray(w, dtype=np.float32) for w in weights])
+                       for kind, config, weights in layers]
+
+    @classmethod
+    def from_keras(cls, model) -> 'NumpyNetwork':
+        """Extract the layers and trained weights of a Sequential Keras model."""
+        layers = []
+        for layer in model.layers:
+            kind = type(layer).__name__
+            if kind in SKIPPED_LAYERS:
+                continue
+            if kind not in cls.CONFIG_KEYS:
+                raise ValueError(f"Unsupported layer for NumPy inference: {kind}.")
+            config = {key: value for key, value in layer.get_config().items() if key in cls.CONFIG_KEYS[kind]}
+            config['use_bias'] = layer.get_config().get('use_bias', True)
+            for key in ('activation', 'recurrent_activation'):
+                if key in config and config[key] not in ACTIVATIONS:
+                    raise ValueError(f"Unsupported {key} for NumPy inference: {config[key]}.")
+            if config.get('padding', 'valid') != 'valid':
+                raise ValueError(f"Unsupported padding for NumPy inference: {config['padding']}.")
+            layers.append((kind, config, layer.get_weights()))
+        return cls(layers)
+
+    def save(self, path: str) -> None:
+        """Write the layer specs and weights to one compact .npz file."""
+        spec = [{'kind': kind, 'config': config, 'weights': len(weights)} for kind, config, weights in self.layers]
+        arrays = {f"{i}/{j}": w for i, (_, _, weights) in enumerate(self.layers) for j, w in enumerate(weights)}
+        np.savez(path, spec=np.array(json.dumps(spec)), **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> 'NumpyNetwork':
+        """Load a network written by save()."""
+        with np.load(path, allow_pickle=False) as archive:
+            spec = json.loads(str(archive['spec']))
+            return cls([(layer['kind'], layer['config'], [archive[f"{i}/{j}"] for j in range(layer['weights'])])
+                        for i, layer in enumerate(spec)])
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Forward a (batch, steps, features) float32 batch; returns (batch, outputs) like Keras."""
+        x = np.asarray(X, dtype=np.float32)
+        for kind, config, weights in self.layers:
+            x = getattr(self, f"_{kind.lower()}")(x, config, weights)
+        return x
+
+    @staticmethod
+    def _split_bias(config: dict, weights: list, width: int) -> tuple:
+        """Return (kernel, recurrent kernel, bias) with a zero bias when the layer has none."""
+        bias = weights[2] if config['use_bias'] else np.zeros(width, dtype=np.float32)
+        return weights[0], weights[1], bias
+
+    @classmethod
+    def _gru(cls, x: np.ndarray, config: dict, weights: list) -> np.ndarray:
+        units = config['units']
+        act, recurrent_act = ACTIVATIONS[config['activation']], ACTIVATIONS[config['recurrent_activation']]
+        kernel, recurrent, bias = cls._split_bias(config, weights, 3 * units)
+        reset_after = config.get('reset_after', True)
+        bias = bias.reshape(-1, 3 * units)
+        input_bias, recurrent_bias = bias[0], bias[1] if reset_after else np.zeros_like(bias[0])
+        # Input projections of every step in one matmul; gate order is update, reset, candidate
+        projected = x @ kernel + input_bias
+        h = np.zeros((len(x), units), dtype=np.float32)
+        outputs = []
+        for t in range(x.shape[1]):
+            step = projected[:, t]
+            if reset_after:
+                hidden = h @ recurrent + recurrent_bias
+                z = recurrent_act(step[:, :units] + hidden[:, :units])
+                r = recurrent_act(step[:, units:2 * units] + hidden[:, units:2 * units])
+                candidate = act(step[:, 2 * units:] + r * hidden[:, 2 * units:])
+            else:
+                hidden = h @ recurrent[:, :2 * units]
+                z = recurrent_act(step[:, :units] + hidden[:, :units])
+                r = recurrent_act(step[:, units:2 * units] + hidden[:, units:])
+                candidate = act(step[:, 2 * units:] + (r * h) @ recurrent[:, 2 * units:])
+            h = z * h + (1 - z) * candidate
+            outputs.append(h)
+        return np.stack(outputs, axis=1) if config['return_sequences'] else h
+
+    @classmethod
+    def _lstm(cls, x: np.ndarray, config: dict, weights: list) -> np.ndarray:
+        units = config['units']
+        act, recurrent_act = ACTIVATIONS[config['activation']], ACTIVATIONS[config['recurrent_activation']]
+        kernel, recurrent, bias = cls._split_bias(config, weights, 4 * units)
+        # Gate order is input, forget, cell, output
+        projected = x @ kernel + bias
+        h = np.zeros((len(x), units), dtype=np.float32)
+        c = np.zeros((len(x), units), dtype=np.float32)
+        outputs = []
+        for t in range(x.shape[1]):
+            gates = projected[:, t] + h @ recurrent
+            i = recurrent_act(gates[:, :units])
+            f = recurrent_act(gates[:, units:2 * units])
+            c = f * c + i * act(gates[:, 2 * units:3 * units])
+            h = recurrent_act(gates[:, 3 * units:]) * act(c)
+            outputs.append(h)
+        return np.stack(outputs, axis=1) if config['return_sequences'] else h
+
+    @staticmethod
+    def _conv1d(x: np.ndarray, config: dict, weights: list) -> np.ndarray:
+        kernel = weights[0]  # (kernel_size, in_channels, filters)
+        (stride,), (dilation,) = config['strides'], config['dilation_rate']
+        span = (len(kernel) - 1) * dilation + 1
+        # (batch, positions, channels, kernel_size) views over the input; no patches are copied
+        patches = sliding_window_view(x, span, axis=1)[:, ::stride, :, ::dilation]
+        out = np.einsum('npck,kcf->npf', patches, kernel, optimize=True)
+        if config['use_bias']:
+            out += weights[1]
+        return ACTIVATIONS[config['activation']](out)
+
+    @staticmethod
+    def _maxpooling1d(x: np.ndarray, config: dict, weights: list) -> np.ndarray:
+        (pool,), strides = config['pool_size'], config['strides']
+        stride = strides[0] if strides else pool
+        return sliding_window_view(x, pool, axis=1)[:, ::stride].max(axis=-1)
+
+    @staticmethod
+    def _dense(x: np.ndarray, config: dict, weights: list) -> np.ndarray:
+        out = x @ weights[0]
+        if config['use_bias']:
+            out += weights[1]
+        return ACTIVATIONS[config['activation']](out)
+
+def parity_error(keras_model, network: NumpyNetwork, X: np.ndarray) -> float:
+    """Largest absolute difference between the Keras and NumPy outputs for the same windows."""
+    expected = keras_model.predict(np.ascontiguousarray(X, dtype=np.float32), verbose=0)
+    return float(np.max(np.abs(network.predict(X) - expected))) if len(X) else 0.0
@@ -0,0 +1,68 @@
+# Window Streaming (Domain Layer)
+# Single Responsibility: Feed windows to the networks batch by batch without materializing them
+
+import itertools
+import numpy as np
+
+# Most recent share of windows held out to validate training
+VALIDATION_FRACTION = 0.2
+# Batches per shuffle block: windows are shuffled within a block and blocks are visited in random order
+BLOCK_BATCHES = 64
+# Windows scored per forward pass when predicting
+PREDICT_BATCH = 1024
+
+def window_batches(X: np.ndarray, y: np.ndarray = None, batch_size: int = 32, shuffle: bool = False,
+                   seed: int = None):
+    """Yield contiguous float32 X (or (X, y)) batches copied out of a window view one at a time.
+
+    X is typically a sliding_windows view over a memory-mapped base matrix, so
+    only the current block of batch_size * BLOCK_BATCHES windows is ever resident;
+    shuffling within blocks keeps reads from the base sequential.
+    """
+    rng = np.random.default_rng(seed)
+    block = batch_size * BLOCK_BATCHES
+    starts = np.arange(0, len(X), block)
+    if shuffle:
+        rng.shuffle(starts)
+    for start in starts:
+        stop = min(start + block, len(X))
+        X_block = np.asarray(X[start:stop], dtype=np.float32)
+        if not shuffle:
+            X_block = np.ascontiguousarray(X_block)
+        y_block = None if y is None else np.asarray(y[start:stop], dtype=np.float32)
+        order = rng.permutation(stop - start) if shuffle else np.arange(stop - start)
+        for i in range(0, stop - start, batch_size):
+            batch = order[i:i + batch_size] if shuffle else slice(i, i + batch_size)
+            yield X_block[batch] if y is None else (X_block[batch], y_block[batch])
+
+def window_dataset(X: np.ndarray, y: np.ndarray = None, batch_size: int = 32, shuffle: bool = False,
+                   seed: int = None):
+    """Wrap window_batches in a tf.data pipeline that prefetches the next batches while one trains."""
+    import tensorflow as tf
+    x_spec = tf.TensorSpec((None, *X.shape[1:]), tf.float32)
+    signature = x_spec if y is None else (x_spec, tf.TensorSpec((None,), tf.float32))
+    epochs = itertools.count()
+
+    def generate():
+        # A new seed every pass over the data so each epoch sees a different order
+        yield from window_batches(X, y, batch_size, shuffle, None if seed is None else seed + next(epochs))
+
+    return tf.data.Dataset.from_generator(generate, output_signature=signature).prefetch(tf.data.AUTOTUNE)
+
+def fit_windows(model, X: np.ndarray, y: np.ndarray, batch_size: int, epochs: int,
+                valid_fraction: float = 0.0) -> None:
+    """Fit a Keras model on streamed windows, validating on the most recent valid_fraction of them.
+
+    Replaces fit(X, y, validation_split=...), which first copies every window
+    into one tensor and then slices it again.
+    """
+    split = len(X) - int(len(X) * valid_fraction)
+    validation = window_dataset(X[split:], y[split:], batch_size) if split < len(X) else None
+    model.fit(window_dataset(X[:split], y[:split], batch_size, shuffle=True), validation_data=validation,
+              epochs=epochs, verbose=0)
+
+def predict_windows(model, X: np.ndarray) -> np.ndarray:
+    """Score windows with a Keras model, streaming them when there is more than one batch."""
+    if len(X) <= PREDICT_BATCH:
+        return model.predict(np.ascontiguousarray(X, dtype=np.float32), verbose=0)
+    return model.predict(window_dataset(X, batch_size=PREDICT_BATCH), verbose=0)
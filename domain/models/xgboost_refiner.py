@@ -1,28 +1,211 @@
 # XGBoost Refiner (Domain Layer)
 # Single Responsibility: Refine predictions across all timeframes
 
-import xgboost as xgb
+from config import REFINER_PARAMS
 import numpy as np
+import json
+
+# Row count from which train_blocks switches to chunked histogram training
+LARGE_DATA_ROWS = 1_000_000
+# Batches up to this many rows are scored from the flattened trees instead of the booster
+SMALL_BATCH_ROWS = 64
 
 class XGBoostRefiner:
-    def __init__(self, is_classifier: bool = True):
-        """Initialize XGBoost model for refining predictions."""
-        params = {
-            'n_estimators': 100,
-            'learning_rate': 0.1,
-            'max_depth': 5,
-            'subsample': 0.8,
-            'colsample_bytree': 0.8,
-            'seed': 42
-        }
+    def __init__(self, is_classifier: bool = True, params: dict = None, nthread: int = None, max_bin: int = 256,
+                 large_data_rows: int = LARGE_DATA_ROWS, chunk_rows: int = 262_144,
+                 validation_fraction: float = 0.1, early_stopping_rounds: int = 10, cache_dir: str = None):
+        """Initialize XGBoost model for refining predictions.
+
+        params overrides config.REFINER_PARAMS (n_estimators, learning_rate, max_depth, ...).
+        train_blocks holds out the most recent validation_fraction of rows and stops
+        early_stopping_rounds after their loss last improved. Inputs of at least
+        large_data_rows rows are trained from chunks of chunk_rows quantized into a
+        histogram matrix, spilled to cache_dir as external memory when given.
+        """
+        import xgboost as xgb  # deferred so importing the refiner stays cheap
+        self.is_classifier = is_classifier
+        self.nthread = nthread
+        self.max_bin = max_bin
+        self.large_data_rows = large_data_rows
+        self.chunk_rows = chunk_rows
+        self.validation_fraction = validation_fraction
+        self.early_stopping_rounds = early_stopping_rounds
+        self.cache_dir = cache_dir
+        params = {**REFINER_PARAMS, **(params or {}), 'tree_method': 'hist', 'max_bin': max_bin, 'n_jobs': nthread}
         self.model = xgb.XGBClassifier(**params) if is_classifier else xgb.XGBRegressor(**params)
+        self._booster = None
+        self._trees = None
+
+    @property
+    def booster(self):
+        """The trained booster that every prediction path scores from."""
+        return self._booster
+
+    @booster.setter
+    def booster(self, booster) -> None:
+        self._booster = booster
+        self._trees = None  # re-flattened on the next small-batch prediction
 
     def train(self, X: np.ndarray, y: np.ndarray) -> None:
         """Train the XGBoost model."""
         self.model.fit(X, y)
+        self.booster = self.model.get_booster()
+
+    def train_blocks(self, blocks: list, y: np.ndarray) -> None:
+        """Train on the column-wise concatenation of blocks without materializing it when large.
+
+        blocks share their row count, e.g. [network predictions, last-step features]. The
+        most recent validation_fraction of rows is held out for early stopping.
+        """
+        import xgboost as xgb
+        split = len(y) - max(int(len(y) * self.validation_fraction), 1)
+        if split < 1:  # too few rows to hold any out
+            self.train(np.hstack(blocks), y)
+            return
+        if len(y) < self.large_data_rows:
+            X = np.hstack(blocks)
+            dtrain = xgb.QuantileDMatrix(X[:split], y[:split], max_bin=self.max_bin, nthread=self.nthread)
+            dvalid = xgb.QuantileDMatrix(X[split:], y[split:], max_bin=self.max_bin, nthread=self.nthread,
+                                         ref=dtrain)
+        else:
+            prefix = lambda name: f"{self.cache_dir}/{name}" if self.cache_dir else None
+            train_batches = _block_batches(blocks, y, 0, split, self.chunk_rows, prefix('train'))
+            valid_batches = _block_batches(blocks, y, split, len(y), self.chunk_rows, prefix('valid'))
+            if self.cache_dir:
+                # External memory: pages are cached on disk and streamed during training
+                dtrain = xgb.DMatrix(train_batches, nthread=self.nthread)
+                dvalid = xgb.DMatrix(valid_batches, nthread=self.nthread)
+            else:
+                dtrain = xgb.QuantileDMatrix(train_batches, max_bin=self.max_bin, nthread=self.nthread)
+                dvalid = xgb.QuantileDMatrix(valid_batches, max_bin=self.max_bin, nthread=self.nthread,
+                                             ref=dtrain)
+        booster = xgb.train(
+            self.model.get_xgb_params(), dtrain, num_boost_round=self.model.get_params()['n_estimators'],
+            evals=[(dvalid, 'valid')], early_stopping_rounds=self.early_stopping_rounds, verbose_eval=False
+        )
+        # Keep only the trees up to the best validation round so predictions and fine-tuning use them all
+        self.booster = booster[:booster.best_iteration + 1]
+
+    def fine_tune(self, X: np.ndarray, y: np.ndarray, n_estimators: int = 20) -> None:
+        """Continue boosting from the current booster on newly arrived rows."""
+        original = self.model.get_params()['n_estimators']
+        self.model.set_params(n_estimators=n_estimators)
+        try:
+            self.model.fit(X, y, xgb_model=self.booster)
+        finally:
+            self.model.set_params(n_estimators=original)
+        self.booster = self.model.get_booster()
+
+    def save(self, path: str) -> None:
+        """Save the booster."""
+        self.booster.save_model(path)
+
+    def load(self, path: str) -> None:
+        """Load a booster saved by save()."""
+        import xgboost as xgb
+        self.booster = xgb.Booster(model_file=path)
+        if self.nthread:
+            self.booster.set_param({'nthread': self.nthread})
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Generate refined predictions (class-1 probabilities for the classifier).
+
+        Large batches use the booster's inplace_predict, which skips DMatrix
+        construction; a few rows are scored from flattened tree arrays, avoiding
+        XGBoost's fixed per-call cost.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if len(X) <= SMALL_BATCH_ROWS:
+            if self._trees is None:
+                self._trees = _FlatTrees.from_booster(self.booster)
+            if self._trees:
+                return self._trees.predict(X)
+        return self.booster.inplace_predict(X)
+
+class _FlatTrees:
+    """Tree ensemble packed into flat node arrays and evaluated level by level for all trees at once."""
+
+    LINKS = {'binary:logistic': lambda margin: 1 / (1 + np.exp(-margin)), 'reg:squarederror': lambda margin: margin}
+
+    def __init__(self, trees: list, base_margin: float, link):
+        sizes = [len(tree['left_children']) for tree in trees]
+        self.roots = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.intp)
+        left, right, feature, value, default_left = [], [], [], [], []
+        for root, tree in zip(self.roots, trees):
+            nodes = np.arange(len(tree['left_children']))
+            leaf = np.asarray(tree['left_children']) == -1
+            # Leaves point at themselves so extra levels on shallow branches are no-ops
+            left.append(np.where(leaf, nodes, tree['left_children']) + root)
+            right.append(np.where(leaf, nodes, tree['right_children']) + root)
+            feature.append(np.where(leaf, 0, tree['split_indices']))
+            value.append(tree['split_conditions'])
+            default_left.append(tree['default_left'])
+        # children[2 * node] is the left child and children[2 * node + 1] the right one
+        self.children = np.stack([np.concatenate(left), np.concatenate(right)], axis=1).ravel()
+        self.feature = np.concatenate(feature).astype(np.intp)
+        # Holds the split threshold on internal nodes and the leaf value on leaves
+        self.value = np.concatenate(value).astype(np.float32)
+        self.default_left = np.concatenate(default_left).astype(bool)
+        self.depth = max(_tree_depth(tree) for tree in trees)
+        self.base_margin = base_margin
+        self.link = link
+
+    @classmethod
+    def from_booster(cls, booster):
+        """Flatten a single-output gbtree booster; returns False for models this cannot score."""
+        learner = json.loads(booster.save_raw('json'))['learner']
+        objective = learner['objective']['name']
+        model = learner['gradient_booster'].get('model', {})
+        trees = model.get('trees', [])
+        if (objective not in cls.LINKS or not trees or learner['gradient_booster']['name'] != 'gbtree'
+                or any(tree['categories_nodes'] for tree in trees)):
+            return False
+        base_score = float(str(learner['learner_model_param']['base_score']).strip('[]'))
+        base_margin = np.log(base_score / (1 - base_score)) if objective == 'binary:logistic' else base_score
+        return cls(trees, base_margin, cls.LINKS[objective])
 
     def predict(self, X: np.ndarray) -> np.ndarray:
-        """Generate refined predictions."""
-        if isinstance(self.model, xgb.XGBClassifier):
-            return self.model.predict_proba(X)[:, 1]
-        return self.model.predict(X)
\ No newline at end of file
+        flat_X = X.ravel()
+        row_starts = (np.arange(len(X)) * X.shape[1])[:, None]
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        has_missing = np.isnan(flat_X).any()
+        for _ in range(self.depth):
+            x = flat_X.take(row_starts + self.feature.take(node))
+            go_left = x < self.value.take(node)
+            if has_missing:
+                go_left |= np.isnan(x) & self.default_left.take(node)
+            node = self.children.take(2 * node + ~go_left)
+        margin = self.base_margin + self.value.take(node).sum(axis=1, dtype=np.float64)
+        return self.link(margin).astype(np.float32)
+
+def _tree_depth(tree: dict) -> int:
+    """Number of splits on the longest root-to-leaf path."""
+    depth = np.zeros(len(tree['left_children']), dtype=np.int32)
+    for node, (left, right) in enumerate(zip(tree['left_children'], tree['right_children'])):
+        if left != -1:
+            depth[left] = depth[right] = depth[node] + 1
+    return int(depth.max())
+
+def _block_batches(blocks: list, y: np.ndarray, start: int, stop: int, chunk_rows: int,
+                   cache_prefix: str = None):
+    """Return an xgb.DataIter yielding rows [start, stop) of the stacked blocks chunk by chunk."""
+    import xgboost as xgb
+
+    class BlockBatches(xgb.DataIter):
+        def __init__(self):
+            super().__init__(cache_prefix=cache_prefix)
+            self.position = start
+
+        def next(self, input_data) -> bool:
+            if self.position >= stop:
+                return False
+            end = min(self.position + chunk_rows, stop)
+            data = np.hstack([np.asarray(block[self.position:end], dtype=np.float32) for block in blocks])
+            input_data(data=data, label=y[self.position:end])
+            self.position = end
+            return True
+
+        def reset(self) -> None:
+            self.position = start
+
+    return BlockBatches()
@@ -3,26 +3,259 @@
 
 import numpy as np
 
+SAMPLINGS = ('pseudo', 'antithetic', 'halton', 'sobol')
+# Randomized quasi-Monte Carlo draws this many independently shifted copies of the
+# point set; the spread of their means gives the error estimate
+QMC_REPLICATES = 16
+# Joe-Kuo primitive polynomials (degree, coefficients, initial direction numbers)
+# for Sobol dimensions 2..16; dimension 1 is the van der Corput sequence
+SOBOL_POLYNOMIALS = [
+    (1, 0, (1,)), (2, 1, (1, 3)), (3, 1, (1, 3, 1)), (3, 2, (1, 1, 1)), (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)), (5, 2, (1, 1, 5, 5, 17)), (5, 4, (1, 1, 5, 5, 5)), (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)), (5, 13, (1, 1, 1, 3, 11)), (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)), (6, 13, (1, 1, 1, 15, 21, 21)), (6, 16, (1, 3, 1, 13, 27, 49))
+]
+# Acklam's rational approximation of the inverse normal CDF (relative error below 1.2e-9)
+_PPF_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+          1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_PPF_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+          6.680131188771972e+01, -1.328068155288572e+01, 1.0)
+_PPF_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+          -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_PPF_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00, 1.0)
+_PPF_TAIL = 0.02425
+
+def _horner(coefficients: tuple, x: np.ndarray) -> np.ndarray:
+    result = np.full_like(x, coefficients[0])
+    for c in coefficients[1:]:
+        result *= x
+        result += c
+    return result
+
+def normal_ppf(u) -> np.ndarray:
+    """Inverse standard normal CDF of probabilities strictly between 0 and 1."""
+    u = np.asarray(u, dtype=np.float64)
+    q = u - 0.5
+    r = q * q
+    x = _horner(_PPF_A, r)
+    x /= _horner(_PPF_B, r)
+    x *= q
+    # Only the few points in the tails take the logarithmic branch
+    tail = np.abs(q) > 0.5 - _PPF_TAIL
+    if tail.any():
+        lower = u[tail] < 0.5
+        t = np.sqrt(-2 * np.log(np.where(lower, u[tail], 1 - u[tail])))
+        x[tail] = np.where(lower, 1, -1) * _horner(_PPF_C, t) / _horner(_PPF_D, t)
+    return x
+
+def t_quantile(p: float, dof: int) -> float:
+    """Student-t quantile from the normal one by the Cornish-Fisher expansion (accurate to ~1e-3 from 10 dof)."""
+    z = float(normal_ppf(p))
+    return (z + (z**3 + z) / (4 * dof) + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * dof**2)
+            + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * dof**3))
+
+def _primes(count: int) -> list:
+    primes, candidate = [], 2
+    while len(primes) < count:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+def halton(start: int, count: int, dims: int) -> np.ndarray:
+    """Points start..start+count-1 of the Halton sequence as a (count, dims) array in [0, 1)."""
+    points = np.zeros((count, dims))
+    for d, base in enumerate(_primes(dims)):
+        index = np.arange(start, start + count, dtype=np.int64)
+        scale = 1.0
+        while index.any():
+            scale /= base
+            points[:, d] += (index % base) * scale
+            index //= base
+    return points
+
+def _sobol_directions(dims: int) -> np.ndarray:
+    if dims > len(SOBOL_POLYNOMIALS) + 1:
+        raise ValueError(f"Sobol sampling supports up to {len(SOBOL_POLYNOMIALS) + 1} steps; use halton.")
+    directions = np.zeros((dims, 32), dtype=np.uint32)
+    directions[0] = [1 << (31 - j) for j in range(32)]
+    for d, (degree, coefficients, initial) in enumerate(SOBOL_POLYNOMIALS[:dims - 1], 1):
+        v = [m << (31 - j) for j, m in enumerate(initial)]
+        for j in range(degree, 32):
+            value = v[j - degree] ^ (v[j - degree] >> degree)
+            for k in range(1, degree):
+                if (coefficients >> (degree - 1 - k)) & 1:
+                    value ^= v[j - k]
+            v.append(value)
+        directions[d] = v
+    return directions
+
+def sobol(start: int, count: int, dims: int) -> np.ndarray:
+    """Points start..start+count-1 of the Sobol sequence (Gray-code order) as (count, dims) 32-bit integers."""
+    directions = _sobol_directions(dims)
+    index = np.arange(start, start + count, dtype=np.uint64)
+    gray = index ^ (index >> np.uint64(1))
+    points = np.zeros((count, dims), dtype=np.uint32)
+    for j in range(32):
+        bit = ((gray >> np.uint64(j)) & np.uint64(1)).astype(bool)
+        points[bit] ^= directions[:, j]
+    return points
+
 class MonteCarloSimulator:
-    def __init__(self, num_simulations: int = 1000):
-        """Initialize Monte Carlo simulator."""
+    def __init__(self, num_simulations: int = 1000, seed: int = None, sampling: str = 'pseudo',
+                 tolerance: float = None, max_simulations: int = 2**20, confidence: float = 0.95):
+        """Initialize Monte Carlo simulator.
+
+        sampling draws plain pseudo-random normals, antithetic pairs (z, -z), or
+        randomized Halton/Sobol points. With a tolerance, num_simulations is the first
+        batch and the sample doubles until the confidence-level half-width on up_prob,
+        and on expected_move as a fraction of the volatility, is within it, or
+        max_simulations is reached.
+        """
+        if sampling not in SAMPLINGS:
+            raise ValueError(f"Invalid sampling: {sampling}. Use {', '.join(SAMPLINGS)}.")
         self.num_simulations = num_simulations
+        self.seed = seed
+        self.sampling = sampling
+        self.tolerance = tolerance
+        self.max_simulations = max_simulations
+        self.confidence = confidence
 
     def simulate(self, prediction: float, volatility: float, is_classifier: bool = True) -> dict:
         """Simulate price movements and calculate risk metrics."""
-        drift = (prediction - 0.5) * 2 if is_classifier else prediction
-        simulations = np.random.normal(loc=drift * volatility, 
-                                     scale=volatility, 
-                                     size=self.num_simulations)
-        
-        up_prob = float(np.mean(simulations > 0))
-        expected_move = float(np.mean(simulations))
-        pos_returns = simulations[simulations > 0]
-        neg_returns = simulations[simulations < 0]
-        risk_reward = float(np.abs(np.mean(pos_returns) / np.mean(neg_returns or [-0.001])))
-
-        return {
-            'up_prob': up_prob,
-            'expected_move': expected_move,
-            'risk_reward': risk_reward
-        }
\ No newline at end of file
+        results = self.simulate_batch([prediction], volatility, is_classifier)
+        metrics = ('up_prob', 'expected_move', 'risk_reward', 'up_prob_error', 'expected_move_error')
+        return {**{key: float(results[key][0]) for key in metrics}, 'samples': int(results['samples'][0])}
+
+    def simulate_batch(self, predictions, volatilities, is_classifier: bool = True, horizon: int = 1,
+                       quantiles: tuple = (0.05, 0.5, 0.95), var_level: float = 0.95,
+                       max_chunk_elements: int = 2**24) -> dict:
+        """Simulate multi-step return paths for many predictions in one vectorized call.
+
+        Each input gets float32 paths of horizon normal steps with drift (prediction - 0.5) * 2
+        (the prediction itself for regressors) times the volatility, scaled by the volatility.
+        Inputs are processed in chunks of at most max_chunk_elements simulated steps to cap
+        memory; with a tolerance, a chunk keeps sampling until all of its inputs converge or
+        that cap is reached.
+        Every metric is an array with one entry per input, including the samples drawn and
+        the achieved half-widths up_prob_error and expected_move_error; path_quantiles has
+        shape (n, horizon, len(quantiles)).
+        """
+        predictions = np.atleast_1d(np.asarray(predictions, dtype=np.float32))
+        volatilities = np.broadcast_to(np.asarray(volatilities, dtype=np.float32), predictions.shape)
+        drift = (predictions - 0.5) * 2 if is_classifier else predictions
+        n = len(predictions)
+        rng = np.random.default_rng(self.seed)
+        unit = QMC_REPLICATES if self.sampling in ('halton', 'sobol') else 2 if self.sampling == 'antithetic' else 1
+        first = -(-self.num_simulations // unit) * unit
+        # Adaptive chunks leave room for the sample to grow 16-fold before reaching the memory cap
+        chunk = max(1, max_chunk_elements // (first * horizon * (16 if self.tolerance is not None else 1)))
+
+        results = {
+            'up_prob': np.empty(n, dtype=np.float32),
+            'expected_move': np.empty(n, dtype=np.float32),
+            'risk_reward': np.empty(n, dtype=np.float32),
+            'var': np.empty(n, dtype=np.float32),
+            'cvar': np.empty(n, dtype=np.float32),
+            'path_quantiles': np.empty((n, horizon, len(quantiles)), dtype=np.float32),
+            'samples': np.empty(n, dtype=np.int64),
+            'up_prob_error': np.empty(n, dtype=np.float32),
+            'expected_move_error': np.empty(n, dtype=np.float32)
+        }
+        for start in range(0, n, chunk):
+            end = min(start + chunk, n)
+            scale = volatilities[start:end, None, None]
+            shifts = self._shifts(rng, end - start, horizon)
+            limit = min(self.max_simulations, max_chunk_elements // ((end - start) * horizon))
+            limit = max(first, limit // unit * unit)
+            batches, count, drawn = [], first, 0
+            while True:
+                batch = self._normals(rng, shifts, end - start, count, horizon, drawn // unit)
+                batch *= scale
+                batch += drift[start:end, None, None] * scale
+                np.cumsum(batch, axis=2, out=batch)
+                batches.append(batch)
+                drawn += count
+                terminals = [batch[:, :, -1] for batch in batches]
+                # A QMC replicate's up_prob moves in steps of 1/points, so replicates can agree
+                # exactly; the error is then floored at half a step instead of reading as zero
+                floor = 0.5 / (drawn // QMC_REPLICATES) if unit == QMC_REPLICATES else 0.0
+                up_error = np.maximum(self._half_width([terminal > 0 for terminal in terminals]), floor)
+                move_error = self._half_width(terminals)
+                if (self.tolerance is None or drawn >= limit
+                        or (np.all(up_error <= self.tolerance)
+                            and np.all(move_error <= self.tolerance * volatilities[start:end]))):
+                    break
+                # Doubling keeps Sobol blocks at powers of two and bounds the overshoot to 2x
+                count = max(unit, min(drawn, limit - drawn) // unit * unit)
+            paths = batches[0] if len(batches) == 1 else np.concatenate(batches, axis=1)
+            terminal = paths[:, :, -1]
+            results['samples'][start:end] = drawn
+            results['up_prob_error'][start:end] = up_error
+            results['expected_move_error'][start:end] = move_error
+
+            up = terminal > 0
+            down = terminal < 0
+            results['up_prob'][start:end] = up.mean(axis=1)
+            results['expected_move'][start:end] = terminal.mean(axis=1)
+            pos_mean = np.where(up, terminal, 0).sum(axis=1) / np.maximum(up.sum(axis=1), 1)
+            neg_sum = np.where(down, terminal, 0).sum(axis=1)
+            neg_mean = np.where(down.any(axis=1), neg_sum / np.maximum(down.sum(axis=1), 1), -0.001)
+            results['risk_reward'][start:end] = np.abs(pos_mean / neg_mean)
+
+            # Losses are reported as positive numbers at the (1 - var_level) tail
+            cutoff = np.quantile(terminal, 1 - var_level, axis=1)
+            tail = terminal <= cutoff[:, None]
+            results['var'][start:end] = -cutoff
+            results['cvar'][start:end] = -np.where(tail, terminal, 0).sum(axis=1) / tail.sum(axis=1)
+            results['path_quantiles'][start:end] = np.quantile(paths, quantiles, axis=1).transpose(1, 2, 0)
+        return results
+
+    def _shifts(self, rng: np.random.Generator, rows: int, horizon: int):
+        """Random shifts per input and QMC replicate: digital (XOR) for Sobol, modulo 1 for Halton."""
+        if self.sampling == 'sobol':
+            return rng.integers(0, 2**32, (rows, QMC_REPLICATES, 1, horizon), dtype=np.uint32)
+        if self.sampling == 'halton':
+            return rng.random((rows, QMC_REPLICATES, 1, horizon))
+        return None
+
+    def _normals(self, rng: np.random.Generator, shifts, rows: int, count: int, horizon: int,
+                 offset: int) -> np.ndarray:
+        """(rows, count, horizon) float32 standard normal steps.
+
+        Antithetic batches are laid out [z, -z]; QMC batches replicate by replicate, each
+        continuing its shifted sequence from point offset.
+        """
+        if self.sampling == 'pseudo':
+            return rng.standard_normal((rows, count, horizon), dtype=np.float32)
+        if self.sampling == 'antithetic':
+            half = rng.standard_normal((rows, count // 2, horizon), dtype=np.float32)
+            return np.concatenate([half, -half], axis=1)
+        per_replicate = count // QMC_REPLICATES
+        if self.sampling == 'sobol':
+            # The half-step offset keeps every shifted point strictly inside (0, 1)
+            uniform = ((sobol(offset, per_replicate, horizon) ^ shifts) + 0.5) / 2**32
+        else:
+            uniform = np.clip((halton(offset, per_replicate, horizon) + shifts) % 1.0, 1e-12, 1 - 1e-12)
+        return normal_ppf(uniform).astype(np.float32).reshape(rows, count, horizon)
+
+    def _half_width(self, batches: list) -> np.ndarray:
+        """Confidence half-width of each row's mean over batches of (rows, draws) values, from independent units.
+
+        Units are single draws, antithetic pairs, or the QMC replicates, whose means
+        pool every batch drawn so far.
+        """
+        batches = [np.asarray(batch, dtype=np.float64) for batch in batches]
+        if self.sampling in ('halton', 'sobol'):
+            rows = len(batches[0])
+            units = sum(batch.reshape(rows, QMC_REPLICATES, -1).sum(axis=2) for batch in batches)
+            units /= sum(batch.shape[1] for batch in batches) // QMC_REPLICATES
+        elif self.sampling == 'antithetic':
+            units = np.concatenate([(batch[:, :batch.shape[1] // 2] + batch[:, batch.shape[1] // 2:]) / 2
+                                    for batch in batches], axis=1)
+        else:
+            units = np.concatenate(batches, axis=1)
+        if units.shape[1] < 2:
+            return np.full(len(units), np.inf)
+        critical = t_quantile(0.5 + self.confidence / 2, units.shape[1] - 1)
+        return critical * units.std(axis=1, ddof=1) / np.sqrt(units.shape[1])
@@ -1,30 +1,45 @@
 # Signal Generation (Domain Layer)
 # Single Responsibility: Convert predictions to trade signals
 
+from config import SIGNAL_THRESHOLDS
+import numpy as np
+
+SELL, HOLD, BUY = -1, 0, 1
+SIGNAL_LABELS = {SELL: "SELL", HOLD: "HOLD", BUY: "BUY"}
+
 class SignalGenerator:
+    def __init__(self, thresholds: dict = None):
+        """Initialize with (sell below, buy above) thresholds per pipeline, overriding the configured ones."""
+        self.thresholds = {**SIGNAL_THRESHOLDS, **(thresholds or {})}
+
+    def generate(self, pipeline: str, predictions, prices) -> tuple:
+        """Return int8 signal codes (-1 sell, 0 hold, +1 buy) and entry prices for arrays of predictions.
+
+        Entry prices are the current prices where a trade is signalled and NaN on holds.
+        """
+        predictions = np.asarray(predictions)
+        prices = np.asarray(prices, dtype=np.float64)
+        low, high = self.thresholds[pipeline]
+        score = predictions / prices - 1 if pipeline == 'long' else predictions
+        codes = (score > high).astype(np.int8) - (score < low).astype(np.int8)
+        entry_prices = np.where(codes != HOLD, prices, np.nan)
+        return codes, entry_prices
+
     @staticmethod
-    def generate_short(prediction: float, price: float) -> str:
+    def format(codes, entry_prices) -> list:
+        """Render signal codes as display strings such as 'BUY @ 1.08523'."""
+        return [SIGNAL_LABELS[code] if code == HOLD else f"{SIGNAL_LABELS[code]} @ {price:.5f}"
+                for code, price in zip(np.atleast_1d(codes).tolist(), np.atleast_1d(entry_prices).tolist())]
+
+    def generate_short(self, prediction: float, price: float) -> str:
         """Generate trade signals for short timeframes."""
-        if prediction > 0.8:
-            return f"BUY @ {price:.5f}"
-        elif prediction < 0.2:
-            return f"SELL @ {price:.5f}"
-        return "HOLD"
+        return self.format(*self.generate('short', prediction, price))[0]
 
-    @staticmethod
-    def generate_medium(prediction: float, price: float) -> str:
+    def generate_medium(self, prediction: float, price: float) -> str:
         """Generate trade signals for medium timeframes."""
-        if prediction > 0.7:
-            return f"BUY @ {price:.5f}"
-        elif prediction < 0.3:
-            return f"SELL @ {price:.5f}"
-        return "HOLD"
+        return self.format(*self.generate('medium', prediction, price))[0]
 
-    @staticmethod
-    def generate_long(prediction: float, price: float, threshold: float = 0.02) -> str:
+    def generate_long(self, prediction: float, price: float, threshold: float = None) -> str:
         """Generate trade signals for long timeframes."""
-        if prediction > price * (1 + threshold):
-            return f"BUY @ {price:.5f}"
-        elif prediction < price * (1 - threshold):
-            return f"SELL @ {price:.5f}"
-        return "HOLD"
\ No newline at end of file
+        generator = self if threshold is None else SignalGenerator({'long': (-threshold, threshold)})
+        return generator.format(*generator.generate('long', prediction, price))[0]
@@ -0,0 +1,117 @@
+# Local Bar Store (Infrastructure Layer)
+# Single Responsibility: Persist downloaded price data by symbol, timeframe and day
+
+import pandas as pd
+import numpy as np
+from datetime import date, datetime, timedelta, timezone
+import json
+import os
+from infrastructure.utils import FLOAT_DTYPE
+
+class BarStore:
+    def __init__(self, root: str = "data/store"):
+        """Initialize a store rooted at a local directory."""
+        self.root = os.path.abspath(root)
+
+    def available_days(self, symbol: str, timeframe: str) -> set:
+        """Return the days already present for a symbol and timeframe."""
+        path = self._manifest_path(symbol, timeframe)
+        if not os.path.exists(path):
+            return set()
+        with open(path) as f:
+            return {date.fromisoformat(day) for day in json.load(f)['days']}
+
+    def missing_days(self, symbol: str, timeframe: str, start: date, end: date) -> list:
+        """Return the days in [start, end] that still have to be fetched."""
+        present = self.available_days(symbol, timeframe)
+        return [day for day in day_range(start, end) if day not in present]
+
+    def sync(self, symbol: str, timeframe: str, start: date, end: date, fetcher) -> None:
+        """Fetch only the missing days of [start, end] and persist them per day.
+
+        fetcher(symbol, timeframe, start, end) must return a DataFrame indexed by
+        timestamp; each contiguous run of missing days costs one fetch.
+        """
+        for run_start, run_end in _contiguous_runs(self.missing_days(symbol, timeframe, start, end)):
+            df = fetcher(symbol, timeframe, run_start, run_end)
+            days = list(day_range(run_start, run_end))
+            self.write_days(symbol, timeframe, days, df)
+            self.mark_complete(symbol, timeframe, days)
+
+    def write_days(self, symbol: str, timeframe: str, days: list, df: pd.DataFrame) -> None:
+        """Split a timestamp-indexed frame into one binary partition per day."""
+        if df.empty:
+            return
+        records = _to_records(df)
+        day_keys = records['Time'].astype('datetime64[D]')
+        for day in days:
+            day_records = records[day_keys == np.datetime64(day, 'D')]
+            if len(day_records):
+                path = self._day_path(symbol, timeframe, day)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Atomic replace so concurrent workers syncing the same day never see a torn file
+                tmp_path = f"{path[:-4]}.{os.getpid()}.tmp.npy"
+                np.save(tmp_path, day_records)
+                os.replace(tmp_path, path)
+
+    def read_range(self, symbol: str, timeframe: str, start: date, end: date) -> pd.DataFrame:
+        """Read [start, end] straight from the memory-mapped day partitions."""
+        parts = []
+        for day in day_range(start, end):
+            path = self._day_path(symbol, timeframe, day)
+            if os.path.exists(path):
+                parts.append(np.load(path, mmap_mode='r'))
+        if not parts:
+            return pd.DataFrame()
+        # Concatenate field by field: one float32 copy per column, no interleaved record copy
+        columns = [name for name in parts[0].dtype.names if name != 'Time']
+        index = pd.DatetimeIndex(np.concatenate([part['Time'] for part in parts]), name='Time')
+        return pd.DataFrame({col: np.concatenate([part[col] for part in parts]).astype(FLOAT_DTYPE, copy=False)
+                             for col in columns}, index=index)
+
+    def mark_complete(self, symbol: str, timeframe: str, days: list) -> None:
+        """Record days as present so later syncs skip them."""
+        # Today's (or future) partitions are still growing, so never mark them complete
+        today = datetime.now(timezone.utc).date()
+        present = self.available_days(symbol, timeframe) | {day for day in days if day < today}
+        path = self._manifest_path(symbol, timeframe)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({'days': sorted(day.isoformat() for day in present)}, f)
+        os.replace(tmp_path, path)
+
+    def _partition_dir(self, symbol: str, timeframe: str) -> str:
+        return os.path.join(self.root, symbol.lower(), timeframe.lower())
+
+    def _manifest_path(self, symbol: str, timeframe: str) -> str:
+        return os.path.join(self._partition_dir(symbol, timeframe), "manifest.json")
+
+    def _day_path(self, symbol: str, timeframe: str, day: date) -> str:
+        return os.path.join(self._partition_dir(symbol, timeframe), f"{day.year}", f"{day:%Y%m%d}.npy")
+
+def _to_records(df: pd.DataFrame) -> np.ndarray:
+    """Convert a timestamp-indexed frame into a structured array."""
+    dtype = [('Time', 'datetime64[ns]')] + [(col, FLOAT_DTYPE) for col in df.columns]
+    records = np.empty(len(df), dtype=dtype)
+    records['Time'] = df.index.values.astype('datetime64[ns]')
+    for col in df.columns:
+        records[col] = df[col].to_numpy()
+    return records
+
+def day_range(start: date, end: date):
+    """Yield every calendar day in [start, end]."""
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+def _contiguous_runs(days: list) -> list:
+    """Group sorted days into (first, last) runs of consecutive days."""
+    runs = []
+    for day in days:
+        if runs and day == runs[-1][1] + timedelta(days=1):
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return [tuple(run) for run in runs]
@@ -0,0 +1,310 @@
+# Dukascopy Fetcher (Infrastructure Layer)
+# Single Responsibility: Download and decode Dukascopy hourly tick archives without the duka package
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from urllib.parse import urlsplit
+from config import DUKASCOPY_URL
+from infrastructure.data_loaders.bar_store import day_range
+from infrastructure.instrumentation import Instrumentation
+from infrastructure.utils import FLOAT_DTYPE
+import asyncio
+import lzma
+import os
+import random
+import time
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent syncs of one symbol are not coordinated there
+    fcntl = None
+
+# One tick of a .bi5 archive: ms into the hour, ask and bid in points, ask and bid volume (millions)
+TICK_RECORD = np.dtype([('ms', '>u4'), ('ask', '>u4'), ('bid', '>u4'), ('ask_volume', '>f4'), ('bid_volume', '>f4')])
+# Read size when streaming a response body to disk
+CHUNK_BYTES = 64 * 1024
+# Statuses worth retrying: throttling and server-side failures
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def price_point(symbol: str) -> float:
+    """Integer price units per unit of quote currency: 3 decimals for JPY crosses and metals, else 5."""
+    symbol = symbol.upper()
+    return 1e3 if symbol.endswith('JPY') or symbol.startswith(('XAU', 'XAG')) else 1e5
+
+def archive_path(symbol: str, hour: datetime) -> str:
+    """Relative URL/cache path of an hour's archive; Dukascopy months are zero-based."""
+    return f"{symbol.upper()}/{hour.year}/{hour.month - 1:02d}/{hour.day:02d}/{hour.hour:02d}h_ticks.bi5"
+
+def decode_hours(paths: list, hour_ms: list, point: float) -> tuple:
+    """Decompress and decode hourly archives into (epoch ms, bid, ask, volume) arrays.
+
+    Runs in a decode worker process; empty archives are hours without ticks.
+    Volume is the sum of the ask and bid side volumes.
+    """
+    parts = []
+    for path, start in zip(paths, hour_ms):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data:
+            try:
+                parts.append((start, np.frombuffer(lzma.decompress(data), dtype=TICK_RECORD)))
+            except lzma.LZMAError as e:
+                os.remove(path)  # never reuse a corrupt archive; the next sync downloads it again
+                raise ValueError(f"Corrupt tick archive {path}: {e}") from e
+    if not parts:
+        return (np.empty(0, dtype=np.int64),) + tuple(np.empty(0, dtype=FLOAT_DTYPE) for _ in range(3))
+    times = np.concatenate([start + records['ms'].astype(np.int64) for start, records in parts])
+    records = np.concatenate([records for _, records in parts])
+    bid = (records['bid'] / point).astype(FLOAT_DTYPE)
+    ask = (records['ask'] / point).astype(FLOAT_DTYPE)
+    volume = (records['ask_volume'].astype(FLOAT_DTYPE) + records['bid_volume'].astype(FLOAT_DTYPE))
+    return times, bid, ask, volume
+
+class RetryableError(Exception):
+    """A response that should be retried after backing off."""
+
+class HttpPool:
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        """Initialize a keep-alive HTTP/1.1 connection pool for one host."""
+        url = urlsplit(base_url)
+        if url.scheme not in ('http', 'https'):
+            raise ValueError(f"Invalid base URL: {base_url}. Use http:// or https://.")
+        self.ssl = url.scheme == 'https' or None
+        self.host = url.hostname
+        self.port = url.port or (443 if self.ssl else 80)
+        self.prefix = url.path.rstrip('/')
+        self.timeout = timeout
+        self.idle = []
+        self.opened = 0
+        self.received = 0
+
+    async def get(self, path: str, sink, offset: int = 0) -> int:
+        """GET prefix/path, streaming a 200/206 body into the binary file sink; returns the status.
+
+        With offset, only the bytes from offset on are requested; a server that ignores
+        the range answers 200 and the sink is rewritten from the start.
+        """
+        request = (f"GET {self.prefix}/{path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                   f"Accept-Encoding: identity\r\nConnection: keep-alive\r\n")
+        if offset:
+            request += f"Range: bytes={offset}-\r\n"
+        while True:
+            reused = bool(self.idle)
+            reader, writer = self.idle.pop() if reused else await self._connect()
+            try:
+                writer.write(f"{request}\r\n".encode('latin-1'))
+                await writer.drain()
+                status_line = await self._read(reader.readline())
+                if not status_line:
+                    raise ConnectionError("Connection closed before the response")
+                break
+            except BaseException as e:
+                writer.close()  # a timeout or cancellation mid-request must not leak the socket
+                if not (reused and isinstance(e, ConnectionError)):
+                    raise
+                # The server dropped the idle connection; that is no failure, so go again on another one
+        keep_alive = False
+        try:
+            version, status = status_line.split()[0].decode(), int(status_line.split()[1])
+            fields = {}
+            while (line := await self._read(reader.readline())) not in (b'\r\n', b'\n', b''):
+                name, _, value = line.decode('latin-1').partition(':')
+                fields[name.strip().lower()] = value.strip().lower()
+            if status == 200 and offset:
+                sink.seek(0)
+                sink.truncate()
+            write = self._sink_writer(sink) if status in (200, 206) else (lambda chunk: None)
+            if fields.get('transfer-encoding') == 'chunked':
+                while (size := int((await self._read(reader.readline())).split(b';')[0], 16)) > 0:
+                    await self._copy(reader, size, write)
+                    await self._read(reader.readexactly(2))
+                while (await self._read(reader.readline())) not in (b'\r\n', b'\n', b''):
+                    pass  # trailers
+            elif 'content-length' in fields:
+                await self._copy(reader, int(fields['content-length']), write)
+            else:
+                while chunk := await self._read(reader.read(CHUNK_BYTES)):
+                    write(chunk)
+                return status
+            connection = fields.get('connection', '')
+            keep_alive = connection == 'keep-alive' or (version == 'HTTP/1.1' and connection != 'close')
+            return status
+        finally:
+            if keep_alive:
+                self.idle.append((reader, writer))
+            else:
+                writer.close()
+
+    def _sink_writer(self, sink):
+        def write(chunk: bytes) -> None:
+            sink.write(chunk)
+            self.received += len(chunk)
+        return write
+
+    async def _connect(self) -> tuple:
+        self.opened += 1
+        return await asyncio.wait_for(asyncio.open_connection(self.host, self.port, ssl=self.ssl), self.timeout)
+
+    async def _read(self, awaitable):
+        return await asyncio.wait_for(awaitable, self.timeout)
+
+    async def _copy(self, reader: asyncio.StreamReader, size: int, write) -> None:
+        while size > 0:
+            chunk = await self._read(reader.read(min(size, CHUNK_BYTES)))
+            if not chunk:
+                raise ConnectionError("Connection closed mid-body")
+            write(chunk)
+            size -= len(chunk)
+
+    def close(self) -> None:
+        for _, writer in self.idle:
+            writer.close()
+        self.idle.clear()
+
+class AdaptiveLimit:
+    def __init__(self, initial: int, maximum: int):
+        """Initialize an additive-increase, multiplicative-decrease cap on concurrent downloads.
+
+        Every limit successes in a row raise the cap by one; a failure halves it.
+        """
+        self.limit = max(1, min(initial, maximum))
+        self.maximum = maximum
+        self.active = 0
+        self.successes = 0
+        self.peak = self.limit
+        self.changed = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self.changed:
+            await self.changed.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def __aexit__(self, *exc):
+        async with self.changed:
+            self.active -= 1
+            self.changed.notify_all()
+
+    def success(self) -> None:
+        self.successes += 1
+        if self.successes >= self.limit and self.limit < self.maximum:
+            self.limit += 1
+            self.peak = max(self.peak, self.limit)
+            self.successes = 0
+
+    def failure(self) -> None:
+        self.limit = max(1, self.limit // 2)
+        self.successes = 0
+
+class DukascopyFetcher:
+    def __init__(self, cache_dir: str, base_url: str = DUKASCOPY_URL, connections: int = 8,
+                 max_connections: int = 32, retries: int = 5, backoff: float = 0.5, timeout: float = 30.0,
+                 decode_workers: int = None, instrumentation: Instrumentation = None):
+        """Initialize fetcher that downloads hourly tick archives from base_url into cache_dir.
+
+        Downloads start at connections concurrent requests and adapt up to max_connections.
+        Finished hours are kept under cache_dir and interrupted ones resume from their
+        partial file, so a rerun only transfers what is missing. Processes syncing the
+        same symbol take turns, so a partial file is only written by one of them. Days are
+        decoded in a process pool while later days are still downloading.
+        """
+        self.cache_dir = cache_dir
+        self.base_url = base_url
+        self.connections = connections
+        self.max_connections = max_connections
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.decode_workers = decode_workers
+        self.instrumentation = instrumentation or Instrumentation()
+        self.stats = {}
+
+    def __call__(self, symbol: str, timeframe: str, start: date, end: date) -> pd.DataFrame:
+        """Download [start, end] and return the raw tick frame (Bid, Ask, Volume indexed by Time)."""
+        if timeframe.upper() != 'TICK':
+            raise ValueError(f"Invalid timeframe for the Dukascopy fetcher: {timeframe}. Only TICK archives exist.")
+        self.stats = {'hours': 0, 'cached': 0, 'bytes': 0, 'retries': 0}
+        started = time.perf_counter()
+        with self.instrumentation.span('price.download') as span:
+            times, bid, ask, volume = asyncio.run(self._fetch(symbol, list(day_range(start, end))))
+            self.stats.update(seconds=time.perf_counter() - started, rows=len(times))
+            span.record(**self.stats)
+        index = pd.DatetimeIndex(pd.to_datetime(times, unit='ms'), name='Time')
+        return pd.DataFrame({'Bid': bid, 'Ask': ask, 'Volume': volume}, index=index)
+
+    async def _fetch(self, symbol: str, days: list) -> tuple:
+        lock_path = os.path.join(self.cache_dir, symbol.upper(), ".lock")
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+        with open(lock_path, 'a') as lock:
+            if fcntl is not None:
+                # Processes syncing the same symbol (e.g. one batch job per timeframe) would append to the
+                # same partial archives, so the first one downloads and decodes and the rest find them cached
+                await asyncio.get_running_loop().run_in_executor(None, fcntl.flock, lock.fileno(), fcntl.LOCK_EX)
+            return await self._fetch_locked(symbol, days)
+
+    async def _fetch_locked(self, symbol: str, days: list) -> tuple:
+        pool = HttpPool(self.base_url, self.timeout)
+        limit = AdaptiveLimit(self.connections, self.max_connections)
+        decoder = ProcessPoolExecutor(max_workers=self.decode_workers) if len(days) > 1 else None
+        try:
+            point = price_point(symbol)
+            parts = await asyncio.gather(*(self._fetch_day(pool, limit, decoder, symbol, day, point)
+                                           for day in days))
+        finally:
+            pool.close()
+            if decoder is not None:
+                decoder.shutdown()
+        self.stats.update(bytes=pool.received, connections=pool.opened, peak_concurrency=limit.peak)
+        return tuple(np.concatenate(column) for column in zip(*parts))
+
+    async def _fetch_day(self, pool: HttpPool, limit: AdaptiveLimit, decoder, symbol: str, day: date,
+                         point: float) -> tuple:
+        """Download a day's 24 archives, then decode them off the event loop."""
+        hours = [datetime(day.year, day.month, day.day, hour) for hour in range(24)]
+        paths = await asyncio.gather(*(self._fetch_hour(pool, limit, symbol, hour) for hour in hours))
+        hour_ms = [int(hour.replace(tzinfo=timezone.utc).timestamp() * 1000) for hour in hours]
+        return await asyncio.get_running_loop().run_in_executor(decoder, decode_hours, paths, hour_ms, point)
+
+    async def _fetch_hour(self, pool: HttpPool, limit: AdaptiveLimit, symbol: str, hour: datetime) -> str:
+        """Return the local path of an hour's archive, downloading or resuming it when needed."""
+        relative = archive_path(symbol, hour)
+        path = os.path.join(self.cache_dir, relative)
+        self.stats['hours'] += 1
+        if os.path.exists(path):
+            self.stats['cached'] += 1
+            return path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        part_path = f"{path}.part"
+        # The current hour is still growing on the server, so it is fetched whole and never cached
+        final = hour + timedelta(hours=1) <= datetime.now(timezone.utc).replace(tzinfo=None)
+        if not final and os.path.exists(part_path):
+            os.remove(part_path)
+        for attempt in range(self.retries + 1):
+            async with limit:
+                try:
+                    with open(part_path, 'ab') as sink:
+                        offset = sink.tell()
+                        status = await pool.get(relative, sink, offset)
+                        if status == 416 and offset:
+                            # The partial file is no shorter than the server's copy, so fetch it whole
+                            sink.truncate(0)
+                            status = await pool.get(relative, sink)
+                    if status in RETRY_STATUSES:
+                        raise RetryableError(f"HTTP {status}")
+                    if status == 404:
+                        open(part_path, 'wb').close()  # no archive: an hour without ticks
+                    elif status not in (200, 206):
+                        raise ValueError(f"HTTP {status} for {self.base_url}/{relative}")
+                    limit.success()
+                    break
+                except (OSError, EOFError, asyncio.TimeoutError, RetryableError) as e:
+                    limit.failure()
+                    if attempt == self.retries:
+                        raise ConnectionError(f"Download of {relative} failed after {attempt + 1} attempts: {e}")
+                    self.stats['retries'] += 1
+            await asyncio.sleep(self.backoff * 2 ** attempt * (1 + random.random()))
+        if not final:
+            return part_path
+        os.replace(part_path, path)
+        return path
@@ -0,0 +1,99 @@
+# Macro Data Loader (Infrastructure Layer)
+# Single Responsibility: Fetch macro-economic data
+
+import pandas as pd
+import numpy as np
+from datetime import datetime, date, timedelta
+from config import MACRO_SERIES
+from infrastructure.data_loaders.macro_store import MacroStore
+import os
+
+# History fetched before the start date so the first bars already have a published value
+LOOKBACK_DAYS = 400
+
+class FredFetcher:
+    def __call__(self, series: str, start: date, end: date) -> pd.Series:
+        """Download one series from FRED."""
+        import pandas_datareader as pdr  # deferred so the dependency is only needed on a cache miss
+        df = pdr.get_data_fred([series], start=start, end=end)
+        return df[series].set_axis(pd.to_datetime(df.index))
+
+class MacroFixtureFetcher:
+    def __init__(self, directory: str):
+        """Initialize fetcher that reads FRED CSV downloads (<SERIES>.csv) from a directory."""
+        self.directory = directory
+
+    def __call__(self, series: str, start: date, end: date) -> pd.Series:
+        """Return the fixture's observations in [start, end]."""
+        df = pd.read_csv(os.path.join(self.directory, f"{series}.csv"), index_col=0, parse_dates=True,
+                         na_values=".")
+        values = df.iloc[:, 0].astype(float)
+        return values[(values.index >= pd.Timestamp(start)) & (values.index <= pd.Timestamp(end))]
+
+def asof_join(bars: pd.DataFrame, values: pd.Series, release_lag_days: int) -> np.ndarray:
+    """Return, for every bar, the latest value already published at the bar's timestamp.
+
+    An observation becomes visible release_lag_days after its date; bars before the
+    first release get NaN. One searchsorted over the sorted release times, so it is
+    O(bars * log(observations)).
+    """
+    released = values.index.values.astype('datetime64[ns]') + np.timedelta64(release_lag_days, 'D')
+    order = np.argsort(released, kind='stable')
+    positions = np.searchsorted(released[order], bars.index.values.astype('datetime64[ns]'), side='right') - 1
+    joined = values.to_numpy(dtype=float)[order][np.maximum(positions, 0)] if len(values) else np.zeros(len(bars))
+    return np.where(positions >= 0, joined, np.nan)
+
+class MacroLoader:
+    def __init__(self, start_date: str, end_date: str, series: dict = None,
+                 store: MacroStore = None, fetcher=None):
+        """Initialize macro data loader.
+
+        series maps FRED ids to (column name, release lag in days) and defaults to
+        config.MACRO_SERIES; fetcher defaults to FRED (MacroFixtureFetcher works offline).
+        """
+        self.start_date = datetime.strptime(start_date, "%Y-%m-%d")
+        self.end_date = datetime.strptime(end_date, "%Y-%m-%d")
+        self.series = MACRO_SERIES if series is None else series
+        self.store = store or MacroStore()
+        self.fetcher = fetcher or FredFetcher()
+
+    def sync(self) -> dict:
+        """Bring every configured series up to date in the store; returns the ones that failed."""
+        start = self.start_date.date() - timedelta(days=LOOKBACK_DAYS)
+        failed = {}
+        for series, (_, lag) in self.series.items():
+            try:
+                self.store.sync(series, start, self.end_date.date(), self.fetcher, lag)
+            except Exception as e:
+                failed[series] = f"{type(e).__name__}: {e}"
+        return failed
+
+    def load_data(self) -> pd.DataFrame:
+        """Load macro-economic observations, one named column per series."""
+        for series, error in self.sync().items():
+            print(f"Error loading macro series {series}: {error}")
+        columns = {column: self.store.read(series) for series, (column, _) in self.series.items()}
+        columns = {column: values for column, values in columns.items() if len(values)}
+        if not columns:
+            return pd.DataFrame()
+        df = pd.DataFrame(columns)
+        return df[(df.index >= self.start_date) & (df.index <= self.end_date)]
+
+    def load_series(self) -> dict:
+        """Sync and read every stored series as {column: (observations, release lag in days)}."""
+        for series, error in self.sync().items():
+            print(f"Error loading macro series {series}: {error}")
+        loaded = {}
+        for series, (column, lag) in self.series.items():
+            values = self.store.read(series)
+            if len(values):
+                loaded[column] = (values, lag)
+        return loaded
+
+    def join(self, bars: pd.DataFrame, series: dict = None) -> pd.DataFrame:
+        """Add each series to the bars as of its release, keeping every bar; series defaults to load_series()."""
+        series = self.load_series() if series is None else series
+        if not series:
+            return bars
+        joined = {column: asof_join(bars, values, lag) for column, (values, lag) in series.items()}
+        return pd.concat([bars, pd.DataFrame(joined, index=bars.index)], axis=1)
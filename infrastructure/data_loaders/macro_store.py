@@ -0,0 +1,80 @@
+# Local Macro Store (Infrastructure Layer)
+# Single Responsibility: Persist macro-economic series and refresh them incrementally
+
+import pandas as pd
+import numpy as np
+from datetime import date, datetime, timedelta, timezone
+import json
+import os
+
+class MacroStore:
+    def __init__(self, root: str = "data/macro"):
+        """Initialize a store rooted at a local directory, one binary file per series."""
+        self.root = os.path.abspath(root)
+
+    def coverage(self, series: str) -> tuple:
+        """Return the (start, end) observation dates already synced, or None."""
+        path = self._meta_path(series)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            meta = json.load(f)
+        return date.fromisoformat(meta['start']), date.fromisoformat(meta['end'])
+
+    def sync(self, series: str, start: date, end: date, fetcher, release_lag_days: int = 0) -> None:
+        """Fetch only the parts of [start, end] not yet covered and merge them into the series.
+
+        fetcher(series, start, end) must return a Series of values indexed by observation
+        date. Observations dated within release_lag_days of today may not be published
+        yet, so that tail is never marked covered and is fetched again on the next sync.
+        """
+        covered = self.coverage(series)
+        if covered is None:
+            ranges = [(start, end)]
+        else:
+            ranges = [(start, min(end, covered[0] - timedelta(days=1))),
+                      (max(start, covered[1] + timedelta(days=1)), end)]
+        ranges = [(first, last) for first, last in ranges if first <= last]
+        if not ranges:
+            return
+        parts = [self.read(series)] + [fetcher(series, first, last) for first, last in ranges]
+        parts = [part for part in parts if len(part)]
+        self.write(series, pd.concat(parts) if parts else pd.Series(dtype=float))
+        published = datetime.now(timezone.utc).date() - timedelta(days=release_lag_days + 1)
+        new_start = min([start] + ([covered[0]] if covered else []))
+        new_end = min(max([end] + ([covered[1]] if covered else [])), published)
+        self._write_meta(series, new_start, max(new_end, new_start))
+
+    def read(self, series: str) -> pd.Series:
+        """Return every stored observation as a float Series indexed by date."""
+        path = self._data_path(series)
+        if not os.path.exists(path):
+            return pd.Series(dtype=float, name=series)
+        records = np.load(path)
+        return pd.Series(records['Value'], index=pd.DatetimeIndex(records['Date'], name='Date'), name=series)
+
+    def write(self, series: str, values: pd.Series) -> None:
+        """Replace the stored series; later values win for duplicate dates and gaps are dropped."""
+        values = values.dropna()
+        values = values[~values.index.duplicated(keep='last')].sort_index()
+        records = np.empty(len(values), dtype=[('Date', 'datetime64[ns]'), ('Value', 'f8')])
+        records['Date'] = values.index.values.astype('datetime64[ns]')
+        records['Value'] = values.to_numpy(dtype='f8')
+        path = self._data_path(series)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path[:-4]}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, records)
+        os.replace(tmp_path, path)
+
+    def _write_meta(self, series: str, start: date, end: date) -> None:
+        path = self._meta_path(series)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({'start': start.isoformat(), 'end': end.isoformat()}, f)
+        os.replace(tmp_path, path)
+
+    def _data_path(self, series: str) -> str:
+        return os.path.join(self.root, f"{series.lower()}.npy")
+
+    def _meta_path(self, series: str) -> str:
+        return os.path.join(self.root, f"{series.lower()}.json")
@@ -0,0 +1,79 @@
+# Panel Data Loader (Infrastructure Layer)
+# Single Responsibility: Align the bars of several pairs on one time index as a single float32 array
+
+import pandas as pd
+import numpy as np
+import functools
+from infrastructure.data_loaders.duka_loader import DukaLoader
+from infrastructure.instrumentation import Instrumentation
+from infrastructure.utils import FLOAT_DTYPE, column_matrix
+
+PANEL_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+class Panel:
+    def __init__(self, index: pd.DatetimeIndex, pairs: list, values: np.ndarray, present: np.ndarray):
+        """Initialize a (time x pair x field) panel of bars; present marks the bars each pair really had."""
+        self.index = index
+        self.pairs = list(pairs)
+        self.fields = PANEL_FIELDS
+        self.values = values
+        self.present = present
+
+    def field(self, name: str) -> np.ndarray:
+        """(time, pair) view of one field across every pair."""
+        return self.values[:, :, self.fields.index(name)]
+
+    def pair(self, pair: str) -> np.ndarray:
+        """(time, field) view of one pair's bars."""
+        return self.values[:, self.pairs.index(pair), :]
+
+def align(frames: dict) -> Panel:
+    """Align per-pair OHLCV frames on the union of their timestamps.
+
+    Where a pair has no bar at a timestamp another pair has, a flat zero-volume bar
+    at its last close is filled in; before a pair's first bar its fields stay NaN.
+    """
+    pairs = list(frames)
+    # Bar indexes are sorted, so pandas merges them in linear time instead of sorting the concatenation
+    index = functools.reduce(pd.Index.union, (frame.index for frame in frames.values()))
+    values = np.full((len(index), len(pairs), len(PANEL_FIELDS)), np.nan, dtype=FLOAT_DTYPE)
+    present = np.zeros((len(index), len(pairs)), dtype=bool)
+    for p, frame in enumerate(frames.values()):
+        rows = index.searchsorted(frame.index.values)
+        values[rows, p, :] = column_matrix(frame, PANEL_FIELDS)
+        present[rows, p] = True
+    # Row of each pair's latest real bar at or before every timestamp (-1 before its first bar)
+    last = np.maximum.accumulate(np.where(present, np.arange(len(index))[:, None], -1), axis=0)
+    filled = ~present & (last >= 0)
+    rows, cols = np.nonzero(filled)
+    close = values[last[rows, cols], cols, PANEL_FIELDS.index('Close')]
+    for field in ('Open', 'High', 'Low', 'Close'):
+        values[rows, cols, PANEL_FIELDS.index(field)] = close
+    values[rows, cols, PANEL_FIELDS.index('Volume')] = 0
+    return Panel(index, pairs, values, present)
+
+class PanelLoader:
+    def __init__(self, pairs: list, start_date: str, end_date: str, timeframe: str,
+                 store=None, fetcher=None, instrumentation: Instrumentation = None):
+        """Initialize loader of one timeframe's bars for several pairs."""
+        self.pairs = list(pairs)
+        self.timeframe = timeframe
+        self.instrumentation = instrumentation or Instrumentation()
+        self.loaders = {pair: DukaLoader(pair, start_date, end_date, timeframe, store, fetcher, self.instrumentation)
+                        for pair in self.pairs}
+
+    def load_data(self) -> Panel:
+        """Load every pair from the bar store and align them; pairs without data are left out."""
+        frames = {}
+        for pair, loader in self.loaders.items():
+            df = loader.load_data()
+            if df.empty:
+                print(f"Warning: No data loaded for {pair} on {self.timeframe}; leaving it out of the panel.")
+            else:
+                frames[pair] = df
+        if not frames:
+            raise ValueError(f"No data loaded for any of {', '.join(self.pairs)} on {self.timeframe}")
+        with self.instrumentation.span('panel.align', pairs=len(frames)) as span:
+            panel = align(frames)
+            span.record(rows=len(panel.index), nbytes=panel.values.nbytes)
+        return panel
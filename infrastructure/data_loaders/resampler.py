@@ -0,0 +1,86 @@
+# Multi-Timeframe Resampler (Infrastructure Layer)
+# Single Responsibility: Derive OHLCV bars for every timeframe from the finest data
+
+import pandas as pd
+import numpy as np
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+# Bucket widths in minutes; W1 buckets are anchored on Monday 00:00 UTC
+TIMEFRAME_MINUTES = {'M1': 1, 'M5': 5, 'M15': 15, 'M30': 30, 'H1': 60, 'D1': 1440, 'W1': 10080}
+# 1970-01-01 was a Thursday, so shift by three days to start weeks on Monday
+_WEEK_OFFSET = np.timedelta64(3, 'D').astype('timedelta64[ns]').astype(np.int64)
+
+def ticks_to_ohlcv(ticks: pd.DataFrame) -> pd.DataFrame:
+    """Turn raw Bid/Ask/Volume ticks into degenerate one-tick bars priced on the Bid."""
+    bid = ticks['Bid'].to_numpy()
+    return pd.DataFrame({'Open': bid, 'High': bid, 'Low': bid, 'Close': bid,
+                         'Volume': ticks['Volume'].to_numpy()}, index=ticks.index)
+
+def bucket_starts(times: np.ndarray, timeframe: str) -> np.ndarray:
+    """Return the bucket start (int64 ns) of each timestamp for a timeframe."""
+    width = np.int64(TIMEFRAME_MINUTES[timeframe]) * 60 * 10**9
+    ns = times.astype('datetime64[ns]').astype(np.int64)
+    offset = _WEEK_OFFSET if timeframe == 'W1' else 0
+    return (ns + offset) // width * width - offset
+
+def resample(bars: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Aggregate time-sorted OHLCV bars into a coarser timeframe with segment reductions."""
+    if bars.empty:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    buckets = bucket_starts(bars.index.values, timeframe)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+    high = bars['High'].to_numpy()
+    low = bars['Low'].to_numpy()
+    volume = bars['Volume'].to_numpy()
+    return pd.DataFrame({
+        'Open': bars['Open'].to_numpy()[starts],
+        'High': np.maximum.reduceat(high, starts),
+        'Low': np.minimum.reduceat(low, starts),
+        'Close': bars['Close'].to_numpy()[ends],
+        # Sum volume in float64 so long buckets keep full precision, then store it as float32
+        'Volume': np.add.reduceat(volume, starts, dtype=np.float64).astype(volume.dtype)
+    }, index=pd.DatetimeIndex(buckets[starts].astype('datetime64[ns]'), name='Time'))
+
+def resample_all(bars: pd.DataFrame, timeframes: list) -> dict:
+    """Derive every requested timeframe from one base frame.
+
+    Timeframes are built finest-first, each one from the previous result, so only
+    the first reduction touches the full-resolution data.
+    """
+    results = {}
+    source = bars
+    for timeframe in sorted(timeframes, key=TIMEFRAME_MINUTES.get):
+        source = resample(source, timeframe)
+        results[timeframe] = source
+    return results
+
+class BarAggregator:
+    def __init__(self, timeframe: str):
+        """Initialize an incremental builder of one timeframe's bars from time-ordered events."""
+        self.timeframe = timeframe
+        self.width = TIMEFRAME_MINUTES[timeframe] * 60 * 10**9
+        self.offset = int(_WEEK_OFFSET) if timeframe == 'W1' else 0
+        self.bar = None
+
+    def update(self, time_ns: int, open_: float, high: float, low: float, close: float, volume: float) -> dict:
+        """Fold one tick (open = high = low = close) or finer bar into the current bar.
+
+        Returns the previous bar once an event opens a new bucket, else None; a bar
+        therefore closes on the first event of the next bucket.
+        """
+        start = (time_ns + self.offset) // self.width * self.width - self.offset
+        bar = self.bar
+        if bar is not None and bar['start'] == start:
+            bar['High'] = max(bar['High'], high)
+            bar['Low'] = min(bar['Low'], low)
+            bar['Close'] = close
+            bar['Volume'] += volume
+            return None
+        self.bar = {'start': start, 'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}
+        return bar
+
+    def flush(self) -> dict:
+        """Close and return the bar in progress, e.g. when the stream ends."""
+        bar, self.bar = self.bar, None
+        return bar
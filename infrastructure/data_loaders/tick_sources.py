@@ -0,0 +1,94 @@
+# Live Tick Sources (Infrastructure Layer)
+# Single Responsibility: Deliver live tick or bar events from a feed, a replayed file or a socket
+
+from abc import ABC, abstractmethod
+import asyncio
+import time
+
+def parse_event(line) -> tuple:
+    """Parse 'time_ms,bid,ask,volume' (tick) or 'time_ms,open,high,low,close,volume' (bar).
+
+    Returns (time_ns, bid, ask, volume) or (time_ns, open, high, low, close, volume),
+    the same column layout as the raw Dukascopy CSV files.
+    """
+    fields = (line.decode() if isinstance(line, bytes) else line).strip().split(",")
+    return (int(float(fields[0])) * 1_000_000, *map(float, fields[1:]))
+
+class TickSource(ABC):
+    """Interface for live feeds: stream() is an async iterator of parsed tick or bar events."""
+
+    @abstractmethod
+    def stream(self):
+        """Yield parsed tick or bar events as they arrive."""
+
+class ReplaySource(TickSource):
+    def __init__(self, path: str, speed: float = 0.0):
+        """Initialize a replay of a raw tick CSV; speed 1.0 keeps the recorded pacing, 0 replays unpaced."""
+        self.path = path
+        self.speed = speed
+
+    async def stream(self):
+        """Yield the file's events, sleeping between them to reproduce the recorded gaps."""
+        pacer = _Pacer(self.speed)
+        with open(self.path) as f:
+            for line in f:
+                if line.strip():
+                    event = parse_event(line)
+                    await pacer.wait(event[0])
+                    yield event
+
+class SocketSource(TickSource):
+    def __init__(self, host: str = "127.0.0.1", port: int = 9000):
+        """Initialize a TCP client reading one CSV event per line."""
+        self.host = host
+        self.port = port
+
+    async def stream(self):
+        """Yield events until the server closes the connection."""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    yield parse_event(line)
+        finally:
+            writer.close()
+
+async def serve_replay(path: str, host: str = "127.0.0.1", port: int = 9000, speed: float = 1.0) -> None:
+    """Stream a raw tick CSV to every client that connects, as a local stand-in for a live feed."""
+    async def replay(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        pacer = _Pacer(speed)
+        with open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    await pacer.wait(parse_event(line)[0])
+                    writer.write(line)
+                    await writer.drain()  # TCP backpressure: a slow client slows the replay
+        writer.close()
+
+    server = await asyncio.start_server(replay, host, port)
+    print(f"Replaying {path} on {host}:{port} at {speed}x")
+    async with server:
+        await server.serve_forever()
+
+class _Pacer:
+    # Unpaced replays still yield to the event loop every this many events
+    YIELD_EVERY = 1000
+
+    def __init__(self, speed: float):
+        self.speed = speed
+        self.first_event_ns = None
+        self.started = None
+        self.count = 0
+
+    async def wait(self, event_ns: int) -> None:
+        """Sleep until the event is due relative to the first one."""
+        self.count += 1
+        if self.speed <= 0:
+            if self.count % self.YIELD_EVERY == 0:
+                await asyncio.sleep(0)
+            return
+        if self.first_event_ns is None:
+            self.first_event_ns, self.started = event_ns, time.perf_counter()
+        delay = (event_ns - self.first_event_ns) / 1e9 / self.speed - (time.perf_counter() - self.started)
+        if delay > 0:
+            await asyncio.sleep(delay)
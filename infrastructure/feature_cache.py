@@ -0,0 +1,63 @@
+# Feature Cache (Infrastructure Layer)
+# Single Responsibility: Reuse computed feature columns across runs and pipelines
+
+import pandas as pd
+import numpy as np
+import hashlib
+import os
+
+class FeatureCache:
+    def __init__(self, root: str = "data/features", max_bytes: int = 2 * 1024**3):
+        """Initialize a content-addressed column cache bounded to max_bytes on disk."""
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(df: pd.DataFrame) -> str:
+        """Hash the index and values of the input bars."""
+        hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+        return hashlib.sha256(hashes.tobytes() + ",".join(map(str, df.columns)).encode()).hexdigest()
+
+    def column(self, bars_key: str, indicator: str, compute, mmap: bool = False) -> np.ndarray:
+        """Return a cached indicator column, computing and storing it on a miss.
+
+        indicator must name the kernel and its parameters (e.g. 'rsi:Close:14') so
+        different pipelines share a column exactly when they would compute the same one.
+        With mmap the stored array is returned memory-mapped read-only instead of loaded.
+        """
+        key = hashlib.sha256(f"{bars_key}:{indicator}".encode()).hexdigest()
+        path = os.path.join(self.root, f"{key}.npy")
+        try:
+            os.utime(path)  # refresh the LRU position
+            return np.load(path, mmap_mode='r' if mmap else None)
+        except FileNotFoundError:  # not cached, or evicted by another process since
+            pass
+        values = np.asarray(compute())
+        tmp_path = f"{path[:-4]}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, values)
+        os.replace(tmp_path, path)
+        self._evict(keep=path)
+        if mmap:
+            try:
+                return np.load(path, mmap_mode='r')
+            except FileNotFoundError:  # evicted by another process meanwhile
+                pass
+        return values
+
+    def _evict(self, keep: str = None) -> None:
+        """Delete least recently used columns other than keep until the cache fits max_bytes."""
+        entries = [(entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                   for entry in os.scandir(self.root)
+                   if entry.name.endswith(".npy") and ".tmp." not in entry.name]
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:  # still memory-mapped on platforms that lock open files
+                continue
+            total -= size
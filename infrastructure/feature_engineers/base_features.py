@@ -0,0 +1,34 @@
+# Feature Engineer Base (Infrastructure Layer)
+# Single Responsibility: Share cached indicator lookup and windowing across the pipelines' feature engineers
+
+from abc import ABC, abstractmethod
+import pandas as pd
+import numpy as np
+from infrastructure.feature_cache import FeatureCache
+from infrastructure.utils import FLOAT_DTYPE, sliding_windows
+
+class FeatureEngineer(ABC):
+    def __init__(self, df: pd.DataFrame, cache: FeatureCache = None, bars_key: str = None):
+        """Initialize feature engineer with price data and an optional feature cache."""
+        self.df = df  # never modified; add_features builds a new frame around it
+        self.cache = cache
+        self.bars_key = bars_key or (cache.fingerprint(df) if cache else None)  # given when already hashed
+
+    @abstractmethod
+    def add_features(self) -> pd.DataFrame:
+        """Add the pipeline's indicators and target and return the complete rows."""
+
+    @abstractmethod
+    def sequence_data(self, dtype=FLOAT_DTYPE) -> np.ndarray:
+        """Return the contiguous (rows, features + target) matrix that sequences are windowed from."""
+
+    def _indicator(self, name: str, compute) -> np.ndarray:
+        """Compute an indicator column, reusing the cached copy when available."""
+        compute_float = lambda: np.asarray(compute(), dtype=FLOAT_DTYPE)
+        if self.cache is None:
+            return compute_float()
+        return self.cache.column(self.bars_key, name, compute_float).astype(FLOAT_DTYPE, copy=False)
+
+    def prepare_sequences(self, seq_length: int, dtype=FLOAT_DTYPE) -> tuple:
+        """Prepare data sequences for model input as read-only window views."""
+        return sliding_windows(self.sequence_data(dtype), seq_length)
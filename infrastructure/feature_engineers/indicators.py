@@ -0,0 +1,117 @@
+# Indicator Kernels (Infrastructure Layer)
+# Single Responsibility: Compute technical indicators shared by all feature engineers
+
+import pandas as pd
+import numpy as np
+
+def sma(series: pd.Series, window: int) -> pd.Series:
+    """Simple moving average."""
+    return series.rolling(window).mean()
+
+def ema(series: pd.Series, span: int) -> pd.Series:
+    """Exponential moving average."""
+    return series.ewm(span=span).mean()
+
+def rsi(close: pd.Series, window: int) -> pd.Series:
+    """Relative Strength Index over simple rolling means of gains and losses."""
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=window).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+    rs = gain / (loss + 1e-6)
+    return 100 - (100 / (1 + rs))
+
+def atr(high: pd.Series, low: pd.Series, close: pd.Series, window: int) -> pd.Series:
+    """Average True Range."""
+    prev_close = close.shift()
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return true_range.rolling(window=window).mean()
+
+def rolling_normalize(series: pd.Series, window: int) -> pd.Series:
+    """Scale a series into its rolling [min, max] range."""
+    rolling = series.rolling(window)
+    min_val = rolling.min()
+    return (series - min_val) / (rolling.max() - min_val + 1e-6)
+
+# Panel kernels: the same indicators over (time, pair) arrays, every pair in one vectorized pass
+# along the time axis. Results are float64 and match the Series kernels above.
+
+def _shift(x: np.ndarray) -> np.ndarray:
+    """Shift rows down by one, filling the top with NaN."""
+    shifted = np.full(x.shape, np.nan)
+    shifted[1:] = x[:-1]
+    return shifted
+
+def _rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean over full windows from one cumulative sum; NaN wherever the window holds a NaN."""
+    out = np.full(x.shape, np.nan)
+    if len(x) < window:
+        return out
+    missing = np.isnan(x)
+    has_missing = missing.any()
+    sums = np.cumsum(np.where(missing, 0.0, x) if has_missing else x, axis=0)
+    out[window - 1] = sums[window - 1]
+    np.subtract(sums[window:], sums[:-window], out=out[window:])
+    out[window - 1:] /= window
+    if has_missing:
+        first_valid = np.argmin(missing, axis=0) + np.all(missing, axis=0) * len(x)
+        if np.array_equal(missing.sum(axis=0), first_valid):
+            # Warm-up gaps only lead each column, so each column's first full window is known
+            out[np.arange(len(x))[:, None] < first_valid + window - 1] = np.nan
+        else:
+            counts = np.cumsum(missing, axis=0)
+            gaps = counts[window - 1:].copy()
+            gaps[1:] -= counts[:-window]
+            out[window - 1:][gaps > 0] = np.nan
+    return out
+
+def _rolling_extreme(x: np.ndarray, window: int, extreme) -> np.ndarray:
+    """Rolling np.minimum/np.maximum over full windows in log2(window) passes; NaN propagates like pandas.
+
+    Each pass doubles the span covered by every row; a window is the extreme of
+    two overlapping power-of-two spans.
+    """
+    out = np.full(x.shape, np.nan)
+    n = len(x) - window + 1
+    if n <= 0:
+        return out
+    span, spans = 1, x
+    while span * 2 <= window:
+        spans = extreme(spans[:-span], spans[span:])
+        span *= 2
+    out[window - 1:] = extreme(spans[:n], spans[window - span:window - span + n])
+    return out
+
+def sma_panel(x: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average of every column."""
+    return _rolling_mean(np.asarray(x, dtype=np.float64), window)
+
+def ema_panel(x: np.ndarray, span: int) -> np.ndarray:
+    """Exponential moving average of every column, as pandas ewm(span=span).mean()."""
+    # The recurrence stays in pandas' compiled loop, which takes every column in one call
+    return pd.DataFrame(np.asarray(x, dtype=np.float64)).ewm(span=span).mean().to_numpy()
+
+def rsi_panel(close: np.ndarray, window: int) -> np.ndarray:
+    """Relative Strength Index of every column."""
+    close = np.asarray(close, dtype=np.float64)
+    delta = close - _shift(close)
+    # Like the Series kernel the first delta counts as no move, but rows before a column's first price stay NaN
+    missing = np.isnan(close)
+    gain = _rolling_mean(np.where(delta > 0, delta, np.where(missing, np.nan, 0.0)), window)
+    loss = _rolling_mean(np.where(delta < 0, -delta, np.where(missing, np.nan, 0.0)), window)
+    return 100 - (100 / (1 + gain / (loss + 1e-6)))
+
+def atr_panel(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int) -> np.ndarray:
+    """Average True Range of every column."""
+    high, low = np.asarray(high, dtype=np.float64), np.asarray(low, dtype=np.float64)
+    prev_close = _shift(np.asarray(close, dtype=np.float64))
+    true_range = high - low
+    np.fmax(true_range, np.abs(high - prev_close), out=true_range)
+    np.fmax(true_range, np.abs(low - prev_close), out=true_range)
+    return _rolling_mean(true_range, window)
+
+def rolling_normalize_panel(x: np.ndarray, window: int) -> np.ndarray:
+    """Scale every column into its rolling [min, max] range."""
+    # Extremes are exact in the input precision, so they are found before widening to float64
+    min_val = _rolling_extreme(x, window, np.minimum).astype(np.float64)
+    max_val = _rolling_extreme(x, window, np.maximum).astype(np.float64)
+    return (np.asarray(x, dtype=np.float64) - min_val) / (max_val - min_val + 1e-6)
@@ -3,42 +3,33 @@
 
 import pandas as pd
 import numpy as np
+from infrastructure.feature_engineers.base_features import FeatureEngineer
+from infrastructure.feature_engineers.indicators import sma, rsi, rolling_normalize
+from infrastructure.utils import FLOAT_DTYPE, column_matrix, drop_incomplete_rows
 
-class LongFeatureEngineer:
-    def __init__(self, df: pd.DataFrame):
-        """Initialize feature engineer with price and macro data."""
-        self.df = df.copy()
-
+class LongFeatureEngineer(FeatureEngineer):
     def add_features(self) -> pd.DataFrame:
         """Add technical and macro indicators for long-term prediction."""
         df = self.df
-        df['MA_50'] = df['Close'].rolling(50).mean()
-        df['MA_200'] = df['Close'].rolling(200).mean()
-        df['RSI_20'] = self._calculate_rsi(20)
-        df['Trend'] = np.where(df['MA_50'] > df['MA_200'], 1, 0)
+        close = df['Close']
+        features = {
+            'MA_50': self._indicator('sma:Close:50', lambda: sma(close, 50)),
+            'MA_200': self._indicator('sma:Close:200', lambda: sma(close, 200)),
+            'RSI_20': self._indicator('rsi:Close:20', lambda: rsi(close, 20))
+        }
+        features['Trend'] = (features['MA_50'] > features['MA_200']).astype(np.int8)
         if 'Interest_Rate' in df.columns:
-            df['Interest_Diff'] = df['Interest_Rate'].diff()
-        df['Target'] = df['Close'].shift(-1)  # Predict next price
+            features['Interest_Diff'] = df['Interest_Rate'].diff().to_numpy(dtype=FLOAT_DTYPE)
+        features['Target'] = close.shift(-1).to_numpy(dtype=FLOAT_DTYPE)  # Predict next price
         for col in ['Open', 'High', 'Low', 'Close', 'Volume', 'MA_50', 'MA_200', 'RSI_20']:
-            df[f'norm_{col}'] = (df[col] - df[col].rolling(50).min()) / \
-                               (df[col].rolling(50).max() - df[col].rolling(50).min() + 1e-6)
-        return df.dropna()
-
-    def _calculate_rsi(self, window: int) -> pd.Series:
-        """Calculate Relative Strength Index."""
-        delta = self.df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-        rs = gain / (loss + 1e-6)
-        return 100 - (100 / (1 + rs))
+            series = df[col] if col in df.columns else pd.Series(features[col], index=df.index)
+            features[f'norm_{col}'] = self._indicator(f'rolling_normalize:{col}:50',
+                                                      lambda: rolling_normalize(series, 50))
+        self.df = pd.concat([df, pd.DataFrame(features, index=df.index)], axis=1)
+        return drop_incomplete_rows(self.df)
 
-    def prepare_sequences(self, seq_length: int) -> tuple:
-        """Prepare data sequences for model input."""
+    def sequence_data(self, dtype=FLOAT_DTYPE) -> np.ndarray:
+        """Return the contiguous (rows, features + target) matrix that sequences are windowed from."""
         features = ['norm_Open', 'norm_High', 'norm_Low', 'norm_Close', 
                    'norm_Volume', 'norm_MA_50', 'norm_MA_200', 'norm_RSI_20']
-        data = self.df[features + ['Target']].values
-        X, y = [], []
-        for i in range(len(data) - seq_length):
-            X.append(data[i:i + seq_length, :-1])
-            y.append(data[i + seq_length - 1, -1])
-        return np.array(X), np.array(y)
\ No newline at end of file
+        return column_matrix(self.df, features + ['Target'], dtype)
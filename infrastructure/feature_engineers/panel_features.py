@@ -0,0 +1,136 @@
+# Panel Features (Infrastructure Layer)
+# Single Responsibility: Engineer one pipeline's features for every pair of a panel in one pass
+
+import pandas as pd
+import numpy as np
+from infrastructure.data_loaders.panel_loader import Panel
+from infrastructure.feature_engineers.indicators import (sma_panel, ema_panel, rsi_panel, atr_panel,
+                                                         rolling_normalize_panel)
+from infrastructure.utils import FLOAT_DTYPE, sliding_windows
+
+# Sequence columns of each pipeline, in the order its feature engineer stacks them (Target last)
+SEQUENCE_FEATURES = {
+    'short': ['norm_Open', 'norm_High', 'norm_Low', 'norm_Close'],
+    'medium': ['norm_Open', 'norm_High', 'norm_Low', 'norm_Close', 'norm_Volume', 'norm_ATR_14'],
+    'long': ['norm_Open', 'norm_High', 'norm_Low', 'norm_Close',
+             'norm_Volume', 'norm_MA_50', 'norm_MA_200', 'norm_RSI_20']
+}
+
+class PanelFeatureEngineer:
+    def __init__(self, panel: Panel, pipeline: str):
+        """Initialize feature engineer for every pair of an aligned panel.
+
+        Bars the alignment filled in are left out: each pair's real bars are packed from
+        row 0 of its column (NaN after its last one), so the kernels still run across all
+        pairs at once but every pair's indicators and windows match its per-pair engineer.
+        """
+        if pipeline not in SEQUENCE_FEATURES:
+            raise ValueError(f"Invalid pipeline: {pipeline}. Use {', '.join(SEQUENCE_FEATURES)}.")
+        self.panel = panel
+        self.pipeline = pipeline
+        self.rows = {pair: np.flatnonzero(panel.present[:, p]) for p, pair in enumerate(panel.pairs)}
+        length = max(len(rows) for rows in self.rows.values())
+        self.values = np.full((length, len(panel.pairs), len(panel.fields)), np.nan, dtype=FLOAT_DTYPE)
+        for p, rows in enumerate(self.rows.values()):
+            self.values[:len(rows), p] = panel.values[rows, p]
+        self.features = {}
+        self.data = None
+
+    def field(self, name: str) -> np.ndarray:
+        """(row, pair) view of one field over each pair's packed real bars."""
+        return self.values[:, :, self.panel.fields.index(name)]
+
+    def add_features(self) -> dict:
+        """Compute the pipeline's indicators as (time, pair) float32 arrays, as the per-pair engineers do.
+
+        The long pipeline gets no macro columns: they never enter its sequences.
+        """
+        field = self.field
+        close = field('Close')
+        features = {}
+        if self.pipeline == 'short':
+            features['EMA_3'] = self._indicator(ema_panel(close, 3))
+            features['EMA_8'] = self._indicator(ema_panel(close, 8))
+            features['RSI_5'] = self._indicator(rsi_panel(close, 5))
+            features['Target'] = self._next_close_higher(close)
+            normalized, window = ['Open', 'High', 'Low', 'Close'], 10
+        elif self.pipeline == 'medium':
+            features['MA_5'] = self._indicator(sma_panel(close, 5))
+            features['MA_20'] = self._indicator(sma_panel(close, 20))
+            features['RSI_14'] = self._indicator(rsi_panel(close, 14))
+            features['ATR_14'] = self._indicator(atr_panel(field('High'), field('Low'), close, 14))
+            features['Target'] = self._next_close_higher(close)
+            normalized, window = ['Open', 'High', 'Low', 'Close', 'Volume', 'ATR_14'], 20
+        else:
+            features['MA_50'] = self._indicator(sma_panel(close, 50))
+            features['MA_200'] = self._indicator(sma_panel(close, 200))
+            features['RSI_20'] = self._indicator(rsi_panel(close, 20))
+            features['Trend'] = (features['MA_50'] > features['MA_200']).astype(np.int8)
+            # Predict next price; the NaN padding after each pair's last bar leaves its Target NaN
+            target = np.full(close.shape, np.nan, dtype=FLOAT_DTYPE)
+            target[:-1] = close[1:]
+            features['Target'] = target
+            normalized, window = ['Open', 'High', 'Low', 'Close', 'Volume', 'MA_50', 'MA_200', 'RSI_20'], 50
+        for col in normalized:
+            values = features[col] if col in features else field(col)
+            features[f'norm_{col}'] = self._indicator(rolling_normalize_panel(values, window))
+        self.features = features
+        self.data = None
+        return features
+
+    @staticmethod
+    def _indicator(values: np.ndarray) -> np.ndarray:
+        """Narrow a float64 kernel result to the feature precision, like the per-pair engineers."""
+        return values.astype(FLOAT_DTYPE)
+
+    @staticmethod
+    def _next_close_higher(close: np.ndarray) -> np.ndarray:
+        """1 where the next bar closes higher, else 0 (including each pair's last bar)."""
+        target = np.zeros(close.shape, dtype=np.int8)
+        target[:-1] = close[1:] > close[:-1]
+        return target
+
+    def sequence_data(self, dtype=FLOAT_DTYPE) -> np.ndarray:
+        """Return the (pair, row, features + target) tensor; each pair's matrix is contiguous."""
+        if self.data is None or self.data.dtype != dtype:
+            if not self.features:
+                self.add_features()
+            columns = SEQUENCE_FEATURES[self.pipeline] + ['Target']
+            data = np.empty((len(self.panel.pairs), len(self.values), len(columns)), dtype=dtype)
+            for i, col in enumerate(columns):
+                data[:, :, i] = self.features[col].T
+            self.data = data
+        return self.data
+
+    def pair_view(self, pair: str) -> 'PairFeatures':
+        """Features of one pair, shaped like a per-pair feature engineer."""
+        return PairFeatures(self, pair)
+
+class PairFeatures:
+    def __init__(self, engineer: PanelFeatureEngineer, pair: str):
+        """Initialize a view of one pair's real bars."""
+        self.engineer = engineer
+        self.pair = pair
+        self.column = engineer.panel.pairs.index(pair)
+        self.rows = slice(0, len(engineer.rows[pair]))
+        self.bars_key = None  # panel features are computed in one pass and not cached per pair
+        self._df = None
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """Bars and features of the pair as a frame, like a per-pair engineer's df after add_features."""
+        if self._df is None:
+            engineer = self.engineer
+            columns = {field: engineer.values[self.rows, self.column, i]
+                       for i, field in enumerate(engineer.panel.fields)}
+            columns.update({name: values[self.rows, self.column] for name, values in engineer.features.items()})
+            self._df = pd.DataFrame(columns, index=engineer.panel.index[engineer.rows[self.pair]])
+        return self._df
+
+    def sequence_data(self, dtype=FLOAT_DTYPE) -> np.ndarray:
+        """Return the pair's contiguous (rows, features + target) matrix as a view into the panel tensor."""
+        return self.engineer.sequence_data(dtype)[self.column, self.rows]
+
+    def prepare_sequences(self, seq_length: int, dtype=FLOAT_DTYPE) -> tuple:
+        """Prepare data sequences for model input as read-only window views."""
+        return sliding_windows(self.sequence_data(dtype), seq_length)
@@ -3,38 +3,28 @@
 
 import pandas as pd
 import numpy as np
+from infrastructure.feature_engineers.base_features import FeatureEngineer
+from infrastructure.feature_engineers.indicators import ema, rsi, rolling_normalize
+from infrastructure.utils import FLOAT_DTYPE, column_matrix, drop_incomplete_rows
 
-class ShortFeatureEngineer:
-    def __init__(self, df: pd.DataFrame):
-        """Initialize feature engineer with price data."""
-        self.df = df.copy()
-
+class ShortFeatureEngineer(FeatureEngineer):
     def add_features(self) -> pd.DataFrame:
         """Add technical indicators for short-term prediction."""
         df = self.df
-        df['EMA_3'] = df['Close'].ewm(span=3).mean()
-        df['EMA_8'] = df['Close'].ewm(span=8).mean()
-        df['RSI_5'] = self._calculate_rsi(5)
-        df['Target'] = np.where(df['Close'].shift(-1) > df['Close'], 1, 0)
+        close = df['Close']
+        features = {
+            'EMA_3': self._indicator('ema:Close:3', lambda: ema(close, 3)),
+            'EMA_8': self._indicator('ema:Close:8', lambda: ema(close, 8)),
+            'RSI_5': self._indicator('rsi:Close:5', lambda: rsi(close, 5)),
+            'Target': (close.shift(-1) > close).to_numpy(dtype=np.int8)
+        }
         for col in ['Open', 'High', 'Low', 'Close']:
-            df[f'norm_{col}'] = (df[col] - df[col].rolling(10).min()) / \
-                               (df[col].rolling(10).max() - df[col].rolling(10).min() + 1e-6)
-        return df.dropna()
-
-    def _calculate_rsi(self, window: int) -> pd.Series:
-        """Calculate Relative Strength Index."""
-        delta = self.df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-        rs = gain / (loss + 1e-6)
-        return 100 - (100 / (1 + rs))
+            features[f'norm_{col}'] = self._indicator(f'rolling_normalize:{col}:10',
+                                                      lambda: rolling_normalize(df[col], 10))
+        self.df = pd.concat([df, pd.DataFrame(features, index=df.index)], axis=1)
+        return drop_incomplete_rows(self.df)
 
-    def prepare_sequences(self, seq_length: int) -> tuple:
-        """Prepare data sequences for model input."""
+    def sequence_data(self, dtype=FLOAT_DTYPE) -> np.ndarray:
+        """Return the contiguous (rows, features + target) matrix that sequences are windowed from."""
         features = ['norm_Open', 'norm_High', 'norm_Low', 'norm_Close']
-        data = self.df[features + ['Target']].values
-        X, y = [], []
-        for i in range(len(data) - seq_length):
-            X.append(data[i:i + seq_length, :-1])
-            y.append(data[i + seq_length - 1, -1])
-        return np.array(X), np.array(y)
\ No newline at end of file
+        return column_matrix(self.df, features + ['Target'], dtype)
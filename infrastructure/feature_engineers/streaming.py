@@ -0,0 +1,180 @@
+# Streaming Features (Infrastructure Layer)
+# Single Responsibility: Update pipeline features incrementally, one bar at a time
+
+from collections import deque
+import math
+import numpy as np
+
+class RollingMean:
+    def __init__(self, window: int):
+        """Initialize a fixed-window running mean."""
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+
+    def update(self, x: float) -> float:
+        """Add a value and return the window mean, or NaN until the window is full."""
+        if math.isnan(x):
+            # pandas needs a full window of valid values, so a gap restarts the window
+            self.values.clear()
+            self.total = 0.0
+            return math.nan
+        self.values.append(x)
+        self.total += x
+        if len(self.values) > self.window:
+            self.total -= self.values.popleft()
+        return self.total / self.window if len(self.values) == self.window else math.nan
+
+class Ema:
+    def __init__(self, span: int):
+        """Initialize an exponential moving average matching pandas ewm(span=span, adjust=True)."""
+        self.decay = 1 - 2 / (span + 1)
+        self.weighted_sum = 0.0
+        self.weight_total = 0.0
+
+    def update(self, x: float) -> float:
+        """Add a value and return the current average."""
+        self.weighted_sum = x + self.decay * self.weighted_sum
+        self.weight_total = 1 + self.decay * self.weight_total
+        return self.weighted_sum / self.weight_total
+
+class RollingMinMax:
+    def __init__(self, window: int):
+        """Initialize rolling min/max tracking with monotonic deques."""
+        self.window = window
+        self.count = 0
+        self.mins = deque()
+        self.maxs = deque()
+
+    def update(self, x: float) -> tuple:
+        """Add a value and return (min, max) over the window, or NaNs until it is full."""
+        if math.isnan(x):
+            self.count = 0
+            self.mins.clear()
+            self.maxs.clear()
+            return math.nan, math.nan
+        i = self.count
+        self.count += 1
+        while self.mins and self.mins[-1][1] >= x:
+            self.mins.pop()
+        while self.maxs and self.maxs[-1][1] <= x:
+            self.maxs.pop()
+        self.mins.append((i, x))
+        self.maxs.append((i, x))
+        if self.mins[0][0] <= i - self.window:
+            self.mins.popleft()
+        if self.maxs[0][0] <= i - self.window:
+            self.maxs.popleft()
+        if self.count < self.window:
+            return math.nan, math.nan
+        return self.mins[0][1], self.maxs[0][1]
+
+class RollingNormalizer:
+    def __init__(self, window: int):
+        """Initialize rolling min/max normalization."""
+        self.extremes = RollingMinMax(window)
+
+    def update(self, x: float) -> float:
+        """Scale a value into its rolling [min, max] range."""
+        low, high = self.extremes.update(x)
+        return (x - low) / (high - low + 1e-6)
+
+class Rsi:
+    def __init__(self, window: int):
+        """Initialize Relative Strength Index over simple rolling means."""
+        self.prev_close = math.nan
+        self.gain = RollingMean(window)
+        self.loss = RollingMean(window)
+
+    def update(self, close: float) -> float:
+        """Add a close and return the RSI."""
+        # The first delta is NaN, which the batch version turns into a zero gain and loss
+        delta = close - self.prev_close
+        self.prev_close = close
+        gain = self.gain.update(delta if delta > 0 else 0.0)
+        loss = self.loss.update(-delta if delta < 0 else 0.0)
+        return 100 - (100 / (1 + gain / (loss + 1e-6)))
+
+class Atr:
+    def __init__(self, window: int):
+        """Initialize Average True Range."""
+        self.prev_close = math.nan
+        self.mean = RollingMean(window)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """Add a bar and return the ATR."""
+        true_range = high - low
+        if not math.isnan(self.prev_close):
+            true_range = max(true_range, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        return self.mean.update(true_range)
+
+# Indicator columns computed per pipeline, the rolling normalization window and the
+# model features, mirroring the batch *FeatureEngineer.add_features/prepare_sequences
+PIPELINE_SPECS = {
+    'short': {
+        'indicators': {'EMA_3': ('ema', 3), 'EMA_8': ('ema', 8), 'RSI_5': ('rsi', 5)},
+        'norm_window': 10,
+        'features': ['Open', 'High', 'Low', 'Close']
+    },
+    'medium': {
+        'indicators': {'MA_5': ('sma', 5), 'MA_20': ('sma', 20), 'RSI_14': ('rsi', 14), 'ATR_14': ('atr', 14)},
+        'norm_window': 20,
+        'features': ['Open', 'High', 'Low', 'Close', 'Volume', 'ATR_14']
+    },
+    'long': {
+        'indicators': {'MA_50': ('sma', 50), 'MA_200': ('sma', 200), 'RSI_20': ('rsi', 20)},
+        'norm_window': 50,
+        'features': ['Open', 'High', 'Low', 'Close', 'Volume', 'MA_50', 'MA_200', 'RSI_20']
+    }
+}
+
+_INDICATORS = {'ema': Ema, 'sma': RollingMean, 'rsi': Rsi, 'atr': Atr}
+
+class StreamingFeatureEngine:
+    def __init__(self, pipeline: str, seq_length: int):
+        """Initialize incremental feature state for a pipeline ('short', 'medium' or 'long')."""
+        spec = PIPELINE_SPECS[pipeline]
+        self.seq_length = seq_length
+        self.features = spec['features']
+        self.indicators = {name: _INDICATORS[kind](window) for name, (kind, window) in spec['indicators'].items()}
+        self.normalizers = {col: RollingNormalizer(spec['norm_window']) for col in self.features}
+        self.buffer = np.zeros((seq_length, len(self.features)))
+        self.position = 0
+        self.rows = 0
+
+    def update(self, bar) -> np.ndarray:
+        """Consume one OHLCV bar and return its normalized feature row.
+
+        Returns None while any indicator is still warming up, i.e. for the rows
+        the batch pipeline drops with dropna().
+        """
+        values = {col: float(bar[col]) for col in ('Open', 'High', 'Low', 'Close', 'Volume')}
+        for name, indicator in self.indicators.items():
+            if isinstance(indicator, Atr):
+                values[name] = indicator.update(values['High'], values['Low'], values['Close'])
+            else:
+                values[name] = indicator.update(values['Close'])
+        row = np.array([self.normalizers[col].update(values[col]) for col in self.features])
+        if any(math.isnan(v) for v in values.values()) or np.isnan(row).any():
+            return None
+        self.buffer[self.position] = row
+        self.position = (self.position + 1) % self.seq_length
+        self.rows += 1
+        return row
+
+    def warm_up(self, df) -> 'StreamingFeatureEngine':
+        """Replay historical bars to initialize the state."""
+        for bar in df[['Open', 'High', 'Low', 'Close', 'Volume']].itertuples(index=False):
+            self.update(bar._asdict())
+        return self
+
+    @property
+    def ready(self) -> bool:
+        """Whether seq_length valid rows have been buffered."""
+        return self.rows >= self.seq_length
+
+    def window(self, dtype=np.float32) -> np.ndarray:
+        """Return the latest seq_length rows, oldest first, shaped (1, seq_length, features)."""
+        ordered = np.concatenate([self.buffer[self.position:], self.buffer[:self.position]])
+        return ordered.astype(dtype)[np.newaxis]
@@ -0,0 +1,234 @@
+# Instrumentation (Infrastructure Layer)
+# Single Responsibility: Measure pipeline stages and export the metrics
+
+from collections import defaultdict, deque
+import cProfile
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+import numpy as np
+
+class _NullSpan:
+    """Span used while instrumentation is disabled; every operation is a no-op."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def record(self, **counters) -> None:
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    def __init__(self, owner: 'Instrumentation', stage: str, counters: dict):
+        self.owner = owner
+        self.stage = stage
+        self.counters = dict(counters)
+        self.child_peak = 0
+        self.profiler = None
+        self.overlapped = False  # another thread had a span open meanwhile
+
+    def record(self, **counters) -> None:
+        """Add row/array-size counters to the span."""
+        for name, value in counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def __enter__(self):
+        owner = self.owner
+        self.parent = owner.stack[-1] if owner.stack else None
+        owner.stack.append(self)
+        if owner.trace_memory:
+            owner.open_span(self)
+        if owner.trace_memory and not self.overlapped:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.parent:
+                # reset_peak below would otherwise hide the parent's peak so far
+                self.parent.child_peak = max(self.parent.child_peak, peak)
+            tracemalloc.reset_peak()
+            self.traced_start = current
+        if owner.should_profile(self.stage):
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self.rss_start = _max_rss_bytes()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.started
+        owner = self.owner
+        if self.profiler:
+            self.profiler.disable()
+            os.makedirs(owner.profile_dir, exist_ok=True)
+            self.profiler.dump_stats(os.path.join(owner.profile_dir, f"{self.stage}.prof"))
+        event = {
+            'ts': time.time(),
+            'stage': self.stage,
+            'seconds': seconds,
+            'peak_rss_delta_bytes': _max_rss_bytes() - self.rss_start,
+            'status': 'error' if exc[0] else 'ok',
+            **owner.labels,
+            **self.counters
+        }
+        if owner.trace_memory:
+            owner.close_span(self)
+            if self.overlapped:
+                # The traced peak is process-wide, so it cannot be split between concurrent spans
+                event['tracemalloc_overlapped'] = True
+            else:
+                peak = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+                event['tracemalloc_peak_delta_bytes'] = max(peak - self.traced_start, 0)
+                if self.parent:
+                    self.parent.child_peak = max(self.parent.child_peak, peak)
+        owner.stack.pop()
+        owner.add(event)
+        return False
+
+def _max_rss_bytes() -> int:
+    """Process peak resident set size (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+class Instrumentation:
+    def __init__(self, enabled: bool = False, trace_memory: bool = False, profile_stages: tuple = (),
+                 profile_dir: str = "profiles", labels: dict = None):
+        """Initialize stage instrumentation.
+
+        When disabled, span() returns a shared no-op context manager, so instrumented
+        code pays only a method call. profile_stages lists stage names to capture with
+        cProfile ('*' for all); trace_memory enables tracemalloc peak deltas. The traced
+        peak is process-wide, so it is only recorded for spans that never overlapped a
+        span of another thread; the others are flagged tracemalloc_overlapped instead.
+        """
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.profile_stages = set(profile_stages) if enabled else set()
+        self.profile_dir = profile_dir
+        self.labels = dict(labels or {})
+        self.events = []
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.totals = defaultdict(lambda: defaultdict(float))
+        self.open_spans = []
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @property
+    def stack(self) -> list:
+        """Open spans of the calling thread, so stages running concurrently nest independently."""
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    def span(self, stage: str, **counters):
+        """Context manager timing one stage; use .record(rows=..., nbytes=...) to add counters."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, stage, counters)
+
+    def open_span(self, span: _Span) -> None:
+        """Track a span while it is open; spans of different threads open at once all overlap."""
+        span.thread = threading.get_ident()
+        with self.lock:
+            if any(other.thread != span.thread for other in self.open_spans):
+                for other in self.open_spans:
+                    other.overlapped = True
+                span.overlapped = True
+            self.open_spans.append(span)
+
+    def close_span(self, span: _Span) -> None:
+        with self.lock:
+            self.open_spans.remove(span)
+
+    def should_profile(self, stage: str) -> bool:
+        # cProfile cannot nest, so only the outermost profiled stage is captured
+        if not ('*' in self.profile_stages or stage in self.profile_stages):
+            return False
+        return not any(span.profiler for span in self.stack[:-1])
+
+    def add(self, event: dict) -> None:
+        """Store a finished span and fold it into the per-stage totals."""
+        with self.lock:
+            self.events.append(event)
+            totals = self.totals[event['stage']]
+            totals['calls'] += 1
+            totals['seconds'] += event['seconds']
+            totals['max_seconds'] = max(totals['max_seconds'], event['seconds'])
+            for key in ('peak_rss_delta_bytes', 'tracemalloc_peak_delta_bytes'):
+                if key in event:
+                    totals[key] = max(totals[key], event[key])
+            for key, value in event.items():
+                if key.startswith('n_') or key in ('rows', 'nbytes'):
+                    totals[f'count_{key}'] += value
+
+    def export_prometheus(self, path: str) -> None:
+        """Write per-stage totals in the Prometheus text exposition format."""
+        metrics = {
+            'calls': ('forex_stage_calls_total', 'counter', 'Times the stage ran'),
+            'seconds': ('forex_stage_seconds_total', 'counter', 'Wall-clock seconds spent in the stage'),
+            'max_seconds': ('forex_stage_max_seconds', 'gauge', 'Slowest single run of the stage'),
+            'peak_rss_delta_bytes': ('forex_stage_peak_rss_delta_bytes', 'gauge',
+                                     'Growth of the process peak RSS during the stage'),
+            'tracemalloc_peak_delta_bytes': ('forex_stage_tracemalloc_peak_delta_bytes', 'gauge',
+                                             'Peak Python-traced allocation above the stage start')
+        }
+        base_labels = "".join(f',{key}="{value}"' for key, value in sorted(self.labels.items()))
+        lines = []
+        for key, (name, kind, help_text) in metrics.items():
+            samples = [(stage, totals[key]) for stage, totals in self.totals.items() if key in totals]
+            if not samples:
+                continue
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            lines += [f'{name}{{stage="{stage}"{base_labels}}} {value:g}' for stage, value in samples]
+        items = [(stage, key[len('count_'):], value) for stage, totals in self.totals.items()
+                 for key, value in totals.items() if key.startswith('count_')]
+        if items:
+            lines += ["# HELP forex_stage_items_total Rows or bytes processed by the stage",
+                      "# TYPE forex_stage_items_total counter"]
+            lines += [f'forex_stage_items_total{{stage="{stage}",item="{item}"{base_labels}}} {value:g}'
+                      for stage, item, value in items]
+        _write_atomic(path, "\n".join(lines) + "\n")
+
+    def export_json(self, path: str) -> None:
+        """Append every span as one JSON object per line."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "a") as f:
+            for event in self.events:
+                f.write(json.dumps(event) + "\n")
+
+    def export(self, directory: str, name: str) -> None:
+        """Write <name>.prom and <name>.jsonl into directory."""
+        if not self.enabled:
+            return
+        self.export_prometheus(os.path.join(directory, f"{name}.prom"))
+        self.export_json(os.path.join(directory, f"{name}.jsonl"))
+
+def _write_atomic(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+class LatencyStats:
+    def __init__(self, size: int = 10000):
+        """Initialize a sliding sample of latencies in milliseconds."""
+        self.samples = deque(maxlen=size)
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds * 1000)
+        self.count += 1
+
+    def summary(self) -> dict:
+        """Return the sample count and p50/p99 latency over the recent sample."""
+        if not self.samples:
+            return {'count': self.count, 'p50_ms': None, 'p99_ms': None}
+        p50, p99 = np.percentile(np.fromiter(self.samples, dtype=float), [50, 99])
+        return {'count': self.count, 'p50_ms': float(p50), 'p99_ms': float(p99)}
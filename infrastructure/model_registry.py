@@ -0,0 +1,121 @@
+# Model Registry (Infrastructure Layer)
+# Single Responsibility: Persist trained models and decide when they can be reused
+
+import numpy as np
+import hashlib
+import json
+import os
+import shutil
+import time
+
+class ModelRegistry:
+    def __init__(self, root: str = "models"):
+        """Initialize registry storing one artifact set per pipeline/symbol/timeframe."""
+        self.root = os.path.abspath(root)
+
+    @staticmethod
+    def fingerprint(X: np.ndarray, y: np.ndarray, rows: int) -> str:
+        """Hash the first rows windows.
+
+        Consecutive windows overlap, so the first window plus the last step of every
+        window and the targets identify the data without hashing each window.
+        """
+        digest = hashlib.sha256()
+        digest.update(np.ascontiguousarray(X[:1]).tobytes())
+        digest.update(np.ascontiguousarray(X[:rows, -1, :]).tobytes())
+        digest.update(np.ascontiguousarray(y[:rows]).tobytes())
+        return digest.hexdigest()
+
+    def match(self, key: tuple, X: np.ndarray, y: np.ndarray) -> tuple:
+        """Compare stored artifacts with the current data.
+
+        Returns ('current', rows) when they were trained on exactly this data,
+        ('extended', rows) when the data only appends windows after the first rows,
+        and ('new', 0) when the models have to be trained from scratch.
+        """
+        meta = self._read_meta(key)
+        if meta is None or meta['input_shape'] != list(X.shape[1:]):
+            return 'new', 0
+        rows = meta['rows']
+        if rows > len(X) or self.fingerprint(X, y, rows) != meta['digest']:
+            return 'new', 0
+        return ('current' if rows == len(X) else 'extended'), rows
+
+    def has(self, key: tuple) -> bool:
+        """Whether artifacts have been registered for the key."""
+        return self._read_meta(key) is not None
+
+    def load(self, key: tuple, model, refiner) -> None:
+        """Restore network weights and the refiner booster."""
+        directory = self._artifact_dir(key)
+        model.load(os.path.join(directory, "network.weights.h5"))
+        refiner.load(os.path.join(directory, "refiner.json"))
+
+    def load_export(self, key: tuple, refiner):
+        """Restore the refiner and return the NumPy export of the network, or None if there is none."""
+        from domain.models.numpy_network import NumpyNetwork
+        directory = self._artifact_dir(key)
+        path = os.path.join(directory, "network.npz")
+        if not os.path.exists(path):
+            return None
+        refiner.load(os.path.join(directory, "refiner.json"))
+        return NumpyNetwork.load(path)
+
+    def save(self, key: tuple, model, refiner, X: np.ndarray, y: np.ndarray, data_range: tuple = None) -> None:
+        """Store network weights, their NumPy export, refiner booster and the data fingerprint.
+
+        Artifacts go to a fresh version directory and meta.json, which names it, is
+        swapped in last, so a crash mid-save leaves the previous version in use.
+        """
+        key_dir = self._key_dir(key)
+        version = f"v{time.time_ns()}"
+        directory = os.path.join(key_dir, version)
+        os.makedirs(directory)
+        model.save(os.path.join(directory, "network.weights.h5"))
+        self._export(directory, key, model)
+        refiner.save(os.path.join(directory, "refiner.json"))
+        meta = {
+            'key': list(key),
+            'version': version,
+            'input_shape': list(X.shape[1:]),
+            'rows': len(X),
+            'digest': self.fingerprint(X, y, len(X)),
+            'data_range': list(data_range) if data_range else None
+        }
+        tmp_path = os.path.join(key_dir, "meta.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, os.path.join(key_dir, "meta.json"))
+        for name in os.listdir(key_dir):
+            if name != version and os.path.isdir(os.path.join(key_dir, name)):
+                shutil.rmtree(os.path.join(key_dir, name), ignore_errors=True)
+
+    def export(self, key: tuple, model) -> bool:
+        """Write the network as network.npz for TensorFlow-free inference; returns False if it cannot be."""
+        return self._export(self._artifact_dir(key), key, model)
+
+    def _export(self, directory: str, key: tuple, model) -> bool:
+        path = os.path.join(directory, "network.npz")
+        tmp_path = os.path.join(directory, "network.tmp.npz")
+        try:
+            model.export(tmp_path)
+        except ValueError as e:
+            print(f"Warning: No NumPy export for {'/'.join(map(str, key))}: {e}")
+            return False
+        os.replace(tmp_path, path)
+        return True
+
+    def _read_meta(self, key: tuple):
+        path = os.path.join(self._key_dir(key), "meta.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _artifact_dir(self, key: tuple) -> str:
+        """Directory of the version meta.json points at; registries saved before versioning keep files flat."""
+        meta = self._read_meta(key) or {}
+        return os.path.join(self._key_dir(key), meta.get('version', ''))
+
+    def _key_dir(self, key: tuple) -> str:
+        return os.path.join(self.root, *(str(part).lower() for part in key))
@@ -3,9 +3,81 @@
 
 import pandas as pd
 import numpy as np
+import os
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Prices, features and model tensors are kept in single precision end to end
+FLOAT_DTYPE = np.float32
+
+# Thread pools read by OpenMP (XGBoost), MKL/OpenBLAS and TensorFlow at initialization
+THREAD_ENV_VARS = ['OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS',
+                   'TF_NUM_INTRAOP_THREADS', 'TF_NUM_INTEROP_THREADS']
+
+def limit_native_threads(threads: int) -> None:
+    """Cap native thread pools; call in a worker before TensorFlow or XGBoost are loaded."""
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
 
 def normalize(series: pd.Series) -> pd.Series:
     """Normalize a series using a rolling window."""
     min_val = series.rolling(20).min()
     max_val = series.rolling(20).max()
-    return (series - min_val) / (max_val - min_val + 1e-6)
\ No newline at end of file
+    return (series - min_val) / (max_val - min_val + 1e-6)
+
+def column_matrix(df: pd.DataFrame, columns: list, dtype=FLOAT_DTYPE) -> np.ndarray:
+    """Stack frame columns into one C-contiguous matrix, filled column by column.
+
+    Unlike df[columns].values this never builds an interleaved float64 copy first.
+    """
+    data = np.empty((len(df), len(columns)), dtype=dtype)
+    for i, col in enumerate(columns):
+        data[:, i] = df[col].to_numpy()
+    return data
+
+def drop_incomplete_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Drop rows holding NaN, like dropna().
+
+    Indicator warm-up leaves NaN in the leading rows and a next-bar target in the
+    last one; both ends are sliced off without copying, and only a gap in between
+    falls back to a boolean selection.
+    """
+    valid = np.ones(len(df), dtype=bool)
+    for col in df.columns:
+        valid &= ~pd.isna(df[col].to_numpy())
+    if not valid.any():
+        return df.iloc[:0]
+    first = int(valid.argmax())
+    stop = len(valid) - int(valid[::-1].argmax())
+    if valid[first:stop].all():
+        return df.iloc[first:stop]
+    return df[valid]
+
+def sliding_windows(data: np.ndarray, seq_length: int, dtype=None) -> tuple:
+    """Build (X, y) windows from a 2-D array whose last column is the target.
+
+    X[i] is data[i:i + seq_length, :-1] and y[i] is data[i + seq_length - 1, -1].
+    X is a read-only strided view over data, so no window is copied; only a
+    dtype conversion of the base array (e.g. float64 -> float32) allocates.
+    """
+    data = np.asarray(data, dtype=dtype)
+    num_windows = max(len(data) - seq_length, 0)
+    features = data[:, :-1]
+    if num_windows == 0:
+        X = np.empty((0, seq_length, features.shape[1]), dtype=data.dtype)
+    else:
+        # sliding_window_view yields (n, features, seq_length); swap to (n, seq_length, features)
+        X = sliding_window_view(features, seq_length, axis=0)[:num_windows].transpose(0, 2, 1)
+    y = data[seq_length - 1:seq_length - 1 + num_windows, -1]
+    y.flags.writeable = False
+    return X, y
+
+def first_valid_window(data: np.ndarray) -> int:
+    """First window of sliding_windows(data) whose rows and target contain no warm-up NaNs."""
+    invalid = np.flatnonzero(np.isnan(data[:-1]).any(axis=1))
+    return 0 if len(invalid) == 0 else int(invalid[-1]) + 1
+
+def iter_window_batches(data: np.ndarray, seq_length: int, batch_size: int, dtype=None):
+    """Lazily yield (X, y) window batches, materializing one batch at a time."""
+    X, y = sliding_windows(data, seq_length, dtype)
+    for start in range(0, len(X), batch_size):
+        yield np.ascontiguousarray(X[start:start + batch_size]), y[start:start + batch_size].copy()
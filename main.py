@@ -1,8 +1,8 @@
 # Entry Point (Presentation Layer)
 # Single Responsibility: Launch the CLI
 
-from presentation.cli import ForexCLI
+from presentation.commands import parse_args
 
 if __name__ == "__main__":
-    cli = ForexCLI()
-    cli.run()
\ No newline at end of file
+    args = parse_args()
+    args.func(args)
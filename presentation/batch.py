@@ -0,0 +1,159 @@
+# Batch Runner (Presentation Layer)
+# Single Responsibility: Run the pair x timeframe grid non-interactively over a process pool
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from config import PAIRS, TIMEFRAMES, DEFAULT_START_DATE, DEFAULT_END_DATE
+from infrastructure.instrumentation import Instrumentation
+from infrastructure.utils import limit_native_threads
+import json
+import os
+import time
+import traceback
+
+def load_grid(path: str = None, pairs: list = None, timeframes: list = None) -> list:
+    """Build the (pair, timeframe) job list from a JSON grid file and/or explicit lists.
+
+    The grid file may hold "pairs" and "timeframes" lists; anything left unspecified
+    defaults to every configured pair or timeframe.
+    """
+    spec = {}
+    if path:
+        with open(path) as f:
+            spec = json.load(f)
+    all_timeframes = TIMEFRAMES['short'] + TIMEFRAMES['medium'] + TIMEFRAMES['long']
+    pairs = pairs or spec.get('pairs') or PAIRS
+    timeframes = timeframes or spec.get('timeframes') or all_timeframes
+    unknown = [tf for tf in timeframes if tf not in all_timeframes]
+    if unknown:
+        raise ValueError(f"Invalid timeframes: {unknown}. Use {', '.join(all_timeframes)}.")
+    return [(pair, tf) for pair in pairs for tf in timeframes]
+
+def run_job(symbol: str, timeframe: str, start_date: str, end_date: str, metrics_dir: str = None,
+            trace_memory: bool = False, profile_stages: tuple = (), features=None) -> dict:
+    """Run one predictor end to end and return its result record with stage timings.
+
+    With metrics_dir set, fine-grained stage metrics are exported there as
+    <symbol>_<timeframe>.prom and .jsonl; profiles go to <metrics_dir>/profiles/<symbol>_<timeframe>.
+    features, a PairFeatures view of a panel, replaces the predictor's own loading and feature pass.
+    """
+    record = {'symbol': symbol, 'timeframe': timeframe, 'status': 'ok', 'error': None}
+    timings = {}
+    name = f"{symbol.lower()}_{timeframe.lower()}"
+    instrumentation = Instrumentation(
+        enabled=metrics_dir is not None, trace_memory=trace_memory, profile_stages=profile_stages,
+        profile_dir=os.path.join(metrics_dir or ".", "profiles", name),
+        labels={'symbol': symbol, 'timeframe': timeframe}
+    )
+    started = time.perf_counter()
+    try:
+        from application.predictor_factory import create_predictor
+        predictor = create_predictor(symbol, timeframe, start_date, end_date, instrumentation)
+        t = time.perf_counter()
+        X, y, df_processed = predictor.preprocess_data() if features is None else predictor.preprocess_panel(features)
+        timings['preprocess'] = time.perf_counter() - t
+        t = time.perf_counter()
+        predictor.train(X, y)
+        timings['train'] = time.perf_counter() - t
+        t = time.perf_counter()
+        price = df_processed['Close'].iloc[-1]
+        volatility = df_processed['Close'].pct_change().std() * 100
+        result = predictor.predict(X[-1:], price, volatility)
+        timings['predict'] = time.perf_counter() - t
+        record.update({'rows': int(len(X)), 'pred': result['pred'], 'signal': result['signal'],
+                       **{f'mc_{k}': v for k, v in result['monte_carlo'].items()}})
+    except Exception as e:
+        record.update({'status': 'failed', 'error': f"{type(e).__name__}: {e}",
+                       'traceback': traceback.format_exc()})
+    timings['total'] = time.perf_counter() - started
+    record.update({f'{stage}_seconds': seconds for stage, seconds in timings.items()})
+    if metrics_dir:
+        instrumentation.export(metrics_dir, name)
+    return record
+
+def run_panel_job(pairs: list, timeframe: str, start_date: str, end_date: str, metrics_dir: str = None,
+                  trace_memory: bool = False, profile_stages: tuple = ()) -> list:
+    """Load and engineer every pair of one timeframe as a single panel, then run each pair's predictor on it.
+
+    Panel metrics are exported as panel_<timeframe>; each record carries the shared panel_seconds.
+    """
+    instrumentation = Instrumentation(
+        enabled=metrics_dir is not None, trace_memory=trace_memory, profile_stages=profile_stages,
+        profile_dir=os.path.join(metrics_dir or ".", "profiles", f"panel_{timeframe.lower()}"),
+        labels={'timeframe': timeframe}
+    )
+    started = time.perf_counter()
+    try:
+        from application.predictor_factory import pipeline_for
+        from infrastructure.data_loaders.panel_loader import PanelLoader
+        from infrastructure.feature_engineers.panel_features import PanelFeatureEngineer
+        panel = PanelLoader(pairs, start_date, end_date, timeframe, instrumentation=instrumentation).load_data()
+        engineer = PanelFeatureEngineer(panel, pipeline_for(timeframe))
+        with instrumentation.span('panel.features', rows=len(panel.index), pairs=len(panel.pairs)):
+            engineer.add_features()
+            engineer.sequence_data()
+    except Exception as e:
+        error = {'status': 'failed', 'error': f"{type(e).__name__}: {e}", 'traceback': traceback.format_exc(),
+                 'total_seconds': time.perf_counter() - started}
+        return [{'symbol': pair, 'timeframe': timeframe, **error} for pair in pairs]
+    finally:
+        if metrics_dir:
+            instrumentation.export(metrics_dir, f"panel_{timeframe.lower()}")
+    panel_seconds = time.perf_counter() - started
+    records = []
+    for pair in pairs:
+        if pair in panel.pairs:
+            record = run_job(pair, timeframe, start_date, end_date, metrics_dir, trace_memory, profile_stages,
+                             features=engineer.pair_view(pair))
+        else:
+            record = {'symbol': pair, 'timeframe': timeframe, 'status': 'failed',
+                      'error': f"ValueError: No data loaded for {pair} on {timeframe}", 'total_seconds': 0.0}
+        records.append({**record, 'panel_seconds': panel_seconds})
+    return records
+
+class BatchRunner:
+    def __init__(self, start_date: str = DEFAULT_START_DATE, end_date: str = DEFAULT_END_DATE,
+                 workers: int = None, threads_per_worker: int = 1, metrics_dir: str = None,
+                 trace_memory: bool = False, profile_stages: tuple = ()):
+        """Initialize runner with a bounded worker pool and per-worker thread cap."""
+        self.start_date = start_date
+        self.end_date = end_date
+        self.metrics_dir = metrics_dir
+        self.trace_memory = trace_memory
+        self.profile_stages = tuple(profile_stages)
+        self.threads_per_worker = threads_per_worker
+        self.workers = workers or max(1, (os.cpu_count() or 1) // threads_per_worker)
+
+    def run(self, jobs: list, panel: bool = False) -> list:
+        """Run every (pair, timeframe) job and return the result records in grid order.
+
+        With panel, each timeframe's pairs are loaded and engineered together in one worker.
+        """
+        results = {}
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=limit_native_threads,
+                                 initargs=(self.threads_per_worker,)) as pool:
+            options = (self.start_date, self.end_date, self.metrics_dir, self.trace_memory, self.profile_stages)
+            if panel:
+                timeframes = {}
+                for symbol, tf in jobs:
+                    timeframes.setdefault(tf, []).append(symbol)
+                futures = [pool.submit(run_panel_job, symbols, tf, *options) for tf, symbols in timeframes.items()]
+            else:
+                futures = [pool.submit(run_job, symbol, tf, *options) for symbol, tf in jobs]
+            for future in as_completed(futures):
+                records = future.result()
+                for record in records if panel else [records]:
+                    results[(record['symbol'], record['timeframe'])] = record
+                    print(f"[{len(results)}/{len(jobs)}] {record['symbol']} {record['timeframe']}: "
+                          f"{record['status']} in {record['total_seconds']:.1f}s")
+        return [results[job] for job in jobs]
+
+    @staticmethod
+    def write(results: list, path: str) -> None:
+        """Write result records as JSON, or Parquet when the path ends in .parquet."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if path.endswith(".parquet"):
+            import pandas as pd
+            pd.DataFrame(results).to_parquet(path, index=False)
+        else:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2)
@@ -1,16 +1,16 @@
 # Command-Line Interface (Presentation Layer)
 # Single Responsibility: Handle user input and display results
 
-from application.short_predictor import ShortTrendPredictor
-from application.medium_predictor import MediumTrendPredictor
-from application.long_predictor import LongTrendPredictor
+from application.predictor_factory import create_predictor
 from config import PAIRS, TIMEFRAMES, DEFAULT_START_DATE, DEFAULT_END_DATE
 
 class ForexCLI:
-    def __init__(self):
-        """Initialize CLI with default dates."""
+    def __init__(self, instrumentation=None, metrics_dir: str = None):
+        """Initialize CLI with default dates and optional stage instrumentation."""
         self.start_date = DEFAULT_START_DATE
         self.end_date = DEFAULT_END_DATE
+        self.instrumentation = instrumentation
+        self.metrics_dir = metrics_dir
 
     def run(self):
         """Run the CLI application."""
@@ -22,23 +22,21 @@ class ForexCLI:
             timeframe = self._select_timeframe()
             predictor = self._get_predictor(symbol, timeframe)
 
-            X, y, df_processed = predictor.preprocess_data()
-            df_processed.to_csv(f"data/{timeframe.lower()}/{symbol.lower()}_processed.csv", index=True)
-            print(f"Data processed. Shape: {X.shape}")
-            
-            predictor.train(X, y)
-            print("Models trained.")
-            
-            latest = X[-1:]
-            price = df_processed['Close'].iloc[-1]
-            volatility = df_processed['Close'].pct_change().std() * 100
-            result = predictor.predict(latest, price, volatility)
+            # Stages run as a graph: independent ones overlap, and a rerun over unchanged bars and
+            # settings restores the prediction from data/stages instead of rebuilding features and models
+            result = predictor.run()
+            for stage, entry in predictor.graph.report.items():
+                print(f"{stage}: {entry['status']} ({entry['seconds']:.2f}s)")
             
             print(f"\nPrediction: {result['pred']:.5f}")
             print(f"Trade Signal: {result['signal']}")
             print(f"Monte Carlo Results: {result['monte_carlo']}")
         except Exception as e:
             print(f"Error: {e}")
+        finally:
+            if self.instrumentation and self.metrics_dir:
+                self.instrumentation.export(self.metrics_dir, "cli")
+                print(f"Metrics written to {self.metrics_dir}")
 
     def _select_symbol(self) -> str:
         """Prompt user to select a currency pair."""
@@ -71,9 +69,4 @@ class ForexCLI:
 
     def _get_predictor(self, symbol: str, timeframe: str):
         """Return the appropriate predictor based on timeframe."""
-        if timeframe in TIMEFRAMES['short']:
-            return ShortTrendPredictor(symbol, self.start_date, self.end_date, timeframe)
-        elif timeframe in TIMEFRAMES['medium']:
-            return MediumTrendPredictor(symbol, self.start_date, self.end_date, timeframe)
-        else:
-            return LongTrendPredictor(symbol, self.start_date, self.end_date, timeframe)
\ No newline at end of file
+        return create_predictor(symbol, timeframe, self.start_date, self.end_date, self.instrumentation)
\ No newline at end of file
@@ -0,0 +1,268 @@
+# Command Line (Presentation Layer)
+# Single Responsibility: Parse the command line and run the chosen subcommand
+
+import argparse
+import os
+from config import DEFAULT_START_DATE, DEFAULT_END_DATE, DUKASCOPY_URL
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments; no command starts the interactive CLI."""
+    parser = argparse.ArgumentParser(description="Forex Prediction Pipeline")
+    parser.add_argument("--metrics-dir", help="Export per-stage metrics (.prom and .jsonl) into this directory")
+    parser.add_argument("--trace-memory", action="store_true", help="Record tracemalloc peaks per stage")
+    parser.add_argument("--profile", default="", help="Comma-separated stages to cProfile ('*' for all)")
+    parser.set_defaults(func=run_cli)
+    commands = parser.add_subparsers(dest="command")
+    batch = commands.add_parser("batch", help="Run a pair x timeframe grid over a process pool")
+    batch.add_argument("--grid", help="JSON file with 'pairs' and/or 'timeframes' lists")
+    batch.add_argument("--pairs", help="Comma-separated pairs (default: all)")
+    batch.add_argument("--timeframes", help="Comma-separated timeframes (default: all)")
+    batch.add_argument("--start", default=DEFAULT_START_DATE, help="Start date YYYY-MM-DD")
+    batch.add_argument("--end", default=DEFAULT_END_DATE, help="End date YYYY-MM-DD")
+    batch.add_argument("--workers", type=int, help="Worker processes (default: cores / threads)")
+    batch.add_argument("--threads", type=int, default=1, help="Intra-op threads per worker")
+    batch.add_argument("--output", default="results/batch.json", help="Results file (.json or .parquet)")
+    batch.add_argument("--panel", action="store_true", help="Load and engineer each timeframe's pairs as one aligned panel")
+    batch.set_defaults(func=run_batch)
+    backtest = commands.add_parser("backtest", help="Walk-forward backtest of one pair/timeframe")
+    backtest.add_argument("--pair", required=True, help="Currency pair, e.g. EURUSD")
+    backtest.add_argument("--timeframe", required=True, help="Timeframe, e.g. M5")
+    backtest.add_argument("--start", default=DEFAULT_START_DATE, help="Start date YYYY-MM-DD")
+    backtest.add_argument("--end", default=DEFAULT_END_DATE, help="End date YYYY-MM-DD")
+    backtest.add_argument("--folds", type=int, default=5, help="Number of walk-forward test blocks")
+    backtest.add_argument("--no-retrain", action="store_true", help="Train once and reuse for every fold")
+    backtest.add_argument("--spread", type=float, default=0.0, help="Spread in price units")
+    backtest.add_argument("--commission", type=float, default=0.0, help="Commission per unit traded, in price units")
+    backtest.add_argument("--workers", type=int, help="Worker processes for retraining folds")
+    backtest.add_argument("--output", help="Optional JSON file for the fold metrics")
+    backtest.set_defaults(func=run_backtest)
+    sweep = commands.add_parser("sweep", help="Parallel hyperparameter sweep over one feature pass")
+    sweep.add_argument("--pair", required=True, help="Currency pair, e.g. EURUSD")
+    sweep.add_argument("--timeframe", required=True, help="Timeframe, e.g. M5")
+    sweep.add_argument("--start", default=DEFAULT_START_DATE, help="Start date YYYY-MM-DD")
+    sweep.add_argument("--end", default=DEFAULT_END_DATE, help="End date YYYY-MM-DD")
+    sweep.add_argument("--grid", required=True, help="JSON file mapping each parameter to a list of values")
+    sweep.add_argument("--max-trials", type=int, help="Random subset of the grid to run (default: all)")
+    sweep.add_argument("--workers", type=int, help="Worker processes (default: cores / threads)")
+    sweep.add_argument("--threads", type=int, default=1, help="Intra-op threads per worker")
+    sweep.add_argument("--valid-fraction", type=float, default=0.2, help="Most recent share of windows to score")
+    sweep.add_argument("--output", help="Optional results table (.csv, .json or .parquet)")
+    sweep.set_defaults(func=run_sweep)
+    sync = commands.add_parser("sync", help="Download and cache price data without loading any model")
+    sync.add_argument("--pairs", help="Comma-separated pairs (default: all)")
+    sync.add_argument("--timeframes", help="Comma-separated timeframes (default: all)")
+    sync.add_argument("--start", default=DEFAULT_START_DATE, help="Start date YYYY-MM-DD")
+    sync.add_argument("--end", default=DEFAULT_END_DATE, help="End date YYYY-MM-DD")
+    sync.add_argument("--macro", action="store_true", help="Also refresh the configured FRED macro series")
+    sync.add_argument("--macro-fixtures", help="Read macro series from <SERIES>.csv files here instead of FRED")
+    sync.add_argument("--base-url", default=DUKASCOPY_URL, help="Tick archive root (e.g. a local fixture server)")
+    sync.add_argument("--connections", type=int, default=8, help="Initial concurrent downloads (adapts up to 32)")
+    sync.set_defaults(func=run_sync)
+    features = commands.add_parser("features", help="Export engineered features for one pair/timeframe")
+    features.add_argument("--pair", required=True, help="Currency pair, e.g. EURUSD")
+    features.add_argument("--timeframe", required=True, help="Timeframe, e.g. M5")
+    features.add_argument("--start", default=DEFAULT_START_DATE, help="Start date YYYY-MM-DD")
+    features.add_argument("--end", default=DEFAULT_END_DATE, help="End date YYYY-MM-DD")
+    features.add_argument("--output", help="CSV or .parquet path (default: data/<tf>/<pair>_processed.csv)")
+    features.set_defaults(func=run_features)
+    montecarlo = commands.add_parser("montecarlo", help="Risk metrics for given predictions, no model needed")
+    montecarlo.add_argument("--predictions", required=True, help="Comma-separated predictions")
+    montecarlo.add_argument("--volatility", type=float, required=True, help="Volatility in percent")
+    montecarlo.add_argument("--regression", action="store_true", help="Predictions are moves, not probabilities")
+    montecarlo.add_argument("--horizon", type=int, default=1, help="Steps per simulated path")
+    montecarlo.add_argument("--simulations", type=int, default=1000, help="Paths per prediction")
+    montecarlo.add_argument("--seed", type=int, help="Random seed")
+    montecarlo.add_argument("--sampling", choices=["pseudo", "antithetic", "halton", "sobol"], default="pseudo",
+                            help="Pseudo-random, antithetic pairs or randomized quasi-random draws")
+    montecarlo.add_argument("--tolerance", type=float,
+                            help="Double the paths until up_prob and expected_move/volatility are within this")
+    montecarlo.add_argument("--max-simulations", type=int, default=2**20, help="Most paths per prediction")
+    montecarlo.set_defaults(func=run_montecarlo)
+    serve = commands.add_parser("serve", help="Serve predictions from registered models on localhost")
+    serve.add_argument("--port", type=int, default=8765, help="TCP port on 127.0.0.1")
+    serve.add_argument("--max-batch", type=int, default=64, help="Largest merged batch per forward pass")
+    serve.add_argument("--max-wait-ms", type=float, default=2.0, help="How long a batch waits to fill")
+    serve.add_argument("--numpy", action="store_true", help="Run networks from their NumPy exports (no TensorFlow)")
+    serve.set_defaults(func=run_serve)
+    live = commands.add_parser("live", help="Predict on every bar close of a live tick stream")
+    live.add_argument("--pair", required=True, help="Currency pair, e.g. EURUSD")
+    live.add_argument("--timeframe", required=True, help="Timeframe, e.g. M1")
+    live.add_argument("--source", required=True, help="replay:<raw tick CSV> or socket:<host>:<port>")
+    live.add_argument("--speed", type=float, default=0.0, help="Replay pacing (1.0 = recorded speed, 0 = unpaced)")
+    live.add_argument("--start", default=DEFAULT_START_DATE, help="Warm-up history start date YYYY-MM-DD")
+    live.add_argument("--end", default=DEFAULT_END_DATE, help="Warm-up history end date YYYY-MM-DD")
+    live.add_argument("--warm-up-bars", type=int, default=1000, help="Historical bars to warm up features (0 = none)")
+    live.add_argument("--tick-queue", type=int, default=10000, help="Tick queue capacity")
+    live.add_argument("--tick-policy", default="block", help="Full tick queue: block, drop_newest or drop_oldest")
+    live.add_argument("--bar-queue", type=int, default=1, help="Closed-bar queue capacity")
+    live.add_argument("--bar-policy", default="coalesce", help="Full bar queue: coalesce, block, drop_newest or drop_oldest")
+    live.add_argument("--numpy", action="store_true", help="Run the network from its NumPy export (no TensorFlow)")
+    live.set_defaults(func=run_live)
+    export = commands.add_parser("export", help="Export a registered network to NumPy and check parity with Keras")
+    export.add_argument("--pair", required=True, help="Currency pair, e.g. EURUSD")
+    export.add_argument("--timeframe", required=True, help="Timeframe, e.g. M5")
+    export.add_argument("--windows", type=int, default=256, help="Random windows compared against Keras")
+    export.add_argument("--tolerance", type=float, default=1e-4, help="Largest allowed absolute difference")
+    export.set_defaults(func=run_export)
+    replay = commands.add_parser("replay", help="Serve a raw tick CSV over TCP as a stand-in live feed")
+    replay.add_argument("--path", required=True, help="Raw tick CSV (epoch ms, Bid, Ask, Volume)")
+    replay.add_argument("--port", type=int, default=9000, help="TCP port on 127.0.0.1")
+    replay.add_argument("--speed", type=float, default=1.0, help="Replay pacing (1.0 = recorded speed, 0 = unpaced)")
+    replay.set_defaults(func=run_replay)
+    return parser.parse_args(argv)
+
+def run_batch(args: argparse.Namespace) -> None:
+    """Run a pair x timeframe grid and write its results."""
+    from presentation.batch import BatchRunner, load_grid
+    jobs = load_grid(args.grid,
+                     args.pairs.split(",") if args.pairs else None,
+                     args.timeframes.split(",") if args.timeframes else None)
+    runner = BatchRunner(args.start, args.end, args.workers, args.threads, args.metrics_dir,
+                         args.trace_memory, [s for s in args.profile.split(",") if s])
+    results = runner.run(jobs, panel=args.panel)
+    runner.write(results, args.output)
+    failed = sum(r['status'] != 'ok' for r in results)
+    print(f"Wrote {len(results)} results ({failed} failed) to {args.output}")
+
+def run_backtest(args: argparse.Namespace) -> None:
+    """Walk-forward backtest one pair/timeframe and print the fold metrics."""
+    import json
+    from application.backtest import WalkForwardBacktester
+    backtester = WalkForwardBacktester(args.pair, args.start, args.end, args.timeframe, args.folds,
+                                       not args.no_retrain, args.spread, args.commission, args.workers)
+    report = backtester.run()
+    for i, fold in enumerate(report['folds'], 1):
+        print(f"Fold {i}: {fold}")
+    print(f"Total: {report['total']}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({'folds': report['folds'], 'total': report['total']}, f, indent=2)
+
+def run_sweep(args: argparse.Namespace) -> None:
+    """Run a hyperparameter sweep and print the trials, best first."""
+    import json
+    from application.sweep import ParameterSweep
+    with open(args.grid) as f:
+        grid = json.load(f)
+    sweep = ParameterSweep(args.pair, args.timeframe, args.start, args.end, grid, args.max_trials,
+                           args.workers, args.threads, args.valid_fraction)
+    table = sweep.run()
+    print(table.drop(columns=['traceback'], errors='ignore').to_string(index=False))
+    if args.output:
+        if args.output.endswith(".parquet"):
+            table.to_parquet(args.output, index=False)
+        elif args.output.endswith(".json"):
+            table.to_json(args.output, orient="records", indent=2)
+        else:
+            table.to_csv(args.output, index=False)
+
+def run_sync(args: argparse.Namespace) -> None:
+    """Download and cache price (and optionally macro) data."""
+    from presentation.batch import load_grid
+    from infrastructure.data_loaders.duka_loader import DukaLoader
+    from infrastructure.data_loaders.dukascopy_fetcher import DukascopyFetcher
+    fetcher = DukascopyFetcher(os.path.abspath("data/tick"), args.base_url, args.connections)
+    for symbol, timeframe in load_grid(None,
+                                       args.pairs.split(",") if args.pairs else None,
+                                       args.timeframes.split(",") if args.timeframes else None):
+        df = DukaLoader(symbol, args.start, args.end, timeframe, fetcher=fetcher).load_data()
+        print(f"{symbol} {timeframe}: {len(df)} bars")
+    if args.macro or args.macro_fixtures:
+        from infrastructure.data_loaders.macro_loader import MacroLoader, MacroFixtureFetcher
+        fetcher = MacroFixtureFetcher(args.macro_fixtures) if args.macro_fixtures else None
+        macro = MacroLoader(args.start, args.end, fetcher=fetcher)
+        failed = macro.sync()
+        for series in macro.series:
+            print(f"{series}: {failed.get(series) or f'{len(macro.store.read(series))} observations'}")
+
+def run_features(args: argparse.Namespace) -> None:
+    """Engineer features for one pair/timeframe and write them to a file."""
+    from application.predictor_factory import create_predictor
+    predictor = create_predictor(args.pair, args.timeframe, args.start, args.end)
+    _, _, df_processed = predictor.preprocess_data()
+    output = args.output or f"data/{args.timeframe.lower()}/{args.pair.lower()}_processed.csv"
+    if output.endswith(".parquet"):
+        df_processed.to_parquet(output)
+    else:
+        df_processed.to_csv(output, index=True)
+    print(f"Wrote {len(df_processed)} rows to {output}")
+
+def run_montecarlo(args: argparse.Namespace) -> None:
+    """Print risk metrics for given predictions."""
+    from domain.monte_carlo import MonteCarloSimulator
+    simulator = MonteCarloSimulator(args.simulations, args.seed, args.sampling, args.tolerance,
+                                    args.max_simulations)
+    predictions = [float(p) for p in args.predictions.split(",")]
+    results = simulator.simulate_batch(predictions, args.volatility, not args.regression, args.horizon)
+    for i, prediction in enumerate(predictions):
+        print(f"{prediction}: up_prob={results['up_prob'][i]:.3f} expected_move={results['expected_move'][i]:.5f} "
+              f"risk_reward={results['risk_reward'][i]:.3f} var={results['var'][i]:.5f} cvar={results['cvar'][i]:.5f} "
+              f"samples={results['samples'][i]} up_prob_error={results['up_prob_error'][i]:.4f} "
+              f"expected_move_error={results['expected_move_error'][i]:.5f}")
+
+def run_serve(args: argparse.Namespace) -> None:
+    """Serve predictions from registered models until interrupted."""
+    import asyncio
+    from presentation.service import PredictionService
+    service = PredictionService(port=args.port, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms,
+                                numpy_inference=args.numpy)
+    asyncio.run(service.serve())
+
+def run_live(args: argparse.Namespace) -> None:
+    """Predict on every bar close of a live tick stream and print the signals."""
+    import asyncio
+    import json
+    from application.live import LivePipeline
+    from infrastructure.data_loaders.tick_sources import ReplaySource, SocketSource
+    kind, _, target = args.source.partition(":")
+    if kind == "replay":
+        source = ReplaySource(target, args.speed)
+    elif kind == "socket":
+        host, _, port = target.rpartition(":")
+        source = SocketSource(host or "127.0.0.1", int(port))
+    else:
+        raise SystemExit(f"Invalid source: {args.source}. Use replay:<path> or socket:<host>:<port>.")
+    live = LivePipeline(args.pair, args.timeframe, source, args.start, args.end, args.tick_queue,
+                        args.tick_policy, args.bar_queue, args.bar_policy, args.warm_up_bars,
+                        on_signal=lambda signal: print(json.dumps(signal), flush=True),
+                        numpy_inference=args.numpy)
+    try:
+        asyncio.run(live.run())
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(live.stats()))
+
+def run_export(args: argparse.Namespace) -> None:
+    """Export a registered network to NumPy; exits non-zero when it misses the parity tolerance."""
+    import numpy as np
+    from application.predictor_factory import create_predictor
+    from domain.models.numpy_network import parity_error
+    predictor = create_predictor(args.pair, args.timeframe, DEFAULT_START_DATE, DEFAULT_END_DATE)
+    if not predictor.load_models():
+        raise SystemExit(f"No registered models for {args.pair} {args.timeframe}; train them first.")
+    if not predictor.registry.export(predictor.registry_key, predictor.model):
+        raise SystemExit(1)
+    network = predictor.registry.load_export(predictor.registry_key, predictor.refiner)
+    X = np.random.default_rng(42).normal(size=(args.windows, *predictor.model.model.input_shape[1:]))
+    error = parity_error(predictor.model.model, network, X.astype(np.float32))
+    print(f"Max abs difference over {args.windows} windows: {error:.2e} (tolerance {args.tolerance:.0e})")
+    if error > args.tolerance:
+        raise SystemExit(1)
+
+def run_replay(args: argparse.Namespace) -> None:
+    """Serve a raw tick CSV over TCP until interrupted."""
+    import asyncio
+    from infrastructure.data_loaders.tick_sources import serve_replay
+    asyncio.run(serve_replay(args.path, port=args.port, speed=args.speed))
+
+def run_cli(args: argparse.Namespace) -> None:
+    """Start the interactive CLI."""
+    from presentation.cli import ForexCLI
+    from infrastructure.instrumentation import Instrumentation
+    instrumentation = Instrumentation(
+        enabled=args.metrics_dir is not None, trace_memory=args.trace_memory,
+        profile_stages=[s for s in args.profile.split(",") if s],
+        profile_dir=f"{args.metrics_dir or '.'}/profiles"
+    )
+    cli = ForexCLI(instrumentation, args.metrics_dir)
+    cli.run()
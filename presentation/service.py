@@ -0,0 +1,164 @@
+# Prediction Service (Presentation Layer)
+# Single Responsibility: Serve low-latency predictions from loaded models over localhost
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from config import DEFAULT_START_DATE, DEFAULT_END_DATE
+from infrastructure.instrumentation import LatencyStats
+import asyncio
+import json
+import time
+import numpy as np
+
+class MicroBatcher:
+    def __init__(self, predictor, executor: ThreadPoolExecutor, max_batch: int = 64, max_wait_ms: float = 2.0):
+        """Initialize batcher merging concurrent requests for one predictor."""
+        self.predictor = predictor
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.stats = LatencyStats()
+        self.batch_sizes = deque(maxlen=10000)
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, window: np.ndarray, price: float, volatility: float) -> dict:
+        """Queue one window and wait for its slot in the next batched forward pass."""
+        if self.task.done():  # never expected, but a dead batcher would leave every request hanging
+            self.task = asyncio.get_running_loop().create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        started = time.perf_counter()
+        await self.queue.put((window, price, volatility, future))
+        result = await future
+        self.stats.record(time.perf_counter() - started)
+        return result
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Windows of different shapes cannot be stacked, so each shape is scored on its own
+            # and a malformed one only fails the requests that sent it
+            groups = {}
+            for item in batch:
+                groups.setdefault(np.shape(item[0]), []).append(item)
+            for group in groups.values():
+                await self._score(group)
+
+    async def _score(self, batch: list) -> None:
+        """Score one stackable batch and resolve its futures; errors fail only this batch."""
+        try:
+            X = np.stack([item[0] for item in batch])
+            prices = np.array([item[1] for item in batch], dtype=np.float64)
+            volatilities = np.array([item[2] for item in batch], dtype=np.float64)
+            output = await asyncio.get_running_loop().run_in_executor(self.executor, self.predictor.predict_batch,
+                                                                      X, prices, volatilities)
+            results = [{
+                'pred': float(output['pred'][i]),
+                'signal': int(output['signal'][i]),
+                'entry_price': float(output['entry_price'][i]) if output['signal'][i] else None,
+                'monte_carlo': {k: float(v[i]) for k, v in output['monte_carlo'].items() if v.ndim == 1}
+            } for i in range(len(batch))]
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.batch_sizes.append(len(batch))
+        for (*_, future), result in zip(batch, results):
+            if not future.done():  # the client may have gone away meanwhile
+                future.set_result(result)
+
+class PredictionService:
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, max_batch: int = 64, max_wait_ms: float = 2.0,
+                 start_date: str = DEFAULT_START_DATE, end_date: str = DEFAULT_END_DATE, numpy_inference: bool = False):
+        """Initialize service; models are loaded from the registry on first use per pair/timeframe.
+
+        With numpy_inference networks run from their NumPy exports instead of TensorFlow.
+        """
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.start_date = start_date
+        self.end_date = end_date
+        self.numpy_inference = numpy_inference
+        # A single inference thread keeps model calls serialized while the event loop stays free
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.batchers = {}
+        self.loading = asyncio.Lock()
+
+    async def _batcher(self, symbol: str, timeframe: str) -> MicroBatcher:
+        key = (symbol, timeframe)
+        if key in self.batchers:
+            return self.batchers[key]
+        async with self.loading:
+            if key not in self.batchers:
+                from application.predictor_factory import create_predictor
+                loop = asyncio.get_running_loop()
+                predictor = await loop.run_in_executor(self.executor, create_predictor,
+                                                       symbol, timeframe, self.start_date, self.end_date)
+                if not await loop.run_in_executor(self.executor, predictor.load_models, self.numpy_inference):
+                    raise ValueError(f"No registered models for {symbol} {timeframe}; train them first.")
+                self.batchers[key] = MicroBatcher(predictor, self.executor, self.max_batch, self.max_wait_ms)
+        return self.batchers[key]
+
+    def stats(self) -> dict:
+        """Return latency and batch-size statistics per pair/timeframe."""
+        return {f"{symbol}_{tf}": {**batcher.stats.summary(),
+                                   'mean_batch': float(np.mean(batcher.batch_sizes)) if batcher.batch_sizes else None}
+                for (symbol, tf), batcher in self.batchers.items()}
+
+    async def handle(self, request: dict) -> dict:
+        """Answer one request: {"op": "stats"} or a prediction request for one window."""
+        if request.get('op') == 'stats':
+            return self.stats()
+        batcher = await self._batcher(request['symbol'], request['timeframe'])
+        window = np.asarray(request['window'], dtype=np.float32)
+        expected = batcher.predictor.window_shape
+        if window.shape != expected:
+            raise ValueError(f"Window must have shape {list(expected)}, got {list(window.shape)}.")
+        return await batcher.submit(window, float(request['price']), float(request['volatility']))
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Read newline-delimited JSON requests and write one JSON response per line.
+
+        Requests on one connection are handled concurrently so a client can pipeline
+        many of them into the same batch; responses echo the request's "id".
+        """
+        async def respond(line: bytes) -> None:
+            request = {}
+            try:
+                request = json.loads(line)
+                response = await self.handle(request)
+            except Exception as e:
+                response = {'error': f"{type(e).__name__}: {e}"}
+            if isinstance(request, dict) and 'id' in request:
+                response = {'id': request['id'], **response}
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+        pending = set()
+        while line := await reader.readline():
+            task = asyncio.create_task(respond(line))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.wait(pending)
+        writer.close()
+
+    async def serve(self) -> None:
+        """Listen on host:port until cancelled."""
+        server = await asyncio.start_server(self._serve_client, self.host, self.port)
+        print(f"Prediction service listening on {self.host}:{self.port}")
+        async with server:
+            await server.serve_forever()
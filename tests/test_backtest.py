@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from application import backtest
+from application.backtest import WalkForwardBacktester, bar_pnl, walk_forward_folds
+from benchmarks.synthetic import generate_bars
+from infrastructure.utils import sliding_windows
+
+SEQ_LENGTH = 8
+WARM_UP = 5
+SPREAD = 1e-4
+COMMISSION = 2e-5
+
+def oracle_data(closes: np.ndarray) -> np.ndarray:
+    """Rows of (close, next bar is up, target) with NaN warm-up rows like a real indicator frame."""
+    up = np.r_[closes[1:] > closes[:-1], False].astype(np.float64)
+    data = np.column_stack([closes, up, up])
+    data[:WARM_UP, :2] = np.nan
+    return data
+
+class OraclePredictor:
+    fits = []
+
+    def __init__(self, symbol, timeframe, start_date, end_date):
+        """Stand-in pipeline that scores each window with the known direction of its next close."""
+        df = generate_bars(400, freq="5min")
+        self.data = oracle_data(df['Close'].to_numpy())
+        self.engineer = SimpleNamespace(df=df, sequence_data=lambda: self.data)
+
+    def preprocess_data(self) -> tuple:
+        X, y = sliding_windows(self.data, SEQ_LENGTH)
+        return X, y, None
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> None:
+        OraclePredictor.fits.append(len(X))
+
+    def score(self, X: np.ndarray) -> np.ndarray:
+        return X[:, -1, 1]
+
+def test_walk_forward_folds_expand_and_cover_every_window():
+    assert walk_forward_folds(10, 110, 4) == [(10, 30, 30, 50), (10, 50, 50, 70),
+                                               (10, 70, 70, 90), (10, 90, 90, 110)]
+    folds = walk_forward_folds(0, 103, 4)
+    assert folds[-1] == (0, 80, 80, 103)  # the remainder goes to the last test block
+    assert all(train_end == test_start for _, train_end, test_start, _ in folds)
+    assert all(prev[3] == fold[2] for prev, fold in zip(folds, folds[1:]))
+    with pytest.raises(ValueError):
+        walk_forward_folds(0, 4, 4)
+
+def test_bar_pnl_charges_every_unit_of_turnover():
+    positions = np.array([1, 1, -1, 0, 0], dtype=np.int8)
+    entry = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    exit_ = np.array([2.0, 1.0, 1.0, 6.0, 5.0])
+    # turnover is 1, 0, 2, 1, 0 units
+    assert np.allclose(bar_pnl(positions, entry, exit_, 0.5), [0.5, -1.0, 1.0, -0.5, 0.0])
+
+@pytest.mark.parametrize('retrain', [True, False])
+def test_backtest_pnl_with_costs(retrain, monkeypatch):
+    monkeypatch.setattr(backtest, 'create_predictor', OraclePredictor)
+    OraclePredictor.fits = []
+    results = WalkForwardBacktester('EURUSD', "2023-01-02", "2023-01-03", 'M5', n_folds=4, retrain=retrain,
+                                     spread=SPREAD, commission=COMMISSION, workers=2).run()
+
+    num_windows = 400 - SEQ_LENGTH
+    folds = walk_forward_folds(WARM_UP, num_windows, 4)
+    assert [tuple(fold[key] for key in ('train_start', 'train_end', 'test_start', 'test_end'))
+            for fold in results['folds']] == folds
+    assert np.array_equal(results['windows'], np.arange(folds[0][2], num_windows))
+    if not retrain:
+        assert OraclePredictor.fits == [folds[0][1] - folds[0][0]]
+
+    # The oracle is always in the market on the right side, so each bar earns its absolute move minus costs
+    closes = generate_bars(400, freq="5min")['Close'].to_numpy()
+    entry = closes[results['windows'] + SEQ_LENGTH - 1]
+    exit_ = closes[results['windows'] + SEQ_LENGTH]
+    expected_positions = np.where(exit_ > entry, 1, -1)
+    cost = SPREAD / 2 + COMMISSION
+    expected_pnl, previous = [], 0
+    for position, move in zip(expected_positions, exit_ - entry):
+        expected_pnl.append(position * move - abs(position - previous) * cost)
+        previous = position
+    assert np.array_equal(results['positions'], expected_positions)
+    assert np.allclose(results['pnl'], expected_pnl)
+    assert results['total']['pnl'] == pytest.approx(sum(expected_pnl))
+    assert results['total']['trades'] == np.count_nonzero(np.diff(expected_positions, prepend=0))
+    assert sum(fold['bars'] for fold in results['folds']) == results['total']['bars'] == len(expected_pnl)
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import date
+from benchmarks.synthetic import generate_bars, generate_ticks, write_raw_csv
+from infrastructure.data_loaders.bar_store import BarStore
+from infrastructure.data_loaders.duka_loader import DukaLoader, FixtureFetcher, read_raw_csv
+
+PANDAS_FREQ = {'M1': '1min', 'M5': '5min', 'H1': '1h', 'D1': '1D'}
+
+class CountingFetcher:
+    def __init__(self, df: pd.DataFrame):
+        """Serve the rows of df inside each requested day range and record the requests."""
+        self.df = df
+        self.calls = []
+
+    def __call__(self, symbol: str, timeframe: str, start: date, end: date) -> pd.DataFrame:
+        self.calls.append((start, end))
+        days = self.df.index.normalize()
+        return self.df[(days >= pd.Timestamp(start)) & (days <= pd.Timestamp(end))]
+
+def reference_bars(ticks: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Bid OHLCV bars built independently with pandas, skipping empty buckets."""
+    grouped = ticks.resample(PANDAS_FREQ[timeframe], label='left', closed='left')
+    bars = pd.DataFrame({'Open': grouped['Bid'].first(), 'High': grouped['Bid'].max(),
+                         'Low': grouped['Bid'].min(), 'Close': grouped['Bid'].last(),
+                         'Volume': grouped['Volume'].sum()})
+    return bars.dropna()
+
+def test_write_read_round_trip(tmp_path):
+    store = BarStore(str(tmp_path))
+    bars = generate_bars(3 * 1440, start="2023-01-02")
+    days = [date(2023, 1, 2), date(2023, 1, 3), date(2023, 1, 4)]
+    store.write_days('EURUSD', 'M1', days, bars)
+    store.mark_complete('EURUSD', 'M1', days)
+
+    df = store.read_range('EURUSD', 'M1', days[0], days[-1])
+    assert list(df.columns) == list(bars.columns)
+    assert all(dtype == np.float32 for dtype in df.dtypes)
+    assert df.index.equals(bars.index)
+    assert np.array_equal(df.to_numpy(), bars.to_numpy(dtype=np.float32))
+
+    middle = store.read_range('EURUSD', 'M1', days[1], days[1])
+    assert len(middle) == 1440 and middle.index[0] == pd.Timestamp("2023-01-03")
+    assert store.missing_days('EURUSD', 'M1', date(2023, 1, 1), date(2023, 1, 5)) == \
+           [date(2023, 1, 1), date(2023, 1, 5)]
+
+def test_sync_fetches_only_missing_days(tmp_path):
+    store = BarStore(str(tmp_path))
+    fetcher = CountingFetcher(generate_bars(6 * 1440, start="2023-01-02"))
+    store.sync('EURUSD', 'M1', date(2023, 1, 3), date(2023, 1, 4), fetcher)
+    store.sync('EURUSD', 'M1', date(2023, 1, 2), date(2023, 1, 7), fetcher)
+    store.sync('EURUSD', 'M1', date(2023, 1, 2), date(2023, 1, 7), fetcher)
+    assert fetcher.calls == [(date(2023, 1, 3), date(2023, 1, 4)),
+                             (date(2023, 1, 2), date(2023, 1, 2)),
+                             (date(2023, 1, 5), date(2023, 1, 7))]
+    df = store.read_range('EURUSD', 'M1', date(2023, 1, 2), date(2023, 1, 7))
+    assert np.array_equal(df.to_numpy(), fetcher.df.to_numpy(dtype=np.float32))
+
+@pytest.mark.parametrize('timeframe', ['M1', 'M5', 'H1', 'D1'])
+def test_loader_matches_pandas_resample(timeframe, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # DukaLoader creates its data/ directories relative to the working directory
+    fixtures = tmp_path / "fixtures"
+    fixtures.mkdir()
+    path = str(fixtures / "eurusd_tick_raw.csv")
+    write_raw_csv(generate_ticks(150_000, start="2023-01-02", mean_gap_ms=2000.0), path)
+    # Compare against the fixture as parsed, so CSV rounding and float32 storage apply to both sides
+    ticks = read_raw_csv(path)
+
+    loader = DukaLoader('EURUSD', "2023-01-02", "2023-01-06", timeframe,
+                        store=BarStore(str(tmp_path / "store")), fetcher=FixtureFetcher(str(fixtures)))
+    df = loader.load_data()
+    expected = reference_bars(ticks, timeframe)
+    assert df.index.equals(expected.index)
+    assert np.array_equal(df[['Open', 'High', 'Low', 'Close']].to_numpy(),
+                          expected[['Open', 'High', 'Low', 'Close']].to_numpy())
+    assert np.allclose(df['Volume'].to_numpy(), expected['Volume'].to_numpy(), rtol=1e-6)
+
+    # A second loader finds every day cached and never touches the fixture again
+    cached = DukaLoader('EURUSD', "2023-01-02", "2023-01-06", timeframe,
+                        store=BarStore(str(tmp_path / "store")), fetcher=CountingFetcher(ticks))
+    assert cached.load_data().equals(df)
+    assert cached.fetcher.base_fetcher.calls == []
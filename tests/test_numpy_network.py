@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from domain.models.numpy_network import NumpyNetwork, parity_error
+
+# Largest absolute float32 difference allowed between the Keras and NumPy outputs
+TOLERANCE = 1e-5
+
+def random_network(rng: np.random.Generator, features: int = 5) -> NumpyNetwork:
+    """Conv1D + MaxPool + GRU + LSTM + Dense with random weights, covering every exported layer kind."""
+    normal = lambda *shape: rng.normal(scale=0.3, size=shape).astype(np.float32)
+    return NumpyNetwork([
+        ('Conv1D', {'activation': 'relu', 'strides': [1], 'dilation_rate': [1], 'padding': 'valid',
+                    'use_bias': True}, [normal(2, features, 6), normal(6)]),
+        ('MaxPooling1D', {'pool_size': [2], 'strides': [2], 'padding': 'valid', 'use_bias': True}, []),
+        ('GRU', {'units': 4, 'activation': 'tanh', 'recurrent_activation': 'sigmoid', 'reset_after': True,
+                 'return_sequences': True, 'use_bias': True}, [normal(6, 12), normal(4, 12), normal(2, 12)]),
+        ('LSTM', {'units': 3, 'activation': 'tanh', 'recurrent_activation': 'sigmoid',
+                  'return_sequences': False, 'use_bias': True}, [normal(4, 12), normal(3, 12), normal(12)]),
+        ('Dense', {'activation': 'sigmoid', 'use_bias': True}, [normal(3, 1), normal(1)])
+    ])
+
+def test_save_load_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    network = random_network(rng)
+    X = rng.normal(size=(16, 11, 5)).astype(np.float32)
+    path = str(tmp_path / "network.npz")
+    network.save(path)
+    loaded = NumpyNetwork.load(path)
+    assert [(kind, config) for kind, config, _ in loaded.layers] == \
+           [(kind, config) for kind, config, _ in network.layers]
+    assert np.array_equal(loaded.predict(X), network.predict(X))
+    assert loaded.predict(X).shape == (16, 1)
+
+@pytest.mark.parametrize('model_path', [
+    'domain.models.short_gru.ShortGRUModel',
+    'domain.models.medium_cnn_lstm.MediumCNNLSTMModel',
+    'domain.models.long_lstm.LongLSTMModel'
+])
+def test_keras_parity(model_path, tmp_path):
+    pytest.importorskip("tensorflow")
+    import importlib
+    import tensorflow as tf
+    module, name = model_path.rsplit('.', 1)
+    model_class = getattr(importlib.import_module(module), name)
+    tf.keras.utils.set_random_seed(0)
+    model = model_class()
+    X = np.random.default_rng(1).normal(size=(64, *model.model.input_shape[1:])).astype(np.float32)
+    path = str(tmp_path / "network.npz")
+    model.export(path)
+    assert parity_error(model.model, NumpyNetwork.load(path), X) <= TOLERANCE